@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Read extension metadata straight from an APK, without aapt.
+
+Parses the binary AndroidManifest.xml (AXML) and resources.arsc inside the
+zip for what `aapt dump --include-meta-data badging` used to give
+create-repo.py: package, versionCode, versionName, meta-data, the
+application label and the icon path for a given density (320 = xhdpi).
+
+Usage:
+    apk_reader.py APK [APK ...]     # prints one JSON object per APK
+"""
+
+import sys
+assert sys.version_info >= (3, 12), "Requires Python 3.12+"
+
+import json
+import struct
+from pathlib import Path
+from zipfile import ZipFile
+
+# ResChunk_header types (frameworks/base/libs/androidfw/include/androidfw/ResourceTypes.h)
+RES_STRING_POOL_TYPE = 0x0001
+RES_TABLE_TYPE = 0x0002
+RES_XML_TYPE = 0x0003
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_END_ELEMENT_TYPE = 0x0103
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+RES_TABLE_PACKAGE_TYPE = 0x0200
+RES_TABLE_TYPE_TYPE = 0x0201
+
+UTF8_FLAG = 1 << 8
+TYPE_FLAG_SPARSE = 0x01
+TYPE_FLAG_OFFSET16 = 0x02
+ENTRY_FLAG_COMPLEX = 0x0001
+ENTRY_FLAG_COMPACT = 0x0008
+NO_ENTRY = 0xFFFFFFFF
+
+# Res_value data types
+TYPE_REFERENCE = 0x01
+TYPE_STRING = 0x03
+TYPE_INT_DEC = 0x10
+TYPE_INT_HEX = 0x11
+TYPE_INT_BOOLEAN = 0x12
+
+DENSITY_DEFAULT = 0
+DENSITY_MEDIUM = 160
+DENSITY_ANY = 0xFFFE
+DENSITY_NONE = 0xFFFF
+
+# android: attributes by resource id, for manifests with stripped attribute names
+ANDROID_ATTRIBUTES = {
+    0x01010001: "label",
+    0x01010002: "icon",
+    0x01010003: "name",
+    0x01010024: "value",
+    0x0101021B: "versionCode",
+    0x0101021C: "versionName",
+}
+MAX_REFERENCE_DEPTH = 8
+
+
+class StringPool:
+    """ResStringPool chunk; strings are decoded on first access."""
+
+    def __init__(self, data: bytes, offset: int):
+        _, header_size, _, count, _, flags, strings_start, _ = struct.unpack_from("<HHIIIIII", data, offset)
+        self.data = data
+        self.utf8 = bool(flags & UTF8_FLAG)
+        self.offsets = struct.unpack_from(f"<{count}I", data, offset + header_size)
+        self.base = offset + strings_start
+        self.cache: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> str:
+        if index in self.cache:
+            return self.cache[index]
+        data = self.data
+        pos = self.base + self.offsets[index]
+        if self.utf8:
+            # UTF-16 length first (unused), then UTF-8 byte length; 1 or 2 bytes each
+            for _ in range(2):
+                length = data[pos]
+                pos += 1
+                if length & 0x80:
+                    length = (length & 0x7F) << 8 | data[pos]
+                    pos += 1
+            value = data[pos:pos + length].decode("utf-8", "replace")
+        else:
+            (length,) = struct.unpack_from("<H", data, pos)
+            pos += 2
+            if length & 0x8000:
+                length = (length & 0x7FFF) << 16 | struct.unpack_from("<H", data, pos)[0]
+                pos += 2
+            value = data[pos:pos + 2 * length].decode("utf-16-le", "replace")
+        self.cache[index] = value
+        return value
+
+
+def typed_value(pool: StringPool, data_type: int, data: int):
+    """Res_value -> (data_type, python value); strings are looked up, ints made signed."""
+    if data_type == TYPE_STRING:
+        return data_type, pool[data]
+    if data_type == TYPE_INT_DEC:
+        return data_type, data - (1 << 32) if data & 0x80000000 else data
+    if data_type == TYPE_INT_BOOLEAN:
+        return data_type, data != 0
+    return data_type, data
+
+
+def iter_xml_elements(data: bytes):
+    """Yield (depth, tag, {attribute: (data_type, value)}) for each start tag of a binary XML file."""
+    chunk_type, header_size, size = struct.unpack_from("<HHI", data, 0)
+    if chunk_type != RES_XML_TYPE:
+        raise ValueError("not a binary XML file")
+    pool = None
+    resource_ids = ()
+    depth = 0
+    offset = header_size
+    while offset < min(size, len(data)):
+        chunk_type, header_size, chunk_size = struct.unpack_from("<HHI", data, offset)
+        if chunk_size < 8:
+            raise ValueError(f"corrupt XML chunk at {offset}")
+        if chunk_type == RES_STRING_POOL_TYPE:
+            pool = StringPool(data, offset)
+        elif chunk_type == RES_XML_RESOURCE_MAP_TYPE:
+            resource_ids = struct.unpack_from(f"<{(chunk_size - header_size) // 4}I", data, offset + header_size)
+        elif chunk_type == RES_XML_START_ELEMENT_TYPE:
+            extension = offset + header_size
+            _, name, attribute_start, attribute_size, attribute_count = struct.unpack_from("<IIHHH", data, extension)
+            attributes = {}
+            pos = extension + attribute_start
+            for _ in range(attribute_count):
+                _, attribute_name, _, _, _, data_type, value = struct.unpack_from("<IIIHBBI", data, pos)
+                key = None
+                if attribute_name < len(resource_ids):
+                    key = ANDROID_ATTRIBUTES.get(resource_ids[attribute_name])
+                attributes[key or pool[attribute_name]] = typed_value(pool, data_type, value)
+                pos += attribute_size
+            yield depth, pool[name], attributes
+            depth += 1
+        elif chunk_type == RES_XML_END_ELEMENT_TYPE:
+            depth -= 1
+        offset += chunk_size
+
+
+def density_is_better(density: int, other: int, requested: int) -> bool:
+    """ResTable_config::isBetterThan, density part only."""
+    if density == other:
+        return False
+    density = density or DENSITY_MEDIUM
+    other = other or DENSITY_MEDIUM
+    if density == DENSITY_ANY or other == DENSITY_ANY:
+        return density == DENSITY_ANY
+    if density == requested or other == requested:
+        return density == requested
+    low, high = sorted((density, other))
+    bigger = density == high
+    if requested >= high:
+        return bigger
+    if low >= requested:
+        return not bigger
+    # One above and one below: scaling down the bigger one usually looks better
+    if (2 * low - requested) * high > requested * requested:
+        return not bigger
+    return bigger
+
+
+class ResourceTable:
+    """resources.arsc; type chunks are indexed up front and entries read on lookup."""
+
+    def __init__(self, data: bytes):
+        chunk_type, header_size, size, _ = struct.unpack_from("<HHII", data, 0)
+        if chunk_type != RES_TABLE_TYPE:
+            raise ValueError("not a resource table")
+        self.data = data
+        self.strings: StringPool | None = None
+        # (package id, type id) -> offsets of its ResTable_type chunks, one per configuration
+        self.types: dict[tuple[int, int], list[int]] = {}
+        offset = header_size
+        while offset < min(size, len(data)):
+            chunk_type, _, chunk_size = struct.unpack_from("<HHI", data, offset)
+            if chunk_size < 8:
+                raise ValueError(f"corrupt table chunk at {offset}")
+            if chunk_type == RES_STRING_POOL_TYPE:
+                self.strings = StringPool(data, offset)
+            elif chunk_type == RES_TABLE_PACKAGE_TYPE:
+                self._index_package(offset)
+            offset += chunk_size
+
+    def _index_package(self, offset: int):
+        _, header_size, size, package_id = struct.unpack_from("<HHII", self.data, offset)
+        pos = offset + header_size
+        while pos < offset + size:
+            chunk_type, _, chunk_size = struct.unpack_from("<HHI", self.data, pos)
+            if chunk_size < 8:
+                raise ValueError(f"corrupt package chunk at {pos}")
+            if chunk_type == RES_TABLE_TYPE_TYPE:
+                self.types.setdefault((package_id, self.data[pos + 8]), []).append(pos)
+            pos += chunk_size
+
+    def _entry_offset(self, chunk: int, index: int) -> int | None:
+        data = self.data
+        _, header_size, _, _, flags, _, entry_count, entries_start = struct.unpack_from("<HHIBBHII", data, chunk)
+        offsets = chunk + header_size
+        if flags & TYPE_FLAG_SPARSE:
+            # Sorted (entry index, offset / 4) pairs
+            low, high = 0, entry_count
+            while low < high:
+                middle = (low + high) // 2
+                entry, value = struct.unpack_from("<HH", data, offsets + 4 * middle)
+                if entry == index:
+                    return chunk + entries_start + value * 4
+                if entry < index:
+                    low = middle + 1
+                else:
+                    high = middle
+            return None
+        if index >= entry_count:
+            return None
+        if flags & TYPE_FLAG_OFFSET16:
+            (value,) = struct.unpack_from("<H", data, offsets + 2 * index)
+            return None if value == 0xFFFF else chunk + entries_start + value * 4
+        (value,) = struct.unpack_from("<I", data, offsets + 4 * index)
+        return None if value == NO_ENTRY else chunk + entries_start + value
+
+    def values(self, resource_id: int) -> list[tuple[bytes, int, int, object]]:
+        """Every simple value of a resource as (language, density, data_type, value)."""
+        key = (resource_id >> 24, (resource_id >> 16) & 0xFF)
+        index = resource_id & 0xFFFF
+        data = self.data
+        values = []
+        for chunk in self.types.get(key, ()):
+            entry = self._entry_offset(chunk, index)
+            if entry is None:
+                continue
+            config = chunk + 20
+            language = data[config + 8:config + 12]
+            (density,) = struct.unpack_from("<H", data, config + 14)
+            size, flags = struct.unpack_from("<HH", data, entry)
+            if flags & ENTRY_FLAG_COMPACT:
+                data_type, value = flags >> 8, struct.unpack_from("<I", data, entry + 4)[0]
+            elif flags & ENTRY_FLAG_COMPLEX:
+                continue  # styles, arrays, plurals: not needed here
+            else:
+                _, _, data_type, value = struct.unpack_from("<HBBI", data, entry + size)
+            values.append((language, density, *typed_value(self.strings, data_type, value)))
+        return values
+
+    def resolve(self, resource_id: int, density: int | None = None):
+        """Value for the default locale (and best match for density), following references."""
+        for _ in range(MAX_REFERENCE_DEPTH):
+            values = self.values(resource_id)
+            if not values:
+                return None
+            default_locale = [v for v in values if not any(v[0])] or values
+            best = default_locale[0]
+            if density is not None:
+                for candidate in default_locale[1:]:
+                    if density_is_better(candidate[1], best[1], density):
+                        best = candidate
+            _, _, data_type, value = best
+            if data_type != TYPE_REFERENCE:
+                return value
+            resource_id = value
+        raise ValueError(f"reference loop at 0x{resource_id:08x}")
+
+
+def manifest_info(manifest: bytes, table: ResourceTable | None, icon_density: int = 320) -> dict:
+    info = {"package": None, "versionCode": None, "versionName": None,
+            "label": None, "icon": None, "meta_data": {}}
+
+    def resolve(attribute, density=None):
+        data_type, value = attribute
+        if data_type == TYPE_REFERENCE:
+            return table.resolve(value, density) if table else None
+        return value
+
+    for depth, tag, attributes in iter_xml_elements(manifest):
+        if depth == 0 and tag == "manifest":
+            for key in ("package", "versionCode", "versionName"):
+                if key in attributes:
+                    info[key] = resolve(attributes[key])
+        elif depth == 1 and tag == "application":
+            if "label" in attributes:
+                info["label"] = resolve(attributes["label"])
+            if "icon" in attributes:
+                info["icon"] = resolve(attributes["icon"], icon_density)
+        elif tag == "meta-data" and "name" in attributes:
+            name = resolve(attributes["name"])
+            value = attributes.get("value")
+            info["meta_data"].setdefault(name, resolve(value) if value else None)
+    return info
+
+
+def read_apk(apk: Path | str, icon_density: int = 320) -> dict:
+    """Manifest metadata of an APK; icon is the zip path of the best icon for icon_density."""
+    with ZipFile(apk) as z:
+        manifest = z.read("AndroidManifest.xml")
+        try:
+            table = ResourceTable(z.read("resources.arsc"))
+        except KeyError:
+            table = None
+    return manifest_info(manifest, table, icon_density)
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return 1
+    for apk in sys.argv[1:]:
+        print(json.dumps({"apk": apk, **read_apk(apk)}, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
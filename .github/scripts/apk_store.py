@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for built APKs.
+
+blobs/<sha256> holds each distinct APK once (read-only) and names.json maps
+APK file names to blobs. move-built-apks.py adds the downloaded artifacts
+and hardlinks them into repo/apk; create-repo.py and merge-repo.py take
+hashes from the store instead of re-reading files. gc drops blobs that no
+published index refers to. The build workflows restore the directory
+with actions/cache; build_push.yml saves it after merge-repo.py, keyed on
+the published index.min.json.
+
+Usage:
+    apk_store.py gc INDEX_JSON [INDEX_JSON ...]
+    apk_store.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+from pathlib import Path
+
+STORE_DIR = Path(os.getenv("APK_STORE", Path.home() / "apk-store"))
+NAMES_VERSION = 1
+
+
+def file_sha256(path: Path | str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(source: Path | str, target: Path) -> str:
+    """Hardlink source to target (replacing it), or copy across filesystems."""
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp)
+        mode = "linked"
+    except OSError:
+        shutil.copyfile(source, tmp)
+        mode = "copied"
+    os.replace(tmp, target)
+    return mode
+
+
+class ApkStore:
+    def __init__(self, root: Path = STORE_DIR):
+        self.root = root
+        self.blobs = root / "blobs"
+        self.names_file = root / "names.json"
+        self.names: dict[str, str] = {}
+        try:
+            data = json.loads(self.names_file.read_text())
+            if data.get("version") == NAMES_VERSION:
+                self.names = data["names"]
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+
+    def blob(self, sha256: str) -> Path:
+        return self.blobs / sha256
+
+    def add(self, source: Path, name: str) -> tuple[str, bool]:
+        """Move source into the store under name; return (sha256, whether the blob is new)."""
+        sha256 = file_sha256(source)
+        blob = self.blob(sha256)
+        new = not blob.exists()
+        if new:
+            self.blobs.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_name(f".{sha256}.tmp")
+            shutil.move(source, tmp)
+            os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            os.replace(tmp, blob)
+        else:
+            source.unlink()
+        self.names[name] = sha256
+        return sha256, new
+
+    def link(self, name: str, target: Path) -> str:
+        """Put the blob for name at target: "unchanged", "linked" or "copied"."""
+        blob = self.blob(self.names[name])
+        if target.exists() and os.path.samefile(blob, target):
+            return "unchanged"
+        return link_or_copy(blob, target)
+
+    def sha256(self, path: Path) -> str | None:
+        """Hash of a file hardlinked from the store, without reading it; None if it is not."""
+        sha256 = self.names.get(path.name)
+        if sha256 is None:
+            return None
+        try:
+            return sha256 if os.path.samefile(path, self.blob(sha256)) else None
+        except FileNotFoundError:
+            return None
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.names_file.with_name(f".{self.names_file.name}.tmp")
+        tmp.write_text(json.dumps({"version": NAMES_VERSION, "names": dict(sorted(self.names.items()))}, indent=1))
+        os.replace(tmp, self.names_file)
+
+    def gc(self, referenced_names) -> tuple[int, int]:
+        """Forget names not in referenced_names and delete unreferenced blobs; return (blobs, bytes) freed.
+
+        Does nothing when there is no store yet, so running a script locally doesn't create one.
+        """
+        if not self.root.is_dir():
+            return 0, 0
+        referenced_names = set(referenced_names)
+        self.names = {name: sha256 for name, sha256 in self.names.items() if name in referenced_names}
+        keep = set(self.names.values())
+        removed = freed = 0
+        if self.blobs.is_dir():
+            with os.scandir(self.blobs) as entries:
+                for entry in entries:
+                    if entry.name not in keep:
+                        freed += entry.stat().st_size
+                        os.unlink(entry.path)
+                        removed += 1
+        self.save()
+        return removed, freed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed APK store")
+    parser.add_argument("--store", type=Path, default=STORE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    collect = sub.add_parser("gc", help="delete blobs not referenced by the given index.min.json files")
+    collect.add_argument("indexes", type=Path, nargs="+")
+    sub.add_parser("stats", help="print blob count and size")
+    args = parser.parse_args()
+
+    store = ApkStore(args.store)
+    if args.command == "gc":
+        names = {item["apk"] for index in args.indexes for item in json.loads(index.read_text())}
+        removed, freed = store.gc(names)
+        print(f"Removed {removed} blobs ({freed / 1024 / 1024:.1f} MiB), {len(store.names)} names kept")
+        return 0
+    sizes = [entry.stat().st_size for entry in os.scandir(store.blobs)] if store.blobs.is_dir() else []
+    print(f"{len(store.names)} names, {len(sizes)} blobs, {sum(sizes) / 1024 / 1024:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
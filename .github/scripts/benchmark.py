@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the release scripts in .github/scripts.
+
+Builds synthetic repositories (src/<lang>/<ext> modules with build files
+and Kotlin sources, lib dependency chains, multisrc themes, fake APKs and
+a published index) and runs generate-build-matrices.py, bump-versions.py,
+move-built-apks.py, create-repo.py and merge-repo.py against them, each as
+a separate process. A stand-in `git` on PATH answers `git diff` from a
+fixed change list and ignores add/commit; nothing calls gradle or aapt
+any more (module_graph.py, apk_reader.py). Wall time and peak RSS are
+recorded per script; scripts that print a phase table (create-repo.py)
+also get per-phase times.
+
+Usage:
+    benchmark.py                                     # 100 and 1000 extensions
+    benchmark.py --sizes 1000,5000 --changed 0.05 --out results.json
+    benchmark.py --cases create-repo,create-repo-warm --keep
+"""
+
+import sys
+assert sys.version_info >= (3, 12), "Requires Python 3.12+"
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import struct
+import subprocess
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from zipfile import ZIP_STORED, ZipFile
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_SIZES = "100,1000"
+LANGS = ("all", "en", "es", "id", "pt", "de", "fr", "it", "ar", "tr")
+PACKAGE_PREFIX = "eu.kanade.tachiyomi.animeextension."
+THEME_RATIO = 0.2           # share of extensions built from a multisrc theme
+MAX_LIBS_PER_EXTENSION = 4
+LIB_CHAIN_RATIO = 0.3       # share of libs depending on the previous lib
+APK_KB = (40, 400)          # fake classes.dex size range
+SOURCE_KB = (2, 60)
+ICON_DENSITIES = (160, 240, 320, 480, 640)
+PHASE_REGEX = re.compile(r"^\s+(\w+)\s+([\d.]+)s\s+(\d+) items$", re.MULTILINE)
+
+FAKE_GIT = """#!/bin/sh
+# git stand-in: diff answers from $BENCH_CHANGED_FILES, everything else succeeds silently
+if [ "$1" = "diff" ]; then cat "$BENCH_CHANGED_FILES"; fi
+exit 0
+"""
+
+
+# ---------------------------------------------------------------- fake APKs
+
+RES_ANDROID = "http://schemas.android.com/apk/res/android"
+ATTRIBUTE_IDS = {"label": 0x01010001, "icon": 0x01010002, "name": 0x01010003,
+                 "value": 0x01010024, "versionCode": 0x0101021B, "versionName": 0x0101021C}
+ICON_ID = 0x7F010000
+LABEL_ID = 0x7F020000
+
+
+def _string_pool(strings: list[str], utf8: bool = False) -> bytes:
+    offsets, body = [], bytearray()
+    for string in strings:
+        offsets.append(len(body))
+        if utf8:
+            encoded = string.encode()
+            # Lengths below 0x80 fit in one byte each; synthetic strings stay short
+            body += bytes((len(string), len(encoded))) + encoded + b"\0"
+        else:
+            body += struct.pack("<H", len(string)) + string.encode("utf-16-le") + b"\0\0"
+    body += b"\0" * (-len(body) % 4)
+    start = 28 + 4 * len(strings)
+    return (struct.pack("<HHIIIIII", 0x0001, 28, start + len(body), len(strings), 0,
+                        0x100 if utf8 else 0, start, 0)
+            + struct.pack(f"<{len(strings)}I", *offsets) + bytes(body))
+
+
+def fake_manifest(package: str, code: int, version: str, label: str | int, nsfw: int) -> bytes:
+    """Binary AndroidManifest.xml with what create-repo.py reads; an int label is a resource reference."""
+    attribute_names = list(ATTRIBUTE_IDS)
+    strings = attribute_names + [RES_ANDROID, "package", "manifest", "application", "meta-data",
+                                 package, version, "tachiyomi.animeextension.nsfw",
+                                 "tachiyomi.animeextension.class", ".Extension"]
+    if isinstance(label, str):
+        strings.append(label)
+    index = {string: i for i, string in enumerate(strings)}
+    none = 0xFFFFFFFF
+
+    def attribute(name, data_type, data):
+        android = name in ATTRIBUTE_IDS
+        raw = data if data_type == 0x03 else none
+        return struct.pack("<IIIHBBI", index[RES_ANDROID] if android else none, index[name], raw, 8, 0, data_type, data)
+
+    def element(tag, attributes):
+        body = struct.pack("<IIHHHHHH", none, index[tag], 20, 20, len(attributes), 0, 0, 0) + b"".join(attributes)
+        return struct.pack("<HHIII", 0x0102, 16, 16 + len(body), 1, none) + body
+
+    def end(tag):
+        return struct.pack("<HHIIIII", 0x0103, 16, 24, 1, none, none, index[tag])
+
+    nodes = (
+        element("manifest", [attribute("versionCode", 0x10, code), attribute("versionName", 0x03, index[version]),
+                             attribute("package", 0x03, index[package])])
+        + element("application", [attribute("icon", 0x01, ICON_ID),
+                                  attribute("label", 0x01, label) if isinstance(label, int)
+                                  else attribute("label", 0x03, index[label])])
+        + element("meta-data", [attribute("name", 0x03, index["tachiyomi.animeextension.class"]),
+                                attribute("value", 0x03, index[".Extension"])]) + end("meta-data")
+        + element("meta-data", [attribute("name", 0x03, index["tachiyomi.animeextension.nsfw"]),
+                                attribute("value", 0x10, nsfw)]) + end("meta-data")
+        + end("application") + end("manifest")
+    )
+    resource_map = struct.pack(f"<HHI{len(attribute_names)}I", 0x0180, 8, 8 + 4 * len(attribute_names),
+                               *ATTRIBUTE_IDS.values())
+    body = _string_pool(strings) + resource_map + nodes
+    return struct.pack("<HHI", 0x0003, 8, 8 + len(body)) + body
+
+
+def _type_chunk(resource_id: int, density: int, key: int, string: int) -> bytes:
+    """ResTable_type with a single string entry for resource_id in one density."""
+    config = bytearray(64)
+    struct.pack_into("<I", config, 0, 64)
+    struct.pack_into("<H", config, 14, density)
+    entries = struct.pack("<I", 0)
+    entry = struct.pack("<HHI", 8, 0, key) + struct.pack("<HBBI", 8, 0, 0x03, string)
+    header_size = 20 + len(config)
+    return (struct.pack("<HHIBBHII", 0x0201, header_size, header_size + len(entries) + len(entry),
+                        resource_id >> 16 & 0xFF, 0, 0, 1, header_size + len(entries))
+            + bytes(config) + entries + entry)
+
+
+def fake_resources(icons: dict[int, str], label: str | None = None) -> bytes:
+    """resources.arsc with one mipmap entry (ICON_ID) per density, and label as string LABEL_ID."""
+    paths = list(icons.values())
+    types = b"".join(_type_chunk(ICON_ID, density, 0, i) for i, density in enumerate(icons))
+    type_names, key_names = ["mipmap"], ["ic_launcher"]
+    if label is not None:
+        types += _type_chunk(LABEL_ID, 0, 1, len(paths))
+        paths.append(label)
+        type_names.append("string")
+        key_names.append("app_name")
+    type_strings = _string_pool(type_names, utf8=True)
+    key_strings = _string_pool(key_names, utf8=True)
+    name = "eu.kanade.tachiyomi".encode("utf-16-le").ljust(256, b"\0")
+    header_size = 288
+    body = type_strings + key_strings + types
+    package = (struct.pack("<HHII", 0x0200, header_size, header_size + len(body), ICON_ID >> 24) + name
+               + struct.pack("<IIIII", header_size, len(type_names), header_size + len(type_strings),
+                             len(key_names), 0) + body)
+    strings = _string_pool(paths, utf8=True)
+    return struct.pack("<HHII", 0x0002, 12, 12 + len(strings) + len(package), 1) + strings + package
+
+
+def fake_apk(path: Path, package: str, code: int, version: str, label: str, nsfw: int, rng: random.Random,
+             label_resource: bool = False):
+    """label_resource puts the label in resources.arsc, referenced from the manifest like aapt does."""
+    icons = {density: f"res/mipmap-{density}dpi/ic_launcher.png" for density in ICON_DENSITIES}
+    with ZipFile(path, "w", ZIP_STORED) as z:
+        z.writestr("AndroidManifest.xml",
+                   fake_manifest(package, code, version, LABEL_ID if label_resource else label, nsfw))
+        z.writestr("resources.arsc", fake_resources(icons, label if label_resource else None))
+        for density, icon in icons.items():
+            z.writestr(icon, b"\x89PNG\r\n\x1a\n" + rng.randbytes(density * 8))
+        z.writestr("classes.dex", rng.randbytes(rng.randint(*APK_KB) * 1024))
+
+
+# ---------------------------------------------------------------- repository
+
+def make_repo(root: Path, extensions: int, libs: int, seed: int) -> list[dict]:
+    """Synthetic extension repo; returns one dict per extension (module, lang, name, libs, theme)."""
+    rng = random.Random(seed)
+    lib_names = [f"lib{i:04d}-extractor" for i in range(libs)]
+    for i, lib in enumerate(lib_names):
+        dependencies = ""
+        if i and rng.random() < LIB_CHAIN_RATIO:
+            dependencies = f'\ndependencies {{\n    implementation(project(":lib:{lib_names[i - 1]}"))\n}}\n'
+        directory = root / "lib" / lib
+        (directory / "src").mkdir(parents=True)
+        (directory / "build.gradle.kts").write_text(f'plugins {{\n    id("lib-android")\n}}\n{dependencies}')
+        (directory / "src" / "Extractor.kt").write_text("// extractor\n" * 40 * rng.randint(*SOURCE_KB))
+
+    themes = [f"theme{i:03d}" for i in range(extensions // 50 + 1)]
+    for theme in themes:
+        directory = root / "lib-multisrc" / theme
+        (directory / "src").mkdir(parents=True)
+        used = rng.sample(lib_names, min(2, libs))
+        dependencies = "".join(f'    api(project(":lib:{lib}"))\n' for lib in used)
+        (directory / "build.gradle.kts").write_text(
+            f'plugins {{\n    id("lib-multisrc")\n}}\n\nbaseVersionCode = 1\n\ndependencies {{\n{dependencies}}}\n'
+        )
+        (directory / "src" / "Theme.kt").write_text("// theme\n" * 40 * rng.randint(*SOURCE_KB))
+
+    modules = []
+    for i in range(extensions):
+        lang, name = LANGS[i % len(LANGS)], f"ext{i:05d}"
+        directory = root / "src" / lang / name
+        (directory / "src").mkdir(parents=True)
+        theme = rng.choice(themes) if rng.random() < THEME_RATIO else None
+        used = [] if theme else rng.sample(lib_names, rng.randint(0, min(MAX_LIBS_PER_EXTENSION, libs)))
+        lines = ["ext {", f"    extName = '{name.title()}'", f"    extClass = '.{name.title()}'"]
+        lines += [f"    themePkg = '{theme}'", "    overrideVersionCode = 0"] if theme else ["    extVersionCode = 1"]
+        lines += ["}", "", 'apply from: "$rootDir/common.gradle"', ""]
+        if used:
+            lines += ["dependencies {"] + [f"    implementation(project(':lib:{lib}'))" for lib in used] + ["}", ""]
+        (directory / "build.gradle").write_text("\n".join(lines))
+        (directory / "src" / "Source.kt").write_text("// source\n" * 40 * rng.randint(*SOURCE_KB))
+        modules.append({"lang": lang, "name": name, "libs": used, "theme": theme})
+
+    github = root / ".github"
+    github.mkdir()
+    (github / "always_build.json").write_text("[]")
+    return modules
+
+
+def index_entry(module: dict, code: int) -> dict:
+    pkg = f"{PACKAGE_PREFIX}{module['lang']}.{module['name']}"
+    return {
+        "name": f"Aniyomi: {module['name'].title()}",
+        "pkg": pkg,
+        "apk": f"aniyomi-{module['lang']}.{module['name']}-v14.{code}.apk",
+        "lang": module["lang"],
+        "code": code,
+        "version": f"14.{code}",
+        "nsfw": 0,
+        "sources": [{"name": module["name"].title(), "lang": module["lang"],
+                     "id": str(zlib.crc32(pkg.encode())), "baseUrl": f"https://{module['name']}.example"}],
+    }
+
+
+def make_release(root: Path, modules: list[dict], built: list[dict], seed: int):
+    """Artifacts for the built modules, Inspector output.json, and the published repo for all modules."""
+    rng = random.Random(seed + 1)
+    artifacts = root / "home" / "apk-artifacts"
+    inspector = {}
+    for i, module in enumerate(built):
+        entry = index_entry(module, 2)
+        directory = artifacts / f"individual-apks-{i % 8 + 1}" / "src" / module["lang"] / module["name"]
+        directory.mkdir(parents=True, exist_ok=True)
+        fake_apk(directory / entry["apk"].replace(".apk", "-release.apk"), entry["pkg"], entry["code"],
+                 entry["version"], entry["name"], 0, rng)
+        inspector[entry["pkg"]] = entry["sources"]
+    (root / "work").mkdir()
+    (root / "work" / "output.json").write_text(json.dumps(inspector))
+
+    remote = root / "remote"
+    (remote / "apk").mkdir(parents=True)
+    (remote / "icon").mkdir()
+    index = [index_entry(module, 1) for module in modules]
+    for entry in index:
+        (remote / "apk" / entry["apk"]).write_bytes(rng.randbytes(rng.randint(*APK_KB) * 1024))
+        (remote / "icon" / f"{entry['pkg']}.png").write_bytes(rng.randbytes(4096))
+    (remote / "index.min.json").write_text(json.dumps(index, separators=(",", ":")))
+
+
+# ---------------------------------------------------------------- runner
+
+def run(command: list[str], cwd: Path, env: dict, log: Path) -> tuple[float, int, int]:
+    """Run command with output to log; return (wall seconds, peak RSS KB, exit code)."""
+    with log.open("wb") as output:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                                   stdout=output, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+    code = os.waitstatus_to_exitcode(status)
+    if code:
+        sys.stderr.write(log.read_text(errors="replace")[-4000:])
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return wall, peak_kb, code
+
+
+def _script(name: str) -> list[str]:
+    return [sys.executable, str(SCRIPTS_DIR / name)]
+
+
+# Case: (working directory relative to the size root, function(root, modules, built) -> arguments)
+CASES = {
+    "generate-build-matrices": ("repo", lambda root, built: _script("generate-build-matrices.py") + ["HEAD", "Release"]),
+    "bump-versions": ("repo", lambda root, built: _script("bump-versions.py") + ["bench", "lib/lib0000-extractor/build.gradle.kts"]),
+    "move-built-apks": ("work", lambda root, built: _script("move-built-apks.py")),
+    "create-repo": ("work", lambda root, built: _script("create-repo.py")),
+    "create-repo-warm": ("work", lambda root, built: _script("create-repo.py")),
+    "merge-repo": ("remote", lambda root, built: _script("merge-repo.py") + [
+        json.dumps([f"{m['lang']}.{m['name']}" for m in built]), "work/repo"]),
+}
+
+
+def benchmark(sizes: list[int], cases: list[str], changed: float, seed: int, keep: bool) -> tuple[list, list]:
+    results, datasets = [], []
+    base = Path(tempfile.mkdtemp(prefix="scripts-bench-"))
+    bin_dir = base / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "git").write_text(FAKE_GIT)
+    (bin_dir / "git").chmod(0o755)
+    try:
+        for extensions in sizes:
+            root = base / f"size-{extensions}"
+            libs = max(71, extensions // 4)
+            start = time.perf_counter()
+            modules = make_repo(root / "repo", extensions, libs, seed)
+            built = random.Random(seed).sample(modules, max(1, round(extensions * changed)))
+            make_release(root, modules, built, seed)
+            # One lib at the bottom of the chains plus the built extensions changed since the base ref
+            changed_files = root / "changed.txt"
+            changed_files.write_text("\n".join(
+                ["lib/lib0000-extractor/build.gradle.kts"]
+                + [f"src/{m['lang']}/{m['name']}/src/Source.kt" for m in built]
+            ) + "\n")
+            setup = time.perf_counter() - start
+            datasets.append({"extensions": extensions, "libs": libs, "built": len(built), "setup_s": round(setup, 3)})
+            print(f"[dataset] {extensions:>6} extensions, {libs} libs, {len(built)} built  ({setup:.1f}s)")
+
+            env = {
+                **os.environ,
+                "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+                "HOME": str(root / "home"),
+                "BENCH_CHANGED_FILES": str(changed_files),
+                "APK_STORE": str(root / "home" / "apk-store"),
+                "APK_METADATA_CACHE": str(root / "metadata-cache"),
+            }
+            env.pop("CI", None)
+            for case in cases:
+                workdir, build = CASES[case]
+                log = root / f"{case}.log"
+                wall, peak_kb, code = run(build(root, built), root / workdir, env, log)
+                phases = {
+                    phase: {"wall_s": float(seconds), "items": int(items)}
+                    for phase, seconds, items in PHASE_REGEX.findall(log.read_text(errors="replace"))
+                }
+                results.append({
+                    "case": case,
+                    "extensions": extensions,
+                    "wall_s": round(wall, 4),
+                    "peak_rss_kb": peak_kb,
+                    "exit_code": code,
+                    "phases": phases,
+                })
+                detail = "  ".join(f"{phase} {p['wall_s']:.2f}s" for phase, p in phases.items())
+                print(f"[{case:<23}] {extensions:>6}  {wall:8.2f}s  {peak_kb / 1024:8.1f} MB RSS  {detail}"
+                      + ("" if code == 0 else f"  EXIT {code}"))
+            if not keep:
+                shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if keep:
+            print(f"Workdir kept at {base}")
+        else:
+            shutil.rmtree(base, ignore_errors=True)
+    return datasets, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the .github/scripts release pipeline")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"extension counts, comma separated (default: {DEFAULT_SIZES})")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"cases to run, in pipeline order (default: all): {', '.join(CASES)}")
+    parser.add_argument("--changed", type=float, default=0.1, help="share of extensions rebuilt (default: 0.1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="write results to a JSON file")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic repositories")
+    args = parser.parse_args()
+
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown case: {', '.join(sorted(unknown))}")
+    # Later cases consume earlier outputs, so keep pipeline order
+    cases.sort(key=list(CASES).index)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    datasets, results = benchmark(sizes, cases, args.changed, args.seed, args.keep)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "datasets": datasets,
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nResults written to {args.out}")
+    else:
+        print(json.dumps(report, indent=2))
+    return 1 if any(r["exit_code"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Build cost estimates and cost-balanced chunking for the build matrix.
+
+Costs come from a persisted history of per-module build seconds
+(.github/build_durations.json). Modules without history fall back to a
+source-size heuristic, scaled to the history when there is any.
+
+build_push.yml keeps the history in actions/cache: each build chunk
+uploads its wall time and modules, and a job after the build runs
+record-chunk for every chunk. The committed file is only the empty seed,
+so runs without a restored cache plan from the heuristic alone.
+
+Usage:
+    build_cost.py record durations.json        # {":src:id:anichin": 84.2, ...}
+    build_cost.py record-chunk 512 :src:id:anichin :src:id:kisskh ...
+    build_cost.py estimate :src:id:anichin ...
+"""
+
+import sys
+assert sys.version_info >= (3, 12), "Requires Python 3.12+"
+
+import argparse
+import heapq
+import json
+import os
+import statistics
+from pathlib import Path
+
+from module_graph import ModuleGraph
+
+HISTORY_FILE = Path(".github", "build_durations.json")
+HISTORY_VERSION = 1
+EWMA_ALPHA = 0.3            # weight of a new sample
+BASE_SECONDS = 20.0         # per-module overhead (configure, dex, package, sign)
+SECONDS_PER_KB = 0.25       # Kotlin sources
+THEME_SHARE = 0.5           # multisrc theme sources are compiled once per chunk, count half
+SOURCE_SUFFIXES = (".kt", ".java")
+
+
+def load_history(path: Path = HISTORY_FILE) -> dict[str, dict]:
+    if not path.is_file():
+        return {}
+    data = json.loads(path.read_text())
+    if data.get("version") != HISTORY_VERSION:
+        return {}
+    return data["modules"]
+
+
+def save_history(modules: dict[str, dict], path: Path = HISTORY_FILE) -> None:
+    data = {"version": HISTORY_VERSION, "modules": dict(sorted(modules.items()))}
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def record(durations: dict[str, float], path: Path = HISTORY_FILE) -> None:
+    """Fold new per-module build seconds into the history (exponential moving average)."""
+    modules = load_history(path)
+    for module, seconds in durations.items():
+        entry = modules.get(module)
+        if entry is None:
+            modules[module] = {"seconds": round(seconds, 1), "samples": 1}
+        else:
+            entry["seconds"] = round(entry["seconds"] + EWMA_ALPHA * (seconds - entry["seconds"]), 1)
+            entry["samples"] += 1
+    save_history(modules, path)
+
+
+def source_kb(directory: Path) -> float:
+    total = 0
+    for root, _, files in os.walk(directory):
+        total += sum(os.path.getsize(os.path.join(root, name))
+                     for name in files if name.endswith(SOURCE_SUFFIXES))
+    return total / 1024
+
+
+def module_dir(module: str) -> Path:
+    return Path(*module.strip(":").split(":"))
+
+
+def heuristic_seconds(module: str, theme_dirs: list[Path]) -> float:
+    kb = source_kb(module_dir(module)) + THEME_SHARE * sum(map(source_kb, theme_dirs))
+    return BASE_SECONDS + SECONDS_PER_KB * kb
+
+
+def estimate_costs(modules: list[str], dependencies: dict[str, list[str]] | None = None,
+                   history: dict[str, dict] | None = None) -> tuple[dict[str, float], dict[str, str]]:
+    """Predicted build seconds per module, and where each estimate came from."""
+    dependencies = dependencies or {}
+    history = load_history() if history is None else history
+
+    heuristics = {}
+    for module in modules:
+        themes = [module_dir(dep) for dep in dependencies.get(module, ()) if dep.startswith(":lib-multisrc:")]
+        heuristics[module] = heuristic_seconds(module, themes)
+
+    # Scale the heuristic to this runner using modules that have both numbers
+    ratios = [history[m]["seconds"] / heuristics[m] for m in modules if m in history]
+    scale = statistics.median(ratios) if ratios else 1.0
+
+    costs, sources = {}, {}
+    for module in modules:
+        if module in history:
+            costs[module] = history[module]["seconds"]
+            sources[module] = "history"
+        else:
+            costs[module] = heuristics[module] * scale
+            sources[module] = "heuristic"
+    return costs, sources
+
+
+def pack(costs: dict[str, float], chunk_count: int, max_modules: int | None = None) -> list[tuple[float, list[str]]]:
+    """Longest processing time first: biggest module goes to the least loaded chunk that isn't full."""
+    if max_modules:
+        chunk_count = max(chunk_count, -(-len(costs) // max_modules))
+    chunk_count = max(1, min(chunk_count, len(costs)))
+    heap = [(0.0, i) for i in range(chunk_count)]
+    chunks = [[] for _ in range(chunk_count)]
+    loads = [0.0] * chunk_count
+    for module in sorted(costs, key=lambda m: (-costs[m], m)):
+        load, i = heapq.heappop(heap)
+        chunks[i].append(module)
+        loads[i] = load + costs[module]
+        # A full chunk leaves the heap; there are enough chunks for the rest
+        if not max_modules or len(chunks[i]) < max_modules:
+            heapq.heappush(heap, (loads[i], i))
+    packed = [(loads[i], chunks[i]) for i in range(chunk_count) if chunks[i]]
+    packed.sort(key=lambda chunk: -chunk[0])
+    return packed
+
+
+def plan_chunks(costs: dict[str, float], chunk_count: int | None = None,
+                max_chunk_seconds: float | None = None, chunk_size: int = 65) -> list[tuple[float, list[str]]]:
+    """Pick the chunk count (explicit, smallest meeting max_chunk_seconds, or by size) and pack.
+
+    chunk_size also caps the modules per chunk in every mode, as the fixed-size chunks did.
+    """
+    if not costs:
+        return []
+    min_count = -(-len(costs) // chunk_size)
+    if chunk_count is None and max_chunk_seconds is not None:
+        # A chunk can never be faster than its biggest module
+        for count in range(min_count, len(costs) + 1):
+            chunks = pack(costs, count, chunk_size)
+            if chunks[0][0] <= max_chunk_seconds:
+                return chunks
+        return chunks
+    return pack(costs, chunk_count or min_count, chunk_size)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Module build cost history and estimates")
+    parser.add_argument("--history", type=Path, default=HISTORY_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("record", help="merge a {module: seconds} JSON file into the history")
+    add.add_argument("durations", type=Path)
+    chunk = sub.add_parser("record-chunk", help="split one chunk's wall time over its modules by estimate")
+    chunk.add_argument("seconds", type=float)
+    chunk.add_argument("modules", nargs="+")
+    show = sub.add_parser("estimate", help="print predicted seconds per module")
+    show.add_argument("modules", nargs="+")
+    args = parser.parse_args()
+
+    modules = [m.removesuffix(":assembleRelease").removesuffix(":assembleDebug") for m in getattr(args, "modules", [])]
+    if args.command == "record":
+        record(json.loads(args.durations.read_text()), args.history)
+        return 0
+    # Same estimate as generate-build-matrices.py: themes count towards their extensions
+    dependencies = ModuleGraph.load().dependencies
+    if args.command == "record-chunk":
+        costs, _ = estimate_costs(modules, dependencies, load_history(args.history))
+        total = sum(costs.values())
+        record({m: args.seconds * cost / total for m, cost in costs.items()}, args.history)
+    else:
+        costs, sources = estimate_costs(modules, dependencies, load_history(args.history))
+        for module in modules:
+            print(f"{costs[module]:8.1f}s  {sources[module]:<9}  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,133 +1,122 @@
 #!/usr/bin/env python3
 
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-import itertools
+import os
 from pathlib import Path
 import re
 import subprocess
 import sys
-from collections import deque # Add this import
+import tempfile
+from collections import deque
+
+from module_graph import ModuleGraph
 
 VERSION_STR = "VersionCode ="
 VERSION_REGEX = re.compile(f"{VERSION_STR} (\\d+)")
-BUMPED_FILES: list[Path] = []
-
-def has_match(query: str, file: Path) -> tuple[Path, bool]:
-    return (file, query in file.read_text())
-
-def find_libs_with_match(query: str, lib_name_regex: re.Pattern) -> list[str]:
-    files = Path("lib").glob("*/build.gradle.kts")
-
-    # Use multiple threads to find matches.
-    with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(has_match, query, file) for file in files]
-        results = map(Future.result, as_completed(futures))
-        lib_path_list = [path for path, result in results if result]
-        # Use the passed lib_name_regex
-        return [match.group(1) for match in filter(None, (lib_name_regex.search(str(lib_path_obj)) for lib_path_obj in lib_path_list))]
-
-def find_files_with_match(query: str, include_multisrc: bool = True) -> list[Path]:
-    files = Path("src").glob("*/*/build.gradle")
-    if include_multisrc:
-        files = itertools.chain(files, Path("lib-multisrc").glob("*/build.gradle.kts"))
-
-    # Prevent bumping files twice.
-    files = filter(lambda file: file not in BUMPED_FILES, files)
-
-    # Use multiple threads to find matches.
-    with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(has_match, query, file) for file in files]
-        results = map(Future.result, as_completed(futures))
-        return [path for path, result in results if result]
-
-def replace_version(match: re.Match) -> str:
-    version = int(match[1])
-    print(f"{version} -> {version + 1}")
-    return f"{VERSION_STR} {version + 1}"
-
-def bump_version(file: Path):
-    BUMPED_FILES.append(file)
-    with file.open("r+") as f:
-        print(f"\n{file}: ", end="")
-        text = VERSION_REGEX.sub(replace_version, f.read())
-        # Move the cursor to the start again, to prevent writing at the end
-        f.seek(0)
-        f.write(text)
-
-def bump_lib_multisrc(theme: str):
-    for file in find_files_with_match(f"themePkg = '{theme}'", include_multisrc=False):
-        bump_version(file)
-
-def commit_changes():
-    paths = [str(path.resolve()) for path in BUMPED_FILES]
+LIB_NAME_REGEX = re.compile(r"lib/([a-z0-9-]+)/")
+
+def discover_libs(graph: ModuleGraph, changed_files: list[str]) -> list[str]:
+    """Changed libs plus every lib depending on them, transitively."""
+    queue = deque()
+    libs = {}
+    for match in filter(None, map(LIB_NAME_REGEX.search, changed_files)):
+        lib = f":lib:{match.group(1)}"
+        if lib not in libs:
+            libs[lib] = None
+            queue.append(lib)
+            print(f"Initial lib for discovery: {lib}")
+
+    while queue:
+        lib = queue.popleft()
+        for dependent in sorted(graph.dependents.get(lib, ())):
+            if dependent.startswith(":lib:") and dependent not in libs:
+                libs[dependent] = lib
+                queue.append(dependent)
+                print(f"  Discovered dependent lib: {dependent} (uses {lib})")
+    return list(libs)
+
+def plan_bumps(graph: ModuleGraph, libs: list[str]) -> dict[Path, str]:
+    """Build file -> reason, for every extension using one of the libs directly or through its theme."""
+    plan: dict[Path, str] = {}
+    for lib in libs:
+        for dependent in sorted(graph.dependents.get(lib, ())):
+            if dependent.startswith(":src:"):
+                plan.setdefault(graph.build_files[dependent], f"uses {lib}")
+            elif dependent.startswith(":lib-multisrc:"):
+                # Theme extensions are bumped through overrideVersionCode
+                for extension in sorted(graph.dependents.get(dependent, ())):
+                    if extension.startswith(":src:"):
+                        plan.setdefault(graph.build_files[extension], f"theme {dependent} uses {lib}")
+    return plan
+
+def bumped_text(file: Path) -> tuple[str, list[tuple[int, int]]]:
+    changes = []
+
+    def replace_version(match: re.Match) -> str:
+        version = int(match[1])
+        changes.append((version, version + 1))
+        return f"{VERSION_STR} {version + 1}"
+
+    return VERSION_REGEX.sub(replace_version, file.read_text()), changes
+
+def write_atomic(file: Path, text: str):
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{file.name}.", dir=file.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.chmod(tmp_path, file.stat().st_mode)
+        os.replace(tmp_path, file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def commit_changes(files: list[Path], cause: str):
+    paths = [str(path.resolve()) for path in files]
     subprocess.check_call(["git", "add"] + paths)
     commit_message = "[skip ci] chore: Mass-bump on extensions"
-    if len(sys.argv) > 1:
-        commit_message += f"\n\nCaused by: {sys.argv[1]}"
+    if cause:
+        commit_message += f"\n\nCaused by: {cause}"
     subprocess.check_call(["git", "commit", "-m", commit_message])
     # 'git push' will be doing outside of this script so we can decide per workflow if we want to push or not.
     # subprocess.check_call(["git", "push"])
 
-if __name__ == "__main__" and len(sys.argv) > 2:
-    # Regex to match the lib name in the path, like "unpacker" or "dood-extractor".
-    lib_name_extractor_regex = re.compile(r"lib/([a-z0-9-]+)/")
-
-    libs_to_discover_q = deque() # Queue for the discovery process
-    all_libs_to_process = set() # Set of all unique library names found
-
-    # Initial population of the discovery queue and the set of all libs
-    initial_matches_from_args = filter(None, map(lib_name_extractor_regex.search, sys.argv[2:]))
-    for match_obj in initial_matches_from_args:
-        lib_name = match_obj.group(1)
-        if lib_name not in all_libs_to_process:
-            libs_to_discover_q.append(lib_name)
-            all_libs_to_process.add(lib_name)
-            print(f"Initial lib for discovery: {lib_name}")
-
-    # Phase 1: Discover all transitive dependencies
-    print("\n--- Starting Dependency Discovery Phase ---")
-    discovery_iteration_count = 0
-    while libs_to_discover_q:
-        discovery_iteration_count += 1
-        current_lib_name_for_discovery = libs_to_discover_q.popleft()
-        project_path_for_discovery = f":lib:{current_lib_name_for_discovery}"
-        print(f"Discovery Iteration {discovery_iteration_count}: Scanning dependencies for {project_path_for_discovery}")
-
-        dependent_lib_names = find_libs_with_match(project_path_for_discovery, lib_name_extractor_regex)
-        for dep_lib_name in dependent_lib_names:
-            if dep_lib_name not in all_libs_to_process:
-                libs_to_discover_q.append(dep_lib_name)
-                all_libs_to_process.add(dep_lib_name)
-                print(f"  Discovered and queued new dependent lib: {dep_lib_name}")
-
-    print("\n--- Dependency Discovery Complete ---")
-
-    if not all_libs_to_process:
+def main(args: list[str]):
+    dry_run = bool(args) and args[0] == "--dry-run"
+    if dry_run:
+        args = args[1:]
+    if len(args) < 2:
+        return
+    cause, changed_files = args[0], args[1:]
+
+    # Every build file is read once; references are looked up in memory from here on
+    graph = ModuleGraph.load(cache_file=None)
+    libs = discover_libs(graph, changed_files)
+    if not libs:
         print("No libraries (initial or dependent) were identified for processing.")
-    else:
-        print(f"All libraries identified for version bumping: {all_libs_to_process}")
-        print("\n--- Starting Version Bumping Phase ---")
-        # Phase 2: Perform version bumping for all discovered libraries
-        for lib_name_to_bump in all_libs_to_process:
-            project_path_for_bumping = f":lib:{lib_name_to_bump}"
-            print(f"\nProcessing version bump for project: {project_path_for_bumping}")
-
-            files_to_check_for_bumping = find_files_with_match(project_path_for_bumping)
-            if not files_to_check_for_bumping:
-                print(f"  No files found matching query '{project_path_for_bumping}' for version bumping.")
-
-            for file_to_bump in files_to_check_for_bumping:
-                if file_to_bump.parent.parent.name == "lib-multisrc":
-                    theme_name = file_to_bump.parent.name
-                    print(f"    Bumping multisrc theme: {theme_name} (triggered by {project_path_for_bumping})")
-                    bump_lib_multisrc(theme_name)
-                else:
-                    print(f"    Bumping single extension: {file_to_bump} (triggered by {project_path_for_bumping})")
-                    bump_version(file_to_bump)
-
-    if len(BUMPED_FILES) > 0:
-        print("\nCommitting changes...")
-        commit_changes()
-    elif all_libs_to_process: # If we processed something but bumped no files
+        return
+    print(f"All libraries identified for version bumping: {', '.join(libs)}")
+
+    plan = plan_bumps(graph, libs)
+    # Compute every new file first, so a failure leaves the tree untouched
+    updates = []
+    print(f"\n--- Bump plan ({len(plan)} files) ---")
+    for file, reason in sorted(plan.items()):
+        text, changes = bumped_text(file)
+        versions = ", ".join(f"{old} -> {new}" for old, new in changes) or "no VersionCode found"
+        print(f"{file}: {versions} ({reason})")
+        if changes:
+            updates.append((file, text))
+
+    if dry_run:
+        print("\nDry run, nothing written.")
+        return
+    if not updates:
         print("\nProcessing complete. No files were bumped.")
-        # The case where all_libs_to_process is empty is handled above by the 'if not all_libs_to_process:' block
+        return
+
+    for file, text in updates:
+        write_atomic(file, text)
+    print("\nCommitting changes...")
+    commit_changes([file for file, _ in updates], cause)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,88 +1,164 @@
 import json
 import os
 import re
-import subprocess
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from zipfile import ZipFile
 
-PACKAGE_NAME_REGEX = re.compile(r"package: name='([^']+)'")
-VERSION_CODE_REGEX = re.compile(r"versionCode='([^']+)'")
-VERSION_NAME_REGEX = re.compile(r"versionName='([^']+)'")
-IS_NSFW_REGEX = re.compile(r"'tachiyomi.animeextension.nsfw' value='([^']+)'")
-APPLICATION_LABEL_REGEX = re.compile(r"^application-label:'([^']+)'", re.MULTILINE)
-APPLICATION_ICON_320_REGEX = re.compile(r"^application-icon-320:'([^']+)'", re.MULTILINE)
+from apk_reader import read_apk
+from apk_store import ApkStore, file_sha256
+
+NSFW_META_DATA = "tachiyomi.animeextension.nsfw"
+ICON_DENSITY = 320
 LANGUAGE_REGEX = re.compile(r"aniyomi-([^.]+)")
 
-*_, ANDROID_BUILD_TOOLS = (Path(os.environ["ANDROID_HOME"]) / "build-tools").iterdir()
 REPO_DIR = Path("repo")
 REPO_APK_DIR = REPO_DIR / "apk"
 REPO_ICON_DIR = REPO_DIR / "icon"
 
-REPO_ICON_DIR.mkdir(parents=True, exist_ok=True)
+# Metadata + icon per APK content hash, so unchanged APKs skip manifest parsing and icon extraction.
+# build_push.yml keeps this directory between runs with actions/cache.
+CACHE_DIR = Path(os.getenv("APK_METADATA_CACHE", ".apk-metadata-cache")).expanduser()
+CACHE_INDEX = CACHE_DIR / "index.json"
+CACHE_VERSION = 2
+# A push only rebuilds the changed modules, so entries are kept until unused for this long
+CACHE_MAX_AGE = int(os.getenv("APK_METADATA_CACHE_DAYS", 30)) * 86400
+WORKERS = int(os.getenv("CREATE_REPO_WORKERS", os.cpu_count() or 4))
 
-with open("output.json", encoding="utf-8") as f:
-    inspector_data = json.load(f)
 
-index_min_data = []
+def timed(phase, function, items, executor=ThreadPoolExecutor):
+    """Run function over items on WORKERS workers and record the phase's wall time."""
+    start = time.perf_counter()
+    with executor(max_workers=WORKERS) as pool:
+        # chunksize only matters for process pools: fewer round trips per APK
+        results = list(pool.map(function, items, chunksize=max(1, len(items) // (WORKERS * 4))))
+    timings[phase] = (time.perf_counter() - start, len(items))
+    return results
 
-for apk in REPO_APK_DIR.iterdir():
-    badging = subprocess.check_output(
-        [
-            ANDROID_BUILD_TOOLS / "aapt",
-            "dump",
-            "--include-meta-data",
-            "badging",
-            apk,
-        ]
-    ).decode()
 
-    package_info = next(x for x in badging.splitlines() if x.startswith("package: "))
-    package_name = PACKAGE_NAME_REGEX.search(package_info)[1]
-    application_icon = APPLICATION_ICON_320_REGEX.search(badging)[1]
+def extract_metadata(item: tuple[Path, str]) -> dict:
+    apk, sha256 = item
+    info = read_apk(apk, ICON_DENSITY)
 
-    with ZipFile(apk) as z, z.open(application_icon) as i, (
-        REPO_ICON_DIR / f"{package_name}.png"
-    ).open("wb") as f:
+    # Icon is stored once in the cache; the repo copy is made later
+    with ZipFile(apk) as z, z.open(info["icon"]) as i, (CACHE_DIR / f"{sha256}.png").open("wb") as f:
         f.write(i.read())
 
-    language = LANGUAGE_REGEX.search(apk.name)[1]
-    sources = inspector_data[package_name]
-
-    if len(sources) == 1:
-        source_language = sources[0]["lang"]
-
-        if (
-            source_language != language
-            and source_language not in {"all", "other"}
-            and language not in {"all", "other"}
-        ):
-            language = source_language
-
-    common_data = {
-        "name": APPLICATION_LABEL_REGEX.search(badging)[1],
-        "pkg": package_name,
-        "apk": apk.name,
-        "lang": language,
-        "code": int(VERSION_CODE_REGEX.search(package_info)[1]),
-        "version": VERSION_NAME_REGEX.search(package_info)[1],
-        "nsfw": int(IS_NSFW_REGEX.search(badging)[1]),
-    }
-    min_data = {
-        **common_data,
-        "sources": [],
+    return {
+        "name": info["label"],
+        "pkg": info["package"],
+        "code": int(info["versionCode"]),
+        "version": info["versionName"],
+        "nsfw": int(info["meta_data"].get(NSFW_META_DATA) or 0),
     }
 
-    for source in sources:
-        min_data["sources"].append(
-            {
-                "name": source["name"],
-                "lang": source["lang"],
-                "id": source["id"],
-                "baseUrl": source["baseUrl"],
-            }
-        )
 
-    index_min_data.append(min_data)
+def copy_icon(item: tuple[str, str]):
+    sha256, package_name = item
+    shutil.copyfile(CACHE_DIR / f"{sha256}.png", REPO_ICON_DIR / f"{package_name}.png")
+
+
+timings = {}
+
+
+def main():
+    REPO_ICON_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+    with open("output.json", encoding="utf-8") as f:
+        inspector_data = json.load(f)
+
+    try:
+        cache = json.loads(CACHE_INDEX.read_text())
+        cache = cache["apks"] if cache.get("version") == CACHE_VERSION else {}
+    except (FileNotFoundError, ValueError, KeyError):
+        cache = {}
+
+    store = ApkStore()
+
+    def apk_sha256(apk: Path) -> str:
+        # APKs placed by move-built-apks.py are store hardlinks with a known hash
+        return store.sha256(apk) or file_sha256(apk)
+
+    apks = sorted(REPO_APK_DIR.iterdir())
+    # hashlib and file copies release the GIL; manifest parsing is pure Python and needs processes
+    hashes = timed("hash", apk_sha256, apks)
+
+    misses = [
+        (apk, sha256) for apk, sha256 in zip(apks, hashes)
+        if sha256 not in cache or not (CACHE_DIR / f"{sha256}.png").is_file()
+    ]
+    for (_, sha256), metadata in zip(misses, timed("manifest", extract_metadata, misses, ProcessPoolExecutor)):
+        cache[sha256] = metadata
+
+    timed("icons", copy_icon, [(sha256, cache[sha256]["pkg"]) for sha256 in hashes])
+
+    start = time.perf_counter()
+    index_min_data = []
+
+    for apk, sha256 in zip(apks, hashes):
+        metadata = cache[sha256]
+        package_name = metadata["pkg"]
+
+        language = LANGUAGE_REGEX.search(apk.name)[1]
+        sources = inspector_data[package_name]
+
+        if len(sources) == 1:
+            source_language = sources[0]["lang"]
+
+            if (
+                source_language != language
+                and source_language not in {"all", "other"}
+                and language not in {"all", "other"}
+            ):
+                language = source_language
+
+        common_data = {
+            "name": metadata["name"],
+            "pkg": package_name,
+            "apk": apk.name,
+            "lang": language,
+            "code": metadata["code"],
+            "version": metadata["version"],
+            "nsfw": metadata["nsfw"],
+        }
+        min_data = {
+            **common_data,
+            "sources": [],
+        }
+
+        for source in sources:
+            min_data["sources"].append(
+                {
+                    "name": source["name"],
+                    "lang": source["lang"],
+                    "id": source["id"],
+                    "baseUrl": source["baseUrl"],
+                }
+            )
+
+        index_min_data.append(min_data)
+
+    with REPO_DIR.joinpath("index.min.json").open("w", encoding="utf-8") as index_file:
+        json.dump(index_min_data, index_file, ensure_ascii=False, separators=(",", ":"))
+    timings["index"] = (time.perf_counter() - start, len(index_min_data))
+
+    # Drop entries no run has used for CACHE_MAX_AGE
+    now = int(time.time())
+    for sha256 in hashes:
+        cache[sha256]["seen"] = now
+    cache = {sha256: entry for sha256, entry in cache.items() if now - entry.get("seen", 0) <= CACHE_MAX_AGE}
+    for icon in CACHE_DIR.glob("*.png"):
+        if icon.stem not in cache:
+            icon.unlink()
+    CACHE_INDEX.write_text(json.dumps({"version": CACHE_VERSION, "apks": dict(sorted(cache.items()))}, indent=1))
+
+    print(f"{len(apks)} APKs, {len(apks) - len(misses)} from cache, {len(misses)} extracted ({WORKERS} workers)")
+    for phase, (seconds, count) in timings.items():
+        print(f"  {phase:<8} {seconds:7.2f}s  {count} items")
+
 
-with REPO_DIR.joinpath("index.min.json").open("w", encoding="utf-8") as index_file:
-    json.dump(index_min_data, index_file, ensure_ascii=False, separators=(",", ":"))
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,6 @@
 import sys
 assert sys.version_info >= (3, 12), "Requires Python 3.12+"
 
-import itertools
 import json
 import os
 import re
@@ -12,6 +11,9 @@ import sys
 from pathlib import Path
 from typing import NoReturn
 
+from build_cost import estimate_costs, plan_chunks
+from module_graph import ModuleGraph
+
 EXTENSION_REGEX = re.compile(r"^src/(?P<lang>\w+)/(?P<extension>\w+)")
 MULTISRC_LIB_REGEX = re.compile(r"^lib-multisrc/(?P<multisrc>\w+)")
 LIB_REGEX = re.compile(r"^lib/(?P<lib>[\w-]+)")
@@ -27,7 +29,7 @@ def run_command(command: str) -> str:
         sys.exit(result.returncode)
     return result.stdout.strip()
 
-def get_module_list(ref: str) -> tuple[list[str], list[str]]:
+def get_module_list(ref: str, graph: ModuleGraph) -> tuple[list[str], list[str]]:
     changed_files = run_command(f"git diff --name-only {ref}").splitlines()
 
     modules = set()
@@ -47,11 +49,11 @@ def get_module_list(ref: str) -> tuple[list[str], list[str]]:
         elif match := MULTISRC_LIB_REGEX.search(file):
             multisrc = match.group("multisrc")
             if Path("lib-multisrc", multisrc).is_dir():
-                libs.add(f":lib-multisrc:{multisrc}:printDependentExtensions")
+                libs.add(f":lib-multisrc:{multisrc}")
         elif match := LIB_REGEX.search(file):
             lib = match.group("lib")
             if Path("lib", lib).is_dir():
-                libs.add(f":lib:{lib}:printDependentExtensions")
+                libs.add(f":lib:{lib}")
 
     def is_extension_module(module: str) -> bool:
         if not (match := MODULE_REGEX.search(module)):
@@ -62,9 +64,10 @@ def get_module_list(ref: str) -> tuple[list[str], list[str]]:
         return True
 
     if libs and not core_files_changed:
+        # Parsed from build files (see module_graph.py); `module_graph.py check` verifies against Gradle
         modules.update([
             module for module in
-            run_command("./gradlew -q " + " ".join(libs)).splitlines()
+            graph.dependent_extensions(libs)
             if is_extension_module(module)
         ])
 
@@ -94,21 +97,38 @@ def get_all_modules() -> tuple[list[str], list[str]]:
 
 def main() -> NoReturn:
     _, ref, build_type = sys.argv
-    modules, deleted = get_module_list(ref)
+    graph = ModuleGraph.load()
+    modules, deleted = get_module_list(ref, graph)
+
+    # Chunks are balanced by predicted build time (history, else source size).
+    # CI_CHUNK_COUNT or CI_MAX_CHUNK_SECONDS pick the chunk count, by default one per CI_CHUNK_SIZE modules;
+    # no chunk gets more than CI_CHUNK_SIZE modules either way.
+    costs, sources = estimate_costs(modules, graph.dependencies)
+    chunks = plan_chunks(
+        costs,
+        chunk_count=int(os.environ["CI_CHUNK_COUNT"]) if os.getenv("CI_CHUNK_COUNT") else None,
+        max_chunk_seconds=float(os.environ["CI_MAX_CHUNK_SECONDS"]) if os.getenv("CI_MAX_CHUNK_SECONDS") else None,
+        chunk_size=int(os.getenv("CI_CHUNK_SIZE", 65)),
+    )
 
     chunked = {
         "chunk": [
-            {"number": i + 1, "modules": modules}
-            for i, modules in
-            enumerate(itertools.batched(
-                map(lambda x: f"{x}:assemble{build_type}", modules),
-                int(os.getenv("CI_CHUNK_SIZE", 65))
-            ))
+            {
+                "number": i + 1,
+                "modules": [f"{module}:assemble{build_type}" for module in chunk_modules],
+                "predicted_seconds": round(seconds),
+            }
+            for i, (seconds, chunk_modules) in enumerate(chunks)
         ]
     }
 
     print(f"Module chunks to build:\n{json.dumps(chunked, indent=2)}\n\nModule to delete:\n{json.dumps(deleted, indent=2)}")
 
+    from_history = sum(source == "history" for source in sources.values())
+    print(f"\nPredicted chunk wall time ({from_history}/{len(modules)} modules from history):")
+    for i, (seconds, chunk_modules) in enumerate(chunks):
+        print(f"  chunk {i + 1}: {seconds / 60:6.1f} min, {len(chunk_modules)} modules")
+
     if os.getenv("CI") == "true":
         with open(os.getenv("GITHUB_OUTPUT"), 'a') as out_file:
             out_file.write(f"matrix={json.dumps(chunked)}\n")
@@ -1,51 +1,207 @@
+import gzip
+import hashlib
 import html
-import sys
 import json
+import os
+import sys
 from pathlib import Path
-import shutil
+
+from apk_store import ApkStore, file_sha256, link_or_copy
+
+PACKAGE_PREFIX = "eu.kanade.tachiyomi.animeextension."
+APK_PREFIX = "aniyomi-"
+# Small files for pollers: bumped version + index hash, and the last FEED_LENGTH changes
+VERSION_FILE = "index.version.json"
+CHANGES_FILE = "changes.json"
+FEED_LENGTH = 100
+GZIPPED_FILES = ("index.json", "index.min.json")
 
 REMOTE_REPO: Path = Path.cwd()
 LOCAL_REPO: Path = REMOTE_REPO.parent.joinpath(sys.argv[2])
 
-to_delete: list[str] = json.loads(sys.argv[1])
 
-for module in to_delete:
-    apk_name = f"aniyomi-{module}-v*.*.apk"
-    icon_name = f"eu.kanade.tachiyomi.animeextension.{module}.png"
-    for file in REMOTE_REPO.joinpath("apk").glob(apk_name):
-        print(file.name)
-        file.unlink(missing_ok=True)
-    for file in REMOTE_REPO.joinpath("icon").glob(icon_name):
-        print(file.name)
-        file.unlink(missing_ok=True)
+def apk_pkg(name: str) -> str | None:
+    """aniyomi-<lang>.<name>-v<version>.apk -> package name."""
+    if not name.startswith(APK_PREFIX) or "-v" not in name:
+        return None
+    return PACKAGE_PREFIX + name[len(APK_PREFIX):name.rindex("-v")]
+
+
+def icon_pkg(name: str) -> str | None:
+    return name.removesuffix(".png") if name.startswith(PACKAGE_PREFIX) else None
+
 
-shutil.copytree(src=LOCAL_REPO.joinpath("apk"), dst=REMOTE_REPO.joinpath("apk"), dirs_exist_ok = True)
-shutil.copytree(src=LOCAL_REPO.joinpath("icon"), dst=REMOTE_REPO.joinpath("icon"), dirs_exist_ok = True)
+def scan(directory: Path, pkg_of) -> dict[str, dict[str, os.DirEntry]]:
+    """pkg -> {file name: entry}, from a single directory listing."""
+    files: dict[str, dict[str, os.DirEntry]] = {}
+    if not directory.is_dir():
+        return files
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and (pkg := pkg_of(entry.name)):
+                files.setdefault(pkg, {})[entry.name] = entry
+    return files
 
-with REMOTE_REPO.joinpath("index.min.json").open() as remote_index_file:
-    remote_index = json.load(remote_index_file)
 
-with LOCAL_REPO.joinpath("index.min.json").open() as local_index_file:
-    local_index = json.load(local_index_file)
+def same_file(source: os.DirEntry, target: os.DirEntry, source_sha256: str | None = None) -> bool:
+    source_stat, target_stat = source.stat(), target.stat()
+    if source_stat.st_ino == target_stat.st_ino and source_stat.st_dev == target_stat.st_dev:
+        return True
+    if source_stat.st_size != target_stat.st_size:
+        return False
+    return (source_sha256 or file_sha256(source.path)) == file_sha256(target.path)
 
-index = [
-    item
-    for item in remote_index
-    if not any(item["pkg"].endswith(f".{module}") for module in to_delete)
-]
-index.extend(local_index)
-index.sort(key=lambda x: x["pkg"])
 
-with REMOTE_REPO.joinpath("index.json").open("w", encoding="utf-8") as index_file:
-    json.dump(index, index_file, ensure_ascii=False, indent=2)
+def sync(local: dict, remote: dict, target_dir: Path, removed_pkgs: set[str], stats: dict[str, list[str]],
+         store: ApkStore | None = None):
+    """Make target_dir hold local's files for every pkg in local, and nothing for removed_pkgs."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for pkg in removed_pkgs | local.keys():
+        wanted = local.get(pkg, {})
+        for name, entry in remote.get(pkg, {}).items():
+            if name not in wanted:
+                os.unlink(entry.path)
+                stats["removed"].append(name)
+        for name, entry in wanted.items():
+            existing = remote.get(pkg, {}).get(name)
+            known = store.sha256(Path(entry.path)) if store else None
+            if existing is not None and same_file(entry, existing, known):
+                stats["unchanged"].append(name)
+            else:
+                stats[link_or_copy(entry.path, target_dir / name)].append(name)
 
-with REMOTE_REPO.joinpath("index.min.json").open("w", encoding="utf-8") as index_min_file:
-    json.dump(index, index_min_file, ensure_ascii=False, separators=(",", ":"))
 
-with REMOTE_REPO.joinpath("index.html").open("w", encoding="utf-8") as index_html_file:
-    index_html_file.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="UTF-8">\n<title>apks</title>\n</head>\n<body>\n<pre>\n')
+def merge_index(remote_index: list[dict], local_index: list[dict], removed_pkgs: set[str]) -> tuple[list[dict], dict]:
+    """Drop removed pkgs, upsert local entries; also report what changed against the remote index.
+
+    "updated" are pkgs with a new version code, "changed" those where only other fields differ.
+    """
+    remote_by_pkg = {item["pkg"]: item for item in remote_index}
+    by_pkg = {pkg: item for pkg, item in remote_by_pkg.items() if pkg not in removed_pkgs}
+    changes = {"added": [], "updated": [], "changed": [], "removed": []}
+    for item in local_index:
+        previous = remote_by_pkg.get(item["pkg"])
+        if previous is None:
+            changes["added"].append(item["pkg"])
+        elif previous["code"] != item["code"]:
+            changes["updated"].append(item["pkg"])
+        elif previous != item:
+            changes["changed"].append(item["pkg"])
+        by_pkg[item["pkg"]] = item
+    changes["removed"] = sorted(remote_by_pkg.keys() - by_pkg.keys())
+    return [by_pkg[pkg] for pkg in sorted(by_pkg)], changes
+
+
+def render_html(index: list[dict]) -> str:
+    lines = ['<!DOCTYPE html>\n<html>\n<head>\n<meta charset="UTF-8">\n<title>apks</title>\n</head>\n<body>\n<pre>\n']
     for entry in index:
-        apk_escaped = 'apk/' + html.escape(entry["apk"])
-        name_escaped = html.escape(entry["name"])
-        index_html_file.write(f'<a href="{apk_escaped}">{name_escaped}</a>\n')
-    index_html_file.write('</pre>\n</body>\n</html>\n')
+        lines.append(f'<a href="apk/{html.escape(entry["apk"])}">{html.escape(entry["name"])}</a>\n')
+    lines.append('</pre>\n</body>\n</html>\n')
+    return "".join(lines)
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def write_gzip(path: Path, text: str):
+    # mtime=0 keeps the bytes stable for identical content
+    with open(path, "wb") as f, gzip.GzipFile(fileobj=f, mode="wb", compresslevel=9, mtime=0) as gz:
+        gz.write(text.encode("utf-8"))
+
+
+def load_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def publish_feed(index_min: str, extensions: int, changes: dict) -> bool:
+    """Bump the version file and append to the changes feed when the index content changed."""
+    digest = hashlib.sha256(index_min.encode("utf-8")).hexdigest()
+    previous = load_json(REMOTE_REPO / VERSION_FILE, {})
+    if previous.get("sha256") == digest:
+        return False
+    version = previous.get("version", 0) + 1
+    feed = load_json(REMOTE_REPO / CHANGES_FILE, {}).get("changes", [])
+    feed.insert(0, {
+        "version": version,
+        "sha256": digest,
+        "added": changes["added"],
+        "updated": changes["updated"],
+        "changed": changes["changed"],
+        "removed": changes["removed"],
+    })
+    del feed[FEED_LENGTH:]
+    write_if_changed(REMOTE_REPO / CHANGES_FILE, json.dumps(
+        {"version": version, "changes": feed}, ensure_ascii=False, separators=(",", ":")
+    ))
+    write_if_changed(REMOTE_REPO / VERSION_FILE, json.dumps(
+        {"version": version, "sha256": digest, "extensions": extensions}, separators=(",", ":")
+    ))
+    return True
+
+
+def main():
+    to_delete: list[str] = json.loads(sys.argv[1])
+
+    with LOCAL_REPO.joinpath("index.min.json").open(encoding="utf-8") as local_index_file:
+        local_index = json.load(local_index_file)
+    with REMOTE_REPO.joinpath("index.min.json").open(encoding="utf-8") as remote_index_file:
+        remote_index = json.load(remote_index_file)
+
+    # Rebuilt modules are replaced as a whole: their old APK versions go away
+    removed_pkgs = {PACKAGE_PREFIX + module for module in to_delete}
+    removed_pkgs.update(item["pkg"] for item in local_index)
+
+    store = ApkStore()
+    stats = {"removed": [], "unchanged": [], "linked": [], "copied": []}
+    sync(scan(LOCAL_REPO / "apk", apk_pkg), scan(REMOTE_REPO / "apk", apk_pkg),
+         REMOTE_REPO / "apk", removed_pkgs, stats, store)
+    sync(scan(LOCAL_REPO / "icon", icon_pkg), scan(REMOTE_REPO / "icon", icon_pkg),
+         REMOTE_REPO / "icon", removed_pkgs, stats)
+
+    index, changes = merge_index(remote_index, local_index, removed_pkgs)
+    outputs = {
+        "index.json": json.dumps(index, ensure_ascii=False, indent=2),
+        "index.min.json": json.dumps(index, ensure_ascii=False, separators=(",", ":")),
+        "index.html": render_html(index),
+    }
+    written = [name for name, text in outputs.items() if write_if_changed(REMOTE_REPO / name, text)]
+    for name in GZIPPED_FILES:
+        gz_path = REMOTE_REPO / f"{name}.gz"
+        if name in written or not gz_path.exists():
+            write_gzip(gz_path, outputs[name])
+            written.append(gz_path.name)
+    if publish_feed(outputs["index.min.json"], len(index), changes):
+        written += [VERSION_FILE, CHANGES_FILE]
+
+    # Blobs of APKs that are no longer published
+    blobs, freed = store.gc(item["apk"] for item in index)
+
+    for name in stats["removed"]:
+        print(f"- {name}")
+    for name in stats["linked"] + stats["copied"]:
+        print(f"+ {name}")
+    print(
+        f"\nFiles: {len(stats['removed'])} removed, {len(stats['linked'])} linked, "
+        f"{len(stats['copied'])} copied, {len(stats['unchanged'])} unchanged"
+    )
+    print(f"Store: {blobs} unreferenced blobs removed ({freed / 1024 / 1024:.1f} MiB)")
+    print(
+        f"Index: {len(index)} extensions, {len(changes['added'])} added, "
+        f"{len(changes['updated'])} updated, {len(changes['changed'])} changed, "
+        f"{len(changes['removed'])} removed; "
+        f"wrote {', '.join(written) or 'nothing'}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Static Gradle module dependency graph.
+
+Parses src/*/*/build.gradle, lib/*/build.gradle.kts and
+lib-multisrc/*/build.gradle.kts for project(...) references and themePkg,
+so reverse dependencies can be answered without configuring Gradle.
+Parsed build files are cached by content hash.
+
+Usage:
+    module_graph.py dependents :lib:playlist-utils [:lib-multisrc:dooplay ...]
+    module_graph.py check [MODULE ...]   # compare against :printDependentExtensions
+"""
+
+import sys
+assert sys.version_info >= (3, 12), "Requires Python 3.12+"
+
+import argparse
+import hashlib
+import json
+import re
+import subprocess
+from pathlib import Path
+
+CACHE_VERSION = 1
+DEFAULT_CACHE = Path("build", "module-graph.json")
+
+BUILD_FILE_GLOBS = (
+    "src/*/*/build.gradle",
+    "src/*/*/build.gradle.kts",
+    "lib/*/build.gradle",
+    "lib/*/build.gradle.kts",
+    "lib-multisrc/*/build.gradle",
+    "lib-multisrc/*/build.gradle.kts",
+)
+# Strings are kept so "//" inside URLs is not taken for a comment
+COMMENT_REGEX = re.compile(r"(\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*')|//[^\n]*|/\*.*?\*/", re.S)
+PROJECT_REGEX = re.compile(r"""project\(\s*(?:path\s*[=:]\s*)?["'](:[\w.:-]+)["']""")
+THEME_REGEX = re.compile(r"""themePkg\s*=\s*["']([\w-]+)["']""")
+# Every module depends on :core; core changes rebuild everything anyway
+IGNORED_DEPENDENCIES = {":core"}
+
+
+def module_path(build_file: Path) -> str:
+    return ":" + ":".join(build_file.parent.parts)
+
+
+def parse_build_file(text: str) -> list[str]:
+    text = COMMENT_REGEX.sub(lambda m: m.group(1) or "", text)
+    dependencies = set(PROJECT_REGEX.findall(text))
+    dependencies.update(f":lib-multisrc:{theme}" for theme in THEME_REGEX.findall(text))
+    return sorted(dependencies - IGNORED_DEPENDENCIES)
+
+
+class ModuleGraph:
+    def __init__(self, dependencies: dict[str, list[str]], build_files: dict[str, Path] | None = None):
+        self.dependencies = dependencies
+        self.build_files = build_files or {}
+        self.dependents: dict[str, set[str]] = {}
+        for module, deps in dependencies.items():
+            for dependency in deps:
+                self.dependents.setdefault(dependency, set()).add(module)
+
+    @classmethod
+    def load(cls, root: Path = Path("."), cache_file: Path | None = DEFAULT_CACHE) -> "ModuleGraph":
+        """Parse all build files under root, reusing cached results for unchanged files."""
+        cache = {}
+        cache_path = root / cache_file if cache_file else None
+        if cache_path and cache_path.is_file():
+            try:
+                data = json.loads(cache_path.read_text())
+                if data.get("version") == CACHE_VERSION:
+                    cache = data["files"]
+            except (ValueError, KeyError):
+                pass
+
+        files = {}
+        dependencies = {}
+        build_files = {}
+        for pattern in BUILD_FILE_GLOBS:
+            for build_file in sorted(root.glob(pattern)):
+                relative = build_file.relative_to(root)
+                content = build_file.read_bytes()
+                digest = hashlib.sha1(content).hexdigest()
+                entry = cache.get(relative.as_posix())
+                if entry is None or entry["sha1"] != digest:
+                    entry = {"sha1": digest, "deps": parse_build_file(content.decode("utf-8", "replace"))}
+                files[relative.as_posix()] = entry
+                dependencies[module_path(relative)] = entry["deps"]
+                build_files[module_path(relative)] = relative
+
+        if cache_path and files != cache:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps({"version": CACHE_VERSION, "files": files}, indent=1))
+        return cls(dependencies, build_files)
+
+    def dependent_extensions(self, modules) -> list[str]:
+        """Extensions to rebuild when `modules` change, walked like Gradle's printDependentExtensions.
+
+        :lib: dependents are followed transitively, but a :lib-multisrc: dependent
+        only adds its direct dependents (one hop), exactly as Extensions.kt does.
+        """
+        found = set()
+        visited = set()
+        stack = list(modules)
+        while stack:
+            module = stack.pop()
+            if module in visited:
+                continue
+            visited.add(module)
+            for dependent in self.dependents.get(module, ()):
+                if dependent.startswith(":src:"):
+                    found.add(dependent)
+                elif dependent.startswith(":lib-multisrc:"):
+                    found.update(self.dependents.get(dependent, ()))
+                elif dependent.startswith(":lib:"):
+                    stack.append(dependent)
+        return sorted(m for m in found if m.startswith(":src:"))
+
+def check(graph: ModuleGraph, modules: list[str]) -> int:
+    """Compare dependent extensions with Gradle's printDependentExtensions, one module at a time."""
+    if not modules:
+        modules = sorted(m for m in graph.dependencies if m.startswith((":lib:", ":lib-multisrc:")))
+    mismatches = 0
+    for module in modules:
+        result = subprocess.run(["./gradlew", "-q", f"{module}:printDependentExtensions"],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"{module}: gradle failed\n{result.stderr.strip()}")
+            return result.returncode
+        expected = {line for line in result.stdout.splitlines() if line.startswith(":src:")}
+        actual = set(graph.dependent_extensions([module]))
+        if expected == actual:
+            print(f"OK   {module} ({len(actual)} extensions)")
+            continue
+        mismatches += 1
+        print(f"DIFF {module}")
+        for extension in sorted(expected - actual):
+            print(f"  missing {extension}")
+        for extension in sorted(actual - expected):
+            print(f"  extra   {extension}")
+    print(f"\n{len(modules) - mismatches}/{len(modules)} modules match Gradle")
+    return 1 if mismatches else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Static module dependency graph")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help="parsed build file cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    dependents = sub.add_parser("dependents", help="print extensions depending on the given modules")
+    dependents.add_argument("modules", nargs="+")
+    verify = sub.add_parser("check", help="verify against ./gradlew :<module>:printDependentExtensions")
+    verify.add_argument("modules", nargs="*")
+    args = parser.parse_args()
+
+    graph = ModuleGraph.load(cache_file=args.cache)
+    if args.command == "check":
+        return check(graph, args.modules)
+    for extension in graph.dependent_extensions(args.modules):
+        print(extension)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,31 @@
 from pathlib import Path
 import shutil
 
+from apk_store import ApkStore
+
 REPO_APK_DIR = Path("repo/apk")
+ARTIFACTS_DIR = Path.home().joinpath("apk-artifacts")
 
-shutil.rmtree(REPO_APK_DIR, ignore_errors=True)
 REPO_APK_DIR.mkdir(parents=True, exist_ok=True)
+store = ApkStore()
 
-for apk in Path.home().joinpath("apk-artifacts").glob("**/*.apk"):
+names = set()
+stats = {"new": 0, "known": 0}
+for apk in ARTIFACTS_DIR.glob("**/*.apk"):
     apk_name = apk.name.replace("-release.apk", ".apk")
 
-    shutil.move(apk, REPO_APK_DIR.joinpath(apk_name))
+    _, new = store.add(apk, apk_name)
+    stats["new" if new else "known"] += 1
+    store.link(apk_name, REPO_APK_DIR.joinpath(apk_name))
+    names.add(apk_name)
+
+# repo/apk holds exactly this run's APKs, as before
+for entry in REPO_APK_DIR.iterdir():
+    if entry.name not in names:
+        if entry.is_dir():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
+
+store.save()
+print(f"{len(names)} APKs: {stats['new']} new blobs, {stats['known']} already in {store.root}")
@@ -0,0 +1,18 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scripts are run from the repo root, not installed; import them from their folder
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture(scope="session")
+def fixtures():
+    """benchmark.py's fake APK builders; loaded by path since data/ has a benchmark.py too."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("scripts_benchmark", SCRIPTS_DIR / "benchmark.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,49 @@
+import random
+import sys
+
+import pytest
+
+if sys.version_info < (3, 12):
+    # The scripts assert 3.12+ on import; report the skip instead of failing collection
+    pytest.skip("the scripts need Python 3.12+", allow_module_level=True)
+
+from apk_reader import ResourceTable, manifest_info, read_apk
+
+PACKAGE = "eu.kanade.tachiyomi.animeextension.en.example"
+
+
+@pytest.fixture
+def apk(tmp_path, fixtures):
+    def build(label_resource=False, nsfw=1):
+        path = tmp_path / "aniyomi-en.example-v14.3.apk"
+        fixtures.fake_apk(path, PACKAGE, 3, "14.3", "Example", nsfw, random.Random(0), label_resource)
+        return path
+    return build
+
+
+@pytest.mark.parametrize("label_resource", [False, True])
+def test_read_apk(apk, label_resource):
+    assert read_apk(apk(label_resource, nsfw=1)) == {
+        "package": PACKAGE,
+        "versionCode": 3,
+        "versionName": "14.3",
+        "label": "Example",
+        "icon": "res/mipmap-320dpi/ic_launcher.png",
+        "meta_data": {"tachiyomi.animeextension.class": ".Extension", "tachiyomi.animeextension.nsfw": 1},
+    }
+
+
+@pytest.mark.parametrize("requested, density", [
+    (120, 160), (160, 160), (213, 240), (320, 320), (400, 480), (640, 640), (800, 640),
+])
+def test_icon_density(apk, requested, density):
+    assert read_apk(apk(), requested)["icon"] == f"res/mipmap-{density}dpi/ic_launcher.png"
+
+
+def test_unresolved_references(fixtures):
+    manifest = fixtures.fake_manifest(PACKAGE, 3, "14.3", fixtures.LABEL_ID, 0)
+    info = manifest_info(manifest, None)
+    assert info["label"] is None and info["icon"] is None
+    table = ResourceTable(fixtures.fake_resources({160: "res/a.png"}))
+    assert manifest_info(manifest, table)["label"] is None
+    assert manifest_info(manifest, table)["icon"] == "res/a.png"
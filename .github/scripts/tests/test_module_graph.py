@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+if sys.version_info < (3, 12):
+    # The scripts assert 3.12+ on import; report the skip instead of failing collection
+    pytest.skip("the scripts need Python 3.12+", allow_module_level=True)
+
+from module_graph import ModuleGraph, parse_build_file
+
+GRAPH = ModuleGraph({
+    ":src:en:direct": [":lib:base"],
+    ":lib:middle": [":lib:base"],
+    ":src:en:chained": [":lib:middle"],
+    ":lib-multisrc:theme": [":lib:middle"],
+    ":src:en:themed": [":lib-multisrc:theme"],
+    ":lib-multisrc:subtheme": [":lib-multisrc:theme"],
+    ":src:en:subthemed": [":lib-multisrc:subtheme"],
+})
+
+
+def test_dependent_extensions_follow_gradle():
+    # :lib: chains are transitive, a multisrc theme only adds its direct dependents
+    assert GRAPH.dependent_extensions([":lib:base"]) == [":src:en:chained", ":src:en:direct", ":src:en:themed"]
+    assert GRAPH.dependent_extensions([":lib-multisrc:theme"]) == [":src:en:subthemed", ":src:en:themed"]
+    assert GRAPH.dependent_extensions([":lib:unused"]) == []
+
+
+def test_parse_build_file():
+    text = """
+    ext { themePkg = 'dooplay' }
+    dependencies {
+        implementation(project(":lib:playlist-utils"))
+        // implementation(project(":lib:commented"))
+        implementation(project(path = ":core"))
+        api(project(':lib:unpacker')) /* project(":lib:block") */
+        val url = "https://example.org//x"
+    }
+    """
+    assert parse_build_file(text) == [":lib-multisrc:dooplay", ":lib:playlist-utils", ":lib:unpacker"]
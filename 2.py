@@ -1,10 +1,280 @@
+import json
 import os
 from pathlib import Path
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+SNAPSHOT_VERSION = 1
+# Folder yang mtime-nya sedekat ini dengan waktu scan tidak dipercaya di run
+# berikutnya: perubahan di detik yang sama bisa tidak menggeser mtime
+RACY_NS = 2 * 10**9
+
+
+def scan_entries(path, ignore_dirs, include_hidden, with_stat=False):
+    """
+    Isi satu folder lewat os.scandir, sudah difilter dan diurutkan
+    (folder dulu, lalu file, alfabetis). Tipe entry diambil dari dirent,
+    jadi tidak ada stat tambahan per item kecuali with_stat=True
+    (size + mtime, untuk snapshot/export).
+
+    Returns:
+        List tuple (name, is_dir, is_symlink, size, mtime_ns)
+    """
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            # Skip jika di ignore_dirs
+            if name in ignore_dirs:
+                continue
+            # Skip hidden files jika tidak diinclude
+            if not include_hidden and name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            size = mtime_ns = None
+            if with_stat:
+                try:
+                    st = entry.stat()
+                    size = 0 if is_dir else st.st_size
+                    mtime_ns = st.st_mtime_ns
+                except OSError:
+                    pass
+            entries.append((not is_dir, name.lower(), name, is_dir, entry.is_symlink(), size, mtime_ns))
+    entries.sort()
+    return [entry[2:] for entry in entries]
+
+
+def _join(rel, name):
+    return f"{rel}/{name}" if rel else name
+
+
+class TreeWalker:
+    """
+    Walker satu pass: baris tree di-yield sambil jalan, jumlah file dan
+    folder dihitung di traversal yang sama.
+
+    Isi tiap folder yang dikunjungi dicatat di `self.snapshot` kalau
+    `record=True` (untuk snapshot baru / export / diff). Kalau `previous`
+    (isi snapshot run sebelumnya) diberikan, folder yang mtime-nya tidak
+    berubah dipakai apa adanya dari snapshot: tanpa scandir dan tanpa stat
+    per entry, cukup satu stat per folder. Konsekuensinya, file yang diedit
+    di tempat (mtime folder tidak bergeser) tetap tercatat dengan size/mtime
+    lama sampai folder-nya berubah.
+
+    Args:
+        ignore_dirs: Nama folder/file yang diabaikan
+        include_hidden: Include hidden files/folders
+        max_depth: Batas kedalaman (1 = isi root saja), None = tanpa batas
+        jobs: Jumlah thread; > 1 = tiap subfolder di root di-scan paralel
+        previous: Dict folder -> {mtime_ns, entries} dari snapshot lama yang
+            dipercaya (--trust-dir-mtime); None = scan penuh
+        record: Catat size/mtime dan isi folder ke self.snapshot
+    """
+
+    def __init__(self, ignore_dirs, include_hidden=False, max_depth=None, jobs=1,
+                 previous=None, record=False):
+        self.ignore_dirs = set(ignore_dirs)
+        self.include_hidden = include_hidden
+        self.max_depth = max_depth
+        self.jobs = jobs
+        self.previous = previous
+        self.record = record or previous is not None
+        self.snapshot = {}
+        self.started_ns = time.time_ns()
+        self.files = 0
+        self.dirs = 0
+        self.scanned = 0
+        self.reused = 0
+        self._lock = threading.Lock()
+
+    def walk(self, root):
+        """Yield baris tree (tanpa newline) untuk isi root."""
+        if self.jobs > 1:
+            yield from self._walk_parallel(root)
+        else:
+            counts = [0, 0]
+            yield from self._walk(root, "", "", 1, counts)
+            self._add(counts)
+
+    def _add(self, counts):
+        self.files += counts[0]
+        self.dirs += counts[1]
+
+    def _entries(self, current_path, rel):
+        if not self.record:
+            return scan_entries(current_path, self.ignore_dirs, self.include_hidden)
+
+        mtime_ns = os.stat(current_path).st_mtime_ns
+        cached = self.previous.get(rel) if self.previous else None
+        if cached is not None and cached["mtime_ns"] == mtime_ns:
+            # mtime folder hanya berubah kalau isinya ditambah/dihapus/rename;
+            # size/mtime file yang diedit di tempat tidak ikut diperbarui
+            entries = cached["entries"]
+            reused = True
+        else:
+            entries = scan_entries(current_path, self.ignore_dirs, self.include_hidden, with_stat=True)
+            reused = False
+        with self._lock:
+            if reused:
+                self.reused += 1
+            else:
+                self.scanned += 1
+        trusted = mtime_ns < self.started_ns - RACY_NS
+        self.snapshot[rel] = {"mtime_ns": mtime_ns if trusted else None, "entries": entries}
+        return entries
+
+    def _walk(self, current_path, rel, prefix, level, counts):
+        try:
+            entries = self._entries(current_path, rel)
+        except PermissionError:
+            yield f"{prefix}[Permission Denied]"
+            return
+
+        last = len(entries) - 1
+        for i, (name, is_dir, is_symlink, _, _) in enumerate(entries):
+            connector = "└── " if i == last else "├── "
+            if not is_dir:
+                counts[0] += 1
+                yield f"{prefix}{connector}{name}"
+                continue
+            counts[1] += 1
+            yield f"{prefix}{connector}{name}/"
+            # Symlink folder tidak diikuti (bisa loop)
+            if not is_symlink and (self.max_depth is None or level < self.max_depth):
+                next_prefix = prefix + ("    " if i == last else "│   ")
+                yield from self._walk(os.path.join(current_path, name), _join(rel, name),
+                                      next_prefix, level + 1, counts)
+
+    def _subtree(self, entry_path, rel, prefix):
+        counts = [0, 0]
+        lines = list(self._walk(entry_path, rel, prefix, 2, counts))
+        return lines, counts
+
+    def _walk_parallel(self, root):
+        try:
+            entries = self._entries(root, "")
+        except PermissionError:
+            yield "[Permission Denied]"
+            return
+
+        descend = self.max_depth is None or self.max_depth > 1
+        last = len(entries) - 1
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            # Submit semua subtree dulu, lalu tulis berurutan begitu masing-masing selesai
+            futures = {}
+            for i, (name, is_dir, is_symlink, _, _) in enumerate(entries):
+                if is_dir and not is_symlink and descend:
+                    prefix = "    " if i == last else "│   "
+                    futures[i] = pool.submit(self._subtree, os.path.join(root, name), name, prefix)
+
+            for i, (name, is_dir, is_symlink, _, _) in enumerate(entries):
+                connector = "└── " if i == last else "├── "
+                if not is_dir:
+                    self.files += 1
+                    yield f"{connector}{name}"
+                    continue
+                self.dirs += 1
+                yield f"{connector}{name}/"
+                if i in futures:
+                    lines, counts = futures[i].result()
+                    self._add(counts)
+                    yield from lines
+
+
+# ================== SNAPSHOT / EXPORT / DIFF ==================
+
+def snapshot_options(directory, ignore_dirs, include_hidden, max_depth=None):
+    # Kedalaman ikut opsi: snapshot terbatas tidak berisi folder di bawah batas
+    return {
+        "root": str(Path(directory).absolute()),
+        "ignore": sorted(ignore_dirs),
+        "hidden": include_hidden,
+        "depth": max_depth,
+    }
+
+
+def load_snapshot(snapshot_file, options):
+    """Isi folder dari snapshot lama; None kalau tidak ada / opsi scan beda."""
+    try:
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    if data.get("version") != SNAPSHOT_VERSION or data.get("options") != options:
+        print(f"⚠️  Snapshot {snapshot_file} dari opsi/folder lain, scan ulang penuh")
+        return None
+    return data["dirs"]
+
+
+def save_snapshot(snapshot_file, options, dirs):
+    data = {"version": SNAPSHOT_VERSION, "options": options, "dirs": dirs}
+    tmp_file = snapshot_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_file, snapshot_file)
+
+
+def iter_records(dirs, rel=""):
+    """Entry snapshot urut seperti tree: dict path, type, size, mtime_ns."""
+    for name, is_dir, is_symlink, size, mtime_ns in dirs.get(rel, {}).get("entries", ()):
+        path = _join(rel, name)
+        yield {
+            "path": path,
+            "type": "symlink" if is_symlink else "dir" if is_dir else "file",
+            "size": size,
+            "mtime_ns": mtime_ns,
+        }
+        if is_dir and not is_symlink:
+            yield from iter_records(dirs, path)
+
+
+def export_records(dirs, export_file, root):
+    """Tulis entry ke .json (satu object) atau .ndjson/.jsonl (satu entry per baris)."""
+    count = 0
+    with open(export_file, 'w', encoding='utf-8') as f:
+        if export_file.endswith(('.ndjson', '.jsonl')):
+            for record in iter_records(dirs):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        else:
+            records = list(iter_records(dirs))
+            count = len(records)
+            json.dump({"root": root, "entries": records}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    return count
+
+
+def diff_snapshots(old_dirs, new_dirs):
+    """List (tanda, path, detail): + baru, - hilang, ~ file berubah size/mtime."""
+    old = {r["path"]: r for r in iter_records(old_dirs)}
+    new = {r["path"]: r for r in iter_records(new_dirs)}
+    changes = []
+    for path, record in new.items():
+        before = old.get(path)
+        if before is None:
+            changes.append(("+", path, record["type"]))
+        elif before["type"] != record["type"]:
+            changes.append(("~", path, f"{before['type']} -> {record['type']}"))
+        elif record["type"] == "file" and (before["size"], before["mtime_ns"]) != (record["size"], record["mtime_ns"]):
+            changes.append(("~", path, f"{before['size']} -> {record['size']} bytes"))
+    for path, record in old.items():
+        if path not in new:
+            changes.append(("-", path, record["type"]))
+    changes.sort(key=lambda change: change[1])
+    return changes
+
+
 def generate_tree_structure(directory, output_file="tree_structure.txt", 
-                           ignore_dirs=None, include_hidden=False):
+                           ignore_dirs=None, include_hidden=False,
+                           max_depth=None, jobs=1,
+                           snapshot_file=None, export_file=None, show_diff=False,
+                           trust_dir_mtime=False):
     """
     Generate folder/file structure dan langsung simpan ke .txt file
     
@@ -13,6 +283,13 @@ def generate_tree_structure(directory, output_file="tree_structure.txt",
         output_file: Nama file output (default: tree_structure.txt)
         ignore_dirs: Direktori yang diabaikan
         include_hidden: Include hidden files/folders (dimulai dengan .)
+        max_depth: Batas kedalaman folder (None = tanpa batas)
+        jobs: Jumlah thread untuk scan subfolder paralel (1 = berurutan)
+        snapshot_file: Snapshot JSON (ditulis tiap run; dibaca untuk diff / trust_dir_mtime)
+        export_file: Export entry ke .json / .ndjson
+        show_diff: Cetak perubahan dibanding snapshot sebelumnya
+        trust_dir_mtime: Pakai ulang isi folder yang mtime-nya tidak berubah
+            dari snapshot (lebih cepat, tapi file yang diedit di tempat tidak terlihat)
     
     Returns:
         Path ke file output
@@ -26,6 +303,11 @@ def generate_tree_structure(directory, output_file="tree_structure.txt",
     
     path = Path(directory)
     output_path = Path(output_file)
+    options = snapshot_options(directory, ignore_dirs, include_hidden, max_depth)
+    previous = load_snapshot(snapshot_file, options) if snapshot_file and (show_diff or trust_dir_mtime) else None
+    walker = TreeWalker(ignore_dirs, include_hidden, max_depth, jobs,
+                        previous=previous if trust_dir_mtime else None,
+                        record=bool(snapshot_file or export_file))
     
     # Header informasi
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -35,82 +317,46 @@ def generate_tree_structure(directory, output_file="tree_structure.txt",
         f.write(f"Struktur Folder/File\n")
         f.write(f"Dicetak pada: {timestamp}\n")
         f.write(f"Direktori: {path.absolute()}\n")
+        if max_depth is not None:
+            f.write(f"Kedalaman maksimal: {max_depth}\n")
         f.write("=" * 60 + "\n\n")
         
-        def write_tree(current_path, prefix="", level=0):
-            """Helper function untuk write tree secara rekursif"""
-            try:
-                items = list(current_path.iterdir())
-            except PermissionError:
-                f.write(f"{prefix}[Permission Denied]\n")
-                return
-            
-            # Filter items
-            filtered_items = []
-            for item in items:
-                # Skip jika di ignore_dirs
-                if item.name in ignore_dirs:
-                    continue
-                # Skip hidden files jika tidak diinclude
-                if not include_hidden and item.name.startswith('.'):
-                    continue
-                filtered_items.append(item)
-            
-            # Sort: folders first, then files, alphabetically
-            filtered_items.sort(key=lambda x: (not x.is_dir(), x.name.lower()))
-            
-            for i, item in enumerate(filtered_items):
-                is_last = i == len(filtered_items) - 1
-                
-                if is_last:
-                    connector = "└── "
-                    next_prefix = prefix + "    "
-                else:
-                    connector = "├── "
-                    next_prefix = prefix + "│   "
-                
-                # Tulis item
-                item_display = item.name
-                if item.is_dir():
-                    item_display += "/"
-                
-                f.write(f"{prefix}{connector}{item_display}\n")
-                
-                # Jika folder, rekursif
-                if item.is_dir():
-                    write_tree(item, next_prefix, level + 1)
-        
-        # Mulai dari root
-        write_tree(path)
+        # Baris ditulis langsung selama traversal
+        for line in walker.walk(path):
+            f.write(line + "\n")
         
         # Footer
         f.write("\n" + "=" * 60 + "\n")
-        f.write(f"Total file yang di-scan: {count_files(path, ignore_dirs, include_hidden)}\n")
+        f.write(f"Total file yang di-scan: {walker.files}\n")
+        f.write(f"Total folder: {walker.dirs}\n")
         f.write(f"File output: {output_path.absolute()}\n")
     
     print(f"✅ Struktur berhasil di-generate ke: {output_path.absolute()}")
     print(f"   Gunakan perintah: cat {output_file} atau type {output_file}")
-    
-    return output_path
 
-def count_files(directory, ignore_dirs, include_hidden):
-    """Hitung total file (non-direktori) dalam struktur"""
-    count = 0
-    path = Path(directory)
-    
-    for item in path.rglob("*"):
-        # Skip jika di ignore_dirs
-        if any(ignore in str(item) for ignore in ignore_dirs):
-            continue
-        
-        # Skip hidden jika tidak diinclude
-        if not include_hidden and item.name.startswith('.'):
-            continue
-        
-        if item.is_file():
-            count += 1
+    if snapshot_file:
+        # Semua folder dari snapshot dan tidak ada yang hilang: file lama sudah sama persis
+        unchanged = (trust_dir_mtime and previous is not None and walker.scanned == 0
+                     and walker.snapshot.keys() == previous.keys())
+        if not unchanged:
+            save_snapshot(snapshot_file, options, walker.snapshot)
+        print(f"✅ Snapshot: {snapshot_file} ({walker.scanned} folder di-scan, "
+              f"{walker.reused} dari snapshot)")
+
+    if export_file:
+        count = export_records(walker.snapshot, export_file, options["root"])
+        print(f"✅ Export {count} entry ke: {export_file}")
+
+    if show_diff:
+        if previous is None:
+            print("ℹ️  Belum ada snapshot sebelumnya, tidak ada diff")
+        else:
+            changes = diff_snapshots(previous, walker.snapshot)
+            print(f"\nPerubahan sejak snapshot sebelumnya: {len(changes)}")
+            for sign, change_path, detail in changes:
+                print(f"  {sign} {change_path}  ({detail})")
     
-    return count
+    return output_path
 
 def print_sample_output():
     """Cetak contoh output ke terminal untuk preview"""
@@ -161,6 +407,9 @@ Contoh penggunaan:
   python bikinkan.py --output struktur  # Custom nama file
   python bikinkan.py --hidden           # Include hidden files
   python bikinkan.py --depth 3          # Batasi kedalaman
+  python bikinkan.py --snapshot .tree.json --diff   # Simpan snapshot + tampilkan perubahan
+  python bikinkan.py --snapshot .tree.json --trust-dir-mtime   # Scan ulang cepat (lihat --help)
+  python bikinkan.py --export tree.ndjson           # Export entry (path, type, size, mtime)
         """
     )
     
@@ -175,8 +424,28 @@ Contoh penggunaan:
                        help='List folder/file yang diabaikan')
     parser.add_argument('--preview', '-p', action='store_true',
                        help='Preview di terminal sebelum generate')
+    parser.add_argument('--depth', '-d', type=int,
+                       help='Batas kedalaman folder (default: tanpa batas)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Jumlah thread untuk scan subfolder paralel (default: 1)')
+    parser.add_argument('--snapshot', '-s', metavar='FILE',
+                       help='Simpan isi folder (size/mtime) ke snapshot JSON, untuk --diff berikutnya')
+    parser.add_argument('--trust-dir-mtime', action='store_true',
+                       help='Folder yang mtime-nya sama dengan di --snapshot tidak di-scan/stat ulang. '
+                            'Lebih cepat, tapi file yang diedit di tempat (tanpa tambah/hapus/rename '
+                            'di folder-nya) tetap tercatat dengan size/mtime lama')
+    parser.add_argument('--diff', action='store_true',
+                       help='Tampilkan file/folder yang ditambah, dihapus, atau berubah (butuh --snapshot)')
+    parser.add_argument('--export', '-e', metavar='FILE',
+                       help='Export entry ke FILE .json atau .ndjson')
     
     args = parser.parse_args()
+    if args.depth is not None and args.depth < 1:
+        parser.error('--depth minimal 1')
+    if args.diff and not args.snapshot:
+        parser.error('--diff butuh --snapshot')
+    if args.trust_dir_mtime and not args.snapshot:
+        parser.error('--trust-dir-mtime butuh --snapshot')
     
     # Tampilkan preview jika diminta
     if args.preview:
@@ -187,7 +456,13 @@ Contoh penggunaan:
         directory=args.directory,
         output_file=args.output,
         ignore_dirs=args.ignore,
-        include_hidden=args.hidden
+        include_hidden=args.hidden,
+        max_depth=args.depth,
+        jobs=args.jobs,
+        snapshot_file=args.snapshot,
+        export_file=args.export,
+        show_diff=args.diff,
+        trust_dir_mtime=args.trust_dir_mtime
     )
     
     # Tampilkan isi file jika kecil
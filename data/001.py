@@ -2,6 +2,16 @@ import os
 import json
 import random
 import re
+import argparse
+import glob
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from catalog import LINES, Episode, Title, load_catalog as read_catalog, write_catalog
+from catalog_pages import DEFAULT_PAGE_SIZE, PagedCatalogWriter, tee_pages, write_pages
+from link_store import LinkStore
+from rewrite import RuleSet
+from search_index import SearchIndexBuilder, build_index, index_path_for
 
 # ================== PENGATURAN ==================
 LINKS_PER_TITLE = 15  # Jumlah link per title (default 10)
@@ -11,8 +21,15 @@ POSTERS = [
 ]
 OLD_DOMAIN = "https://vidxlr.de"
 NEW_DOMAIN = "https://vidvf.com"
+# Migrasi host lain: --rules rules.json (format lihat rewrite.py)
+REWRITE_RULES = RuleSet.from_pairs([(OLD_DOMAIN, NEW_DOMAIN)])
 # =================================================
 
+def load_rules(rules_file):
+    global REWRITE_RULES
+    if rules_file:
+        REWRITE_RULES = RuleSet.from_file(rules_file)
+
 def list_txt_files():
     txt_files = [f for f in os.listdir() if f.endswith(".txt")]
     if not txt_files:
@@ -30,21 +47,21 @@ def select_file(txt_files):
         exit()
     return txt_files[int(choice)-1]
 
-def extract_links(file_path):
-    links = []
-    link_pattern = re.compile(r"https?://\S+")
+LINK_PATTERN = re.compile(r"https?://\S+")
+
+def iter_links(file_path):
     with open(file_path, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
-            match = link_pattern.search(line)
+            match = LINK_PATTERN.search(line)
             if match:
-                links.append(match.group())
-    return links
+                yield match.group()
+
+def extract_links(file_path):
+    return list(iter_links(file_path))
 
-def replace_domain(link, old_domain=OLD_DOMAIN, new_domain=NEW_DOMAIN):
-    if link.startswith(old_domain):
-        return link.replace(old_domain, new_domain, 1)
-    return link
+def replace_domain(link, rules=None):
+    return (rules or REWRITE_RULES).rewrite(link)
 
 def generate_titles(base_name, total_links, links_per_title):
     total_titles = (total_links + links_per_title - 1) // links_per_title
@@ -61,40 +78,221 @@ def generate_json(links, titles, posters, links_per_title):
         episodes = []
         for ep_idx, link in enumerate(episode_links, 1):
             link = replace_domain(link)
-            episodes.append({
-                "episode": f"{ep_idx:02}",
-                "name": f"Episode {ep_idx}",
-                "url": link
-            })
-        data.append({
-            "title": title,
-            "poster": poster,
-            "episodes": episodes
-        })
+            episodes.append(Episode(f"{ep_idx:02}", f"Episode {ep_idx}", link))
+        data.append(Title(title, poster, episodes))
     return data
 
+def iter_title_blocks(links, base_name, posters, links_per_title):
+    """Sama seperti generate_json, tapi per title block (links boleh iterator)."""
+    links = iter(links)
+    for idx in itertools.count():
+        episode_links = list(itertools.islice(links, links_per_title))
+        if not episode_links:
+            return
+        poster = random.choice(posters)
+        episodes = []
+        for ep_idx, link in enumerate(episode_links, 1):
+            episodes.append(Episode(f"{ep_idx:02}", f"Episode {ep_idx}", replace_domain(link)))
+        yield Title(f"{base_name}_{idx+1}", poster, episodes)
+
 def save_json(json_data, output_file):
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write("[\n")
-        for t_idx, title_block in enumerate(json_data):
-            f.write("  {\n")
-            f.write(f"    \"title\": \"{title_block['title']}\",\n")
-            f.write(f"    \"poster\": \"{title_block['poster']}\",\n")
-            f.write(f"    \"episodes\": [\n")
-            for e_idx, ep in enumerate(title_block["episodes"]):
-                line = f'      {{ "episode": "{ep["episode"]}", "name": "{ep["name"]}", "url": "{ep["url"]}" }}'
-                if e_idx != len(title_block["episodes"]) - 1:
-                    line += ","
-                line += "\n"
-                f.write(line)
-            f.write("    ]\n")
-            if t_idx != len(json_data) - 1:
-                f.write("  },\n")
+    """Tulis per title block; json_data boleh generator, jadi tidak perlu ditampung di memori."""
+    return write_catalog(json_data, output_file, LINES)
+
+# ================== INCREMENTAL ==================
+
+def read_new_links(file_path, offset):
+    """Link dari baris lengkap setelah offset; return (links, offset baru).
+
+    Baris terakhir tanpa newline belum dihitung (mungkin export masih ditulis).
+    """
+    links = []
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            match = LINK_PATTERN.search(raw.decode("utf-8", "replace").strip())
+            if match:
+                links.append(match.group())
+    return links, offset
+
+def load_catalog(output_file):
+    if not os.path.exists(output_file):
+        return []
+    return read_catalog(output_file)
+
+def append_episodes(blocks, urls, base_name, posters, links_per_title):
+    """Isi dulu title terakhir yang belum penuh, sisanya jadi title baru."""
+    added = []
+    urls = iter(urls)
+    while True:
+        if not blocks or len(blocks[-1].episodes) >= links_per_title:
+            blocks.append(Title(f"{base_name}_{len(blocks)+1}", random.choice(posters)))
+        block = blocks[-1]
+        for url in itertools.islice(urls, links_per_title - len(block.episodes)):
+            ep_idx = len(block.episodes) + 1
+            episode = Episode(f"{ep_idx:02}", f"Episode {ep_idx}", url)
+            block.episodes.append(episode)
+            added.append((block.title, episode))
+        if not block.episodes:
+            blocks.pop()
+        if len(block.episodes) < links_per_title:
+            return added
+
+def ingest_file(file_path, base_name, output_file, store, links_per_title=LINKS_PER_TITLE,
+                pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=False):
+    """Proses hanya baris baru sejak checkpoint, skip link yang sudah ada, tambahkan ke katalog."""
+    links, offset = read_new_links(file_path, store.start_offset(file_path))
+    blocks = load_catalog(output_file)
+    # Link di katalog juga dihitung known, jadi aman kalau run sebelumnya gagal sebelum commit
+    known = {ep.url for block in blocks for ep in block.episodes}
+    new_urls = []
+    for link in links:
+        url = replace_domain(link)
+        if url in known or store.is_known(url):
+            continue
+        known.add(url)
+        new_urls.append(url)
+
+    added = append_episodes(blocks, new_urls, base_name, POSTERS, links_per_title)
+    if added:
+        tmp_file = output_file + ".tmp"
+        save_json(blocks, tmp_file)
+        os.replace(tmp_file, output_file)
+        if pages_dir:
+            write_pages(blocks, pages_dir, page_size)
+        if search_index:
+            build_index(blocks, index_path_for(output_file))
+    catalog = os.path.basename(output_file)
+    store.commit(file_path, offset, [(catalog, title, ep.episode, ep.url) for title, ep in added])
+    return len(links), len(added)
+
+def run_incremental(patterns, out_dir, state_file, map_file=None, links_per_title=LINKS_PER_TITLE,
+                    pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=False):
+    files = collect_inputs(patterns)
+    if not files:
+        print("Tidak ada file .txt yang cocok.")
+        return 1
+    title_map = load_title_map(map_file)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Berurutan (bukan pool): dedup lintas file butuh urutan yang pasti
+    with LinkStore(state_file) as store:
+        for file_path in files:
+            base_name = base_title_for(file_path, title_map)
+            output_file = os.path.join(out_dir, f"{base_name}.json")
+            title_pages = os.path.join(pages_dir, base_name) if pages_dir else None
+            scanned, added = ingest_file(file_path, base_name, output_file, store,
+                                         links_per_title, title_pages, page_size, search_index)
+            print(f"✅ {file_path}: {scanned} link baru dibaca, {added} episode ditambahkan -> {output_file}")
+        print(f"Selesai: {store.count()} link tercatat di {state_file}.")
+    return 0
+
+# ================== BATCH MODE ==================
+
+def load_title_map(map_file):
+    """Mapping nama file -> base title, dari JSON object atau baris `file<TAB/koma>title`."""
+    if not map_file:
+        return {}
+    with open(map_file, "r", encoding="utf-8") as f:
+        if map_file.endswith(".json"):
+            return json.load(f)
+        mapping = {}
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            parts = re.split(r"(\t|,)", line, maxsplit=1)
+            if len(parts) != 3:
+                print(f"⚠️  {map_file}:{line_no}: bukan 'file<TAB/koma>title', dilewati")
+                continue
+            name, _, title = parts
+            mapping[name.strip()] = title.strip()
+        return mapping
+
+def collect_inputs(patterns):
+    """Folder -> semua .txt di dalamnya, selain itu diperlakukan sebagai glob."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.extend(sorted(glob.glob(os.path.join(pattern, "*.txt"))))
+        else:
+            files.extend(sorted(glob.glob(pattern)))
+    return list(dict.fromkeys(files))
+
+def base_title_for(file_path, title_map):
+    name = os.path.basename(file_path)
+    stem = os.path.splitext(name)[0]
+    # Path lengkap dulu, supaya nama file yang sama di folder berbeda bisa dibedakan
+    return title_map.get(file_path) or title_map.get(name) or title_map.get(stem) or stem
+
+def process_file(file_path, base_name, output_file, links_per_title=LINKS_PER_TITLE,
+                 pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=False):
+    """Satu dump -> satu katalog; ditulis streaming per title block."""
+    blocks = iter_title_blocks(iter_links(file_path), base_name, POSTERS, links_per_title)
+    pager = None
+    if pages_dir:
+        pager = PagedCatalogWriter(pages_dir, page_size)
+        blocks = tee_pages(blocks, pager)
+    indexer = None
+    if search_index:
+        indexer = SearchIndexBuilder()
+        blocks = tee_pages(blocks, indexer)
+    titles = save_json(blocks, output_file)
+    if pager:
+        pager.close()
+    if indexer:
+        indexer.save(index_path_for(output_file))
+    return file_path, output_file, titles
+
+def run_batch(patterns, out_dir, map_file=None, jobs=None, links_per_title=LINKS_PER_TITLE,
+              pages_dir=None, page_size=DEFAULT_PAGE_SIZE, rules_file=None, search_index=False):
+    files = collect_inputs(patterns)
+    if not files:
+        print("Tidak ada file .txt yang cocok.")
+        return 1
+    title_map = load_title_map(map_file)
+
+    # Dua input dengan base title sama (nama file sama di folder lain, atau --map)
+    # akan menulis katalog yang sama secara paralel: tolak sebelum mulai
+    by_base = {}
+    for file_path in files:
+        by_base.setdefault(base_title_for(file_path, title_map), []).append(file_path)
+    conflicts = {base: paths for base, paths in by_base.items() if len(paths) > 1}
+    if conflicts:
+        for base_name, paths in conflicts.items():
+            print(f"❌ {', '.join(paths)} -> {base_name}.json yang sama")
+        print("Beri base title berbeda lewat --map (key: path file), atau proses terpisah dengan --out-dir lain.")
+        return 1
+    os.makedirs(out_dir, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=load_rules, initargs=(rules_file,)) as pool:
+        futures = []
+        for base_name, (file_path,) in by_base.items():
+            output_file = os.path.join(out_dir, f"{base_name}.json")
+            # Versi paginated tiap katalog: <pages_dir>/<base title>/
+            title_pages = os.path.join(pages_dir, base_name) if pages_dir else None
+            futures.append(pool.submit(process_file, file_path, base_name, output_file,
+                                       links_per_title, title_pages, page_size, search_index))
+        for future in as_completed(futures):
+            try:
+                file_path, output_file, titles = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ Gagal: {e}")
+                continue
+            if titles:
+                print(f"✅ {file_path} -> {output_file} ({titles} title)")
             else:
-                f.write("  }\n")
-        f.write("]\n")
+                print(f"⚠️  {file_path}: tidak ada link, {output_file} kosong")
 
-def main():
+    print(f"Selesai: {len(files) - failed}/{len(files)} file diproses.")
+    return 1 if failed else 0
+
+def main(links_per_title=LINKS_PER_TITLE, pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=False):
     txt_files = list_txt_files()
     file_path = select_file(txt_files)
     links = extract_links(file_path)
@@ -109,13 +307,63 @@ def main():
         print("Base title tidak boleh kosong.")
         return
     
-    titles = generate_titles(base_name, len(links), LINKS_PER_TITLE)
-    json_data = generate_json(links, titles, POSTERS, LINKS_PER_TITLE)
+    titles = generate_titles(base_name, len(links), links_per_title)
+    json_data = generate_json(links, titles, POSTERS, links_per_title)
     
     output_file = f"{base_name}.json"
     save_json(json_data, output_file)
     
     print(f"File JSON berhasil dibuat: {output_file}")
+    if pages_dir:
+        manifest = write_pages(json_data, pages_dir, page_size)
+        print(f"Versi paginated: {manifest['page_count']} page di {pages_dir}")
+    if search_index:
+        build_index(json_data, index_path_for(output_file))
+        print(f"Index pencarian: {index_path_for(output_file)}")
+
+def cli():
+    parser = argparse.ArgumentParser(
+        description="Generate katalog JSON dari dump link .txt (tanpa argumen: mode interaktif)")
+    parser.add_argument("--batch", nargs="+", metavar="DIR_OR_GLOB",
+                        help="folder atau glob dump .txt, mis. 'dumps/*.txt'")
+    parser.add_argument("--map", dest="map_file",
+                        help="mapping file -> base title (.json atau baris 'file,title')")
+    parser.add_argument("--out-dir", default=".", help="folder output JSON (default: .)")
+    parser.add_argument("--jobs", "-j", type=int, help="jumlah worker (default: jumlah CPU)")
+    parser.add_argument("--links-per-title", type=int, default=LINKS_PER_TITLE,
+                        help=f"jumlah link per title (default: {LINKS_PER_TITLE})")
+    parser.add_argument("--pages", metavar="DIR",
+                        help="tulis juga versi paginated (manifest + page + file per title) ke DIR")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"jumlah title per page (default: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument("--search-index", action="store_true",
+                        help="tulis juga index pencarian title <base title>.search.json di samping katalog")
+    parser.add_argument("--rules", metavar="FILE",
+                        help=f"tabel rule rewrite URL (default: {OLD_DOMAIN} -> {NEW_DOMAIN})")
+    parser.add_argument("--state", metavar="DB",
+                        help="mode incremental (butuh --batch): checkpoint + dedup link di sqlite DB, "
+                             "katalog yang sudah ada ditambah, bukan dibuat ulang")
+    args = parser.parse_args()
+    if args.page_size <= 0:
+        parser.error("--page-size harus > 0")
+    if args.links_per_title < 1:
+        parser.error("--links-per-title harus >= 1")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs harus >= 1")
+    load_rules(args.rules)
+
+    if not args.batch:
+        if args.state:
+            parser.error("--state butuh --batch")
+        main(args.links_per_title, args.pages, args.page_size, args.search_index)
+        return
+    if args.state:
+        raise SystemExit(run_incremental(args.batch, args.out_dir, args.state, args.map_file,
+                                         args.links_per_title, args.pages, args.page_size,
+                                         args.search_index))
+    raise SystemExit(run_batch(args.batch, args.out_dir, args.map_file, args.jobs,
+                               args.links_per_title, args.pages, args.page_size, args.rules,
+                               args.search_index))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli()
@@ -0,0 +1,48 @@
+"""
+bench_run.py
+Jalankan satu proses dan ukur wall time + peak RSS-nya (os.wait4), tanpa
+proses pengukur di tengah. Dipakai data/benchmark.py.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+LOG_TAIL = 4000             # byte terakhir log yang ditampilkan kalau proses gagal
+
+
+def run(command, cwd, stdin_path=None, env=None, log=None):
+    """Jalankan command; return (wall detik, peak RSS KB, exit code).
+
+    Dengan `log`, stdout + stderr ditulis ke file itu; tanpa `log`, stdout
+    dibuang dan stderr hanya ditampilkan kalau exit code bukan 0.
+    """
+    stdin = open(stdin_path, "rb") if stdin_path else subprocess.DEVNULL
+    output = open(log, "wb") if log else subprocess.DEVNULL
+    try:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdin=stdin, stdout=output,
+                                   stderr=subprocess.STDOUT if log else subprocess.PIPE)
+        stderr = b""
+        if process.stderr:
+            stderr = process.stderr.read()
+            process.stderr.close()
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - start
+    finally:
+        if stdin_path:
+            stdin.close()
+        if log:
+            output.close()
+    # Sudah di-reap lewat wait4; Popen tidak perlu wait lagi
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        if log:
+            with open(log, "rb") as f:
+                f.seek(max(0, os.path.getsize(log) - LOG_TAIL))
+                stderr = f.read()
+        sys.stderr.write(stderr.decode("utf-8", "replace"))
+    # ru_maxrss: KB di Linux, byte di macOS
+    peak_kb = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return wall, peak_kb, process.returncode
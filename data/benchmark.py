@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+benchmark.py
+Benchmark end-to-end tool di data/ (lk21_minify.py, 001.py, generate.py)
+dengan dataset sintetis.
+
+Dataset dibuat sekali per ukuran: dump LK21 (ada slug duplikat akibat
+resume + title unicode) dan dump link ala link.txt. Tiap tool dijalankan
+sebagai proses terpisah; yang dicatat wall time, peak RSS proses tool,
+dan ukuran output. Hasil ditulis sebagai JSON supaya bisa dibandingkan
+antar commit.
+
+Usage:
+    python benchmark.py                                  # 10k & 100k
+    python benchmark.py --sizes 10000,100000,1000000 --out results.json
+    python benchmark.py --cases lk21,lk21-stream --sizes 1000000
+    python benchmark.py --serialize --sizes 100000 --cases none
+
+--serialize menambah benchmark in-process throughput serializer katalog:
+encoder lama per-script (f-string 001.py, json.dump generate.py, json.dumps
+lk21_minify.py) dibanding catalog.write_catalog, dengan dan tanpa orjson.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import catalog
+from bench_run import run
+from catalog import COMPACT, LINES, PRETTY, Episode, Title, write_catalog
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = "10000,100000"
+DUPE_RATIO = 0.15           # porsi record duplikat (resume dari page lama)
+EPISODES_PER_ANIME = 12     # untuk input generate.py
+
+WORDS = [
+    "Avatar", "avengers", "Love", "cinta", "Rahasia", "malam", "Jakarta", "Pengabdi",
+    "Setan", "The", "of", "dan", "Ölü", "Amélie", "Señorita", "東京", "사랑", "Москва",
+    "O'Brien", 'Quote"Man', "Back\\slash", "2049", "II", "Part", "Returns",
+]
+TYPES = ["movie", "series", "movie", "movie", "tv"]
+CAPTIONS = ["▶️ Video baru", "Harui Chindo", "▶️ VC'S Sama 2 Cewe", "Part lanjutan", "🔥 Full"]
+
+
+# ================== DATASET ==================
+
+def _title(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def make_lk21_dump(path, records, seed=0):
+    """Dump `{"data": [...]}` seperti hasil scraper, dengan slug duplikat."""
+    rng = random.Random(seed)
+    unique = max(1, int(records * (1 - DUPE_RATIO)))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"source":"benchmark","data":[')
+        for i in range(records):
+            n = i if i < unique else rng.randrange(unique)
+            rng_item = random.Random(n * 7919 + seed)
+            item = {
+                "title": f"{_title(rng_item)} ({1990 + n % 35})",
+                "slug": f"film-{n}",
+                "poster": f"https://poster.lk21.example/wp-content/uploads/{n % 12}/{n}.jpg",
+                "type": rng_item.choice(TYPES),
+                "url": f"https://lk21.example/film-{n}",
+                "quality": rng.choice(["HD", "CAM", "WEBDL"]),
+                "rating": round(rng.uniform(1, 10), 1),
+                "genres": rng.sample(["Action", "Drama", "Horror", "Comedy"], 2),
+            }
+            if i:
+                f.write(",")
+            f.write(json.dumps(item, ensure_ascii=False))
+        f.write("]}")
+
+
+def make_link_dump(path, records, seed=0):
+    """Dump chat export ala link.txt: caption, link vidxlr.de, baris kosong."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("akulupabelum ❦:\n")
+        for i in range(records):
+            n = i if rng.random() > 0.02 else rng.randrange(i + 1)
+            if rng.random() < 0.8:
+                f.write(f"{rng.choice(CAPTIONS)} {n}\n")
+            f.write(f"https://vidxlr.de/d/{n:012x}\n\n")
+
+
+def make_generate_input(path, records, seed=0):
+    """Jawaban stdin untuk generate.py (jumlah anime, title, poster, episode...)."""
+    rng = random.Random(seed)
+    animes = max(1, records // EPISODES_PER_ANIME)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{animes}\n")
+        for a in range(animes):
+            f.write(f"{_title(rng)} {a}\nhttps://poster.example/{a}.png\n{EPISODES_PER_ANIME}\n")
+            for e in range(EPISODES_PER_ANIME):
+                f.write(f"https://vidvf.com/d/{a:08x}{e:04x}\n")
+
+
+# ================== RUNNER ==================
+
+def _size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(path) for name in names)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _script(name):
+    return [sys.executable, os.path.join(DATA_DIR, name)]
+
+
+# Tiap case: (dataset, fungsi(workdir, input) -> (command, stdin, output path))
+CASES = {
+    "lk21": ("lk21", lambda w, i: (
+        _script("lk21_minify.py") + [i, "out.json"], None, "out.json")),
+    "lk21-stream": ("lk21", lambda w, i: (
+        _script("lk21_minify.py") + ["--stream", i, "out.json"], None, "out.json")),
+    "lk21-stream-lowmem": ("lk21", lambda w, i: (
+        _script("lk21_minify.py") + ["--stream", "--memory-mb", "8", i, "out.json"], None, "out.json")),
+    "lk21-shards": ("lk21", lambda w, i: (
+        _script("lk21_minify.py") + ["--stream", i, "out.json", "--index", "index.json",
+                                     "--shards", "shards"], None, "shards")),
+    "lk21-columnar": ("lk21", lambda w, i: (
+        _script("lk21_minify.py") + [i, "out.json", "--columnar", "out.lk21c"], None, "out.lk21c")),
+    "001": ("links", lambda w, i: (
+        _script("001.py"), _answers(w, "1\nbench\n"), "bench.json")),
+    "001-batch": ("links", lambda w, i: (
+        _script("001.py") + ["--batch", i, "--out-dir", "out"], None, "out")),
+    "generate": ("generate", lambda w, i: (
+        _script("generate.py"), i, "list.json")),
+}
+
+DATASETS = {
+    "lk21": ("lk21_data.json", make_lk21_dump),
+    "links": ("links.txt", make_link_dump),
+    "generate": ("generate_input.txt", make_generate_input),
+}
+
+
+def _answers(workdir, text):
+    path = os.path.join(workdir, "answers.stdin")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def benchmark(sizes, cases, seed=0, keep=False):
+    results = []
+    root = tempfile.mkdtemp(prefix="data-bench-")
+    try:
+        for records in sizes:
+            datasets = {}
+            for name in {CASES[case][0] for case in cases}:
+                filename, make = DATASETS[name]
+                dataset_dir = os.path.join(root, f"{name}-{records}")
+                os.makedirs(dataset_dir)
+                path = os.path.join(dataset_dir, filename)
+                start = time.perf_counter()
+                make(path, records, seed)
+                datasets[name] = path
+                print(f"[dataset] {name:<9} {records:>8} record  "
+                      f"{_size(path) / 1024 / 1024:8.2f} MB  ({time.perf_counter() - start:.1f}s)")
+
+            for case in cases:
+                dataset, build = CASES[case]
+                workdir = tempfile.mkdtemp(prefix=f"{case}-", dir=root)
+                source = datasets[dataset]
+                if dataset == "links":
+                    # 001.py memproses .txt di folder kerja lewat prompt
+                    shutil.copy(source, workdir)
+                command, stdin_path, output = build(workdir, source)
+                wall, peak_kb, code = run(command, workdir, stdin_path)
+                result = {
+                    "case": case,
+                    "records": records,
+                    "wall_s": round(wall, 4),
+                    "peak_rss_kb": peak_kb,
+                    "input_bytes": _size(source),
+                    "output_bytes": _size(os.path.join(workdir, output)),
+                    "exit_code": code,
+                }
+                results.append(result)
+                print(f"[{case:<18}] {records:>8}  {wall:8.2f}s  {peak_kb / 1024:8.1f} MB RSS  "
+                      f"{result['output_bytes'] / 1024 / 1024:8.2f} MB out"
+                      + ("" if code == 0 else f"  EXIT {code}"))
+                if not keep:
+                    shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        if keep:
+            print(f"Workdir disimpan di {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+# ================== SERIALIZER ==================
+
+def legacy_save_json(json_data, output_file):
+    """save_json 001.py sebelum catalog.py, apa adanya (f-string tanpa escape)."""
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for t_idx, title_block in enumerate(json_data):
+            f.write("  {\n")
+            f.write(f"    \"title\": \"{title_block['title']}\",\n")
+            f.write(f"    \"poster\": \"{title_block['poster']}\",\n")
+            f.write(f"    \"episodes\": [\n")
+            for e_idx, ep in enumerate(title_block["episodes"]):
+                line = f'      {{ "episode": "{ep["episode"]}", "name": "{ep["name"]}", "url": "{ep["url"]}" }}'
+                if e_idx != len(title_block["episodes"]) - 1:
+                    line += ","
+                line += "\n"
+                f.write(line)
+            f.write("    ]\n")
+            if t_idx != len(json_data) - 1:
+                f.write("  },\n")
+            else:
+                f.write("  }\n")
+        f.write("]\n")
+
+
+def legacy_generate(titles, output_file):
+    """generate.py sebelum catalog.py: json.dump(indent=2)."""
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(titles, f, indent=2, ensure_ascii=False)
+
+
+def legacy_compact(titles, output_file):
+    """Encode per record seperti lk21_minify.encode sebelum catalog.py."""
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, title in enumerate(titles):
+            if i:
+                f.write(",")
+            f.write(json.dumps(title, ensure_ascii=False, separators=(",", ":")))
+        f.write("]")
+
+
+def make_titles(records, seed=0):
+    """`records` episode dikelompokkan per title, dengan title/nama yang perlu di-escape."""
+    rng = random.Random(seed)
+    titles = []
+    for a in range(max(1, records // EPISODES_PER_ANIME)):
+        episodes = [Episode(f"{e:02d}", f"Episode {e} {rng.choice(WORDS)}",
+                            f"https://vidvf.com/d/{a:08x}{e:04x}")
+                    for e in range(1, EPISODES_PER_ANIME + 1)]
+        titles.append(Title(f"{_title(rng)} {a}", f"https://poster.example/{a}.png", episodes))
+    return titles
+
+
+def _catalog_writer(layout, use_orjson):
+    def write(titles, output_file):
+        saved = catalog.orjson
+        if not use_orjson:
+            catalog.orjson = None
+        try:
+            write_catalog(titles, output_file, layout)
+        finally:
+            catalog.orjson = saved
+    return write
+
+
+# (nama, input "dict"/"record", fungsi(titles, path))
+SERIALIZERS = [
+    ("legacy-001-fstring", "dict", legacy_save_json),
+    ("legacy-generate-json.dump", "dict", legacy_generate),
+    ("legacy-lk21-json.dumps", "dict", legacy_compact),
+    ("catalog-lines", "record", _catalog_writer(LINES, False)),
+    ("catalog-pretty", "record", _catalog_writer(PRETTY, False)),
+    ("catalog-compact", "record", _catalog_writer(COMPACT, False)),
+]
+if catalog.orjson is not None:
+    SERIALIZERS.append(("catalog-compact+orjson", "record", _catalog_writer(COMPACT, True)))
+
+
+def benchmark_serializers(sizes, seed=0, repeat=3):
+    results = []
+    workdir = tempfile.mkdtemp(prefix="data-serialize-")
+    try:
+        for records in sizes:
+            titles = make_titles(records, seed)
+            dicts = [title.to_dict() for title in titles]
+            for name, kind, write in SERIALIZERS:
+                path = os.path.join(workdir, f"{name}.json")
+                data = dicts if kind == "dict" else titles
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    write(data, path)
+                    best = min(best, time.perf_counter() - start)
+                size = os.path.getsize(path)
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        valid = json.load(f) == dicts
+                except ValueError:
+                    valid = False
+                result = {
+                    "serializer": name,
+                    "records": records,
+                    "wall_s": round(best, 4),
+                    "mb_per_s": round(size / 1024 / 1024 / best, 1),
+                    "output_bytes": size,
+                    "valid_json": valid,
+                }
+                results.append(result)
+                print(f"[{name:<26}] {records:>8}  {best:8.3f}s  {result['mb_per_s']:8.1f} MB/s"
+                      + ("" if valid else "  OUTPUT TIDAK VALID"))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tool katalog di data/")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"jumlah record per dataset, dipisah koma (default: {DEFAULT_SIZES})")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"case yang dijalankan (default: semua): {', '.join(CASES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="simpan hasil ke file JSON")
+    parser.add_argument("--keep", action="store_true", help="jangan hapus folder kerja")
+    parser.add_argument("--serialize", action="store_true",
+                        help="tambah benchmark throughput serializer katalog (lama vs catalog.py)")
+    args = parser.parse_args()
+
+    cases = [case for case in args.cases.split(",") if case and case != "none"]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"case tidak dikenal: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    results = benchmark(sizes, cases, args.seed, args.keep)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+    if args.serialize:
+        report["orjson"] = catalog.orjson is not None
+        report["serialization"] = benchmark_serializers(sizes, args.seed)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nHasil disimpan ke {args.out}")
+    else:
+        print(json.dumps(report, indent=2))
+    sys.exit(1 if any(r["exit_code"] for r in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
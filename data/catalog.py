@@ -0,0 +1,295 @@
+"""
+catalog.py
+Inti katalog bersama untuk 001.py, generate.py dan lk21_minify.py.
+
+- Title / Episode : record __slots__ untuk skema katalog UniversalPlayer
+- write_catalog   : satu encoder streaming dengan tiga layout output
+                    PRETTY  -> sama persis dengan json.dump(indent=2) (generate.py)
+                    LINES   -> satu episode per baris (format 001.py)
+                    COMPACT -> tanpa spasi (separators=(",", ":"))
+- iter_items / iter_ndjson / iter_input : loader streaming `[...]`, `{"data": [...]}`
+                    dan NDJSON tanpa load seluruh file
+- load_catalog    : baca katalog jadi list Title
+
+Kalau paket `orjson` ada, layout COMPACT dan load_json memakai orjson;
+kalau tidak, stdlib json. Hasil byte-nya sama, string selalu di-escape
+dengan benar.
+"""
+
+import json
+import re
+from json.encoder import encode_basestring
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+READ_CHUNK = 1 << 16        # karakter per read() saat streaming
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+PRETTY = "pretty"
+LINES = "lines"
+COMPACT = "compact"
+LAYOUTS = (PRETTY, LINES, COMPACT)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class Episode:
+
+    __slots__ = ("episode", "name", "url")
+
+    def __init__(self, episode, name, url):
+        self.episode = episode
+        self.name = name
+        self.url = url
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["episode"], data["name"], data["url"])
+
+    def to_dict(self):
+        return {"episode": self.episode, "name": self.name, "url": self.url}
+
+
+class Title:
+
+    __slots__ = ("title", "poster", "episodes")
+
+    def __init__(self, title, poster, episodes=None):
+        self.title = title
+        self.poster = poster
+        self.episodes = [] if episodes is None else episodes
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["title"], data["poster"], [Episode.from_dict(ep) for ep in data["episodes"]])
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "poster": self.poster,
+            "episodes": [ep.to_dict() for ep in self.episodes],
+        }
+
+
+# ================== ENCODER ==================
+
+def dumps_compact(value):
+    """json.dumps(value, ensure_ascii=False, separators=(",", ":")), lewat orjson kalau ada."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            # orjson menolak surrogate tunggal dan key non-str; stdlib tetap bisa
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _pretty(title):
+    # Sama dengan json.dumps(indent=2) untuk title di dalam array top-level, tapi
+    # dirakit langsung: encoder indent stdlib pure-Python, dan orjson OPT_INDENT_2
+    # + re-indent ternyata lebih lambat (lihat benchmark.py --serialize)
+    head = (
+        f"  {{\n    \"title\": {encode_basestring(title.title)},\n"
+        f"    \"poster\": {encode_basestring(title.poster)},\n    \"episodes\": "
+    )
+    if not title.episodes:
+        return head + "[]\n  }"
+    episodes = ",\n".join(
+        f"      {{\n        \"episode\": {encode_basestring(ep.episode)},\n"
+        f"        \"name\": {encode_basestring(ep.name)},\n"
+        f"        \"url\": {encode_basestring(ep.url)}\n      }}"
+        for ep in title.episodes
+    )
+    return f"{head}[\n{episodes}\n    ]\n  }}"
+
+
+def _lines(title):
+    parts = [
+        "  {\n",
+        f"    \"title\": {encode_basestring(title.title)},\n",
+        f"    \"poster\": {encode_basestring(title.poster)},\n",
+        "    \"episodes\": [\n",
+    ]
+    last = len(title.episodes) - 1
+    for i, ep in enumerate(title.episodes):
+        parts.append(
+            f"      {{ \"episode\": {encode_basestring(ep.episode)}, "
+            f"\"name\": {encode_basestring(ep.name)}, \"url\": {encode_basestring(ep.url)} }}"
+            f"{',' if i != last else ''}\n"
+        )
+    parts.append("    ]\n  }")
+    return "".join(parts)
+
+
+def _compact(title):
+    return dumps_compact(title.to_dict())
+
+
+_ENCODERS = {PRETTY: _pretty, LINES: _lines, COMPACT: _compact}
+
+
+def encode_title(title, layout=COMPACT):
+    """Satu Title -> string JSON sesuai layout (indent sudah untuk posisi di dalam array)."""
+    return _ENCODERS[layout](title)
+
+
+def write_catalog(titles, output_file, layout=PRETTY):
+    """Tulis array title secara streaming (titles boleh generator); return jumlah title."""
+    encode = _ENCODERS[layout]
+    count = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        if layout == COMPACT:
+            f.write("[")
+            for title in titles:
+                if count:
+                    f.write(",")
+                f.write(encode(title))
+                count += 1
+            f.write("]")
+            return count
+
+        f.write("[")
+        for title in titles:
+            f.write(",\n" if count else "\n")
+            f.write(encode(title))
+            count += 1
+        if layout == LINES:
+            f.write("\n]\n")
+        elif count:
+            f.write("\n]")
+        else:
+            f.write("]")
+    return count
+
+
+# ================== LOADER ==================
+
+class _JsonStream:
+    """Buffer di atas file teks; decode satu value JSON per panggilan."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(READ_CHUNK)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Karakter non-whitespace berikutnya, '' kalau sudah EOF."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON tidak valid: butuh {char!r}, dapat {found!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Angka di ujung buffer bisa terpotong ("12" dari "123"), baca lagi
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _iter_array(stream):
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.pos += 1
+        return
+    while True:
+        yield stream.value()
+        char = stream.peek()
+        stream.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"JSON tidak valid: butuh ',' atau ']', dapat {char!r}")
+
+
+def iter_items(input_path):
+    """Yield tiap item dari `[...]` atau `{"data": [...]}` tanpa load seluruh file."""
+    with open(input_path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        first = stream.peek()
+        if first == "[":
+            yield from _iter_array(stream)
+            return
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.value()
+            stream.expect(":")
+            if key == "data" and stream.peek() == "[":
+                yield from _iter_array(stream)
+                return
+            stream.value()
+            char = stream.peek()
+            stream.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"JSON tidak valid: butuh ',' atau '}}', dapat {char!r}")
+
+
+def iter_ndjson(input_path):
+    """Yield item dari file NDJSON (satu object per baris)."""
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def iter_input(input_path):
+    """Pilih parser sesuai ekstensi: .ndjson/.jsonl per baris, selain itu JSON biasa."""
+    if input_path.endswith(NDJSON_SUFFIXES):
+        return iter_ndjson(input_path)
+    return iter_items(input_path)
+
+
+def load_json(path):
+    """json.load satu file utuh (orjson kalau ada)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_titles(input_path):
+    """Title satu per satu dari katalog (streaming)."""
+    for item in iter_input(input_path):
+        yield Title.from_dict(item)
+
+
+def load_catalog(path):
+    """Katalog (array title atau {"data": [...]}) -> list Title."""
+    data = load_json(path)
+    if isinstance(data, dict):
+        data = data.get("data", [])
+    return [Title.from_dict(item) for item in data]
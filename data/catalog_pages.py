@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+catalog_pages.py
+Output katalog UniversalPlayer versi paginated.
+
+Daripada satu array JSON besar yang di-download ulang untuk popular,
+search, latest dan tiap getEpisodeList, katalog dipecah jadi:
+
+    manifest.json        total, jumlah page, map title -> list page, hash page
+    pages/<n>.json       N title per page (title, poster, jumlah episode)
+    titles/<id>.json     satu title lengkap dengan daftar episodenya
+
+<id> = index title di katalog (sama dengan `anime.url` di UniversalPlayer),
+<n> mulai dari 1 seperti parameter `page` di extension. Title boleh
+kembar (beda season/sumber), jadi map title menyimpan semua page-nya.
+
+Usage:
+    python catalog_pages.py split main.json out/ [--page-size 50]
+    python catalog_pages.py verify out/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from catalog import dumps_compact, load_catalog
+
+DEFAULT_PAGE_SIZE = 50
+MANIFEST = "manifest.json"
+
+
+def _dump(path, data):
+    """Tulis JSON compact; return sha256 isi file."""
+    body = dumps_compact(data).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(body)
+    return hashlib.sha256(body).hexdigest()
+
+
+class PagedCatalogWriter:
+    """Terima title block satu per satu (streaming), tulis page + file per title."""
+
+    def __init__(self, out_dir, page_size=DEFAULT_PAGE_SIZE):
+        if page_size <= 0:
+            raise ValueError(f"page_size harus > 0, dapat {page_size}")
+        self.out_dir = out_dir
+        self.page_size = page_size
+        self.page = []
+        self.pages = []
+        self.title_pages = {}
+        self.total = 0
+        for sub in ("pages", "titles"):
+            # Bersihkan sisa run sebelumnya supaya tidak ada page/title yatim
+            folder = os.path.join(out_dir, sub)
+            os.makedirs(folder, exist_ok=True)
+            for name in os.listdir(folder):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(folder, name))
+
+    def add(self, block):
+        """block: catalog.Title"""
+        if len(self.page) == self.page_size:
+            self._flush(has_next=True)
+
+        title_id = self.total
+        sha256 = _dump(os.path.join(self.out_dir, "titles", f"{title_id}.json"), block.to_dict())
+        self.page.append({
+            "id": title_id,
+            "title": block.title,
+            "poster": block.poster,
+            "episodes": len(block.episodes),
+            "sha256": sha256,
+        })
+        pages = self.title_pages.setdefault(block.title, [])
+        if not pages or pages[-1] != len(self.pages) + 1:
+            pages.append(len(self.pages) + 1)
+        self.total += 1
+
+    def _flush(self, has_next):
+        number = len(self.pages) + 1
+        data = {"page": number, "has_next": has_next, "titles": self.page}
+        sha256 = _dump(os.path.join(self.out_dir, "pages", f"{number}.json"), data)
+        self.pages.append({"file": f"pages/{number}.json", "count": len(self.page), "sha256": sha256})
+        self.page = []
+
+    def close(self):
+        if self.page or not self.pages:
+            self._flush(has_next=False)
+        manifest = {
+            "total": self.total,
+            "page_size": self.page_size,
+            "page_count": len(self.pages),
+            "pages": self.pages,
+            "titles": self.title_pages,
+        }
+        with open(os.path.join(self.out_dir, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        return manifest
+
+
+def tee_pages(blocks, writer):
+    """Teruskan title block ke writer sambil tetap di-yield (untuk save_json)."""
+    for block in blocks:
+        writer.add(block)
+        yield block
+
+
+def write_pages(blocks, out_dir, page_size=DEFAULT_PAGE_SIZE):
+    writer = PagedCatalogWriter(out_dir, page_size)
+    for block in blocks:
+        writer.add(block)
+    return writer.close()
+
+
+# ================== CONSUMER ==================
+# Meniru alur fetch di extension: manifest -> page -> title, dengan cek hash.
+
+def _load(root, relative, sha256=None):
+    with open(os.path.join(root, relative), "rb") as f:
+        body = f.read()
+    if sha256 is not None and hashlib.sha256(body).hexdigest() != sha256:
+        raise ValueError(f"Hash {relative} tidak cocok dengan manifest")
+    return json.loads(body)
+
+
+def load_manifest(root):
+    return _load(root, MANIFEST)
+
+
+def load_page(root, number, manifest=None):
+    manifest = manifest or load_manifest(root)
+    entry = manifest["pages"][number - 1]
+    return _load(root, entry["file"], entry["sha256"])
+
+
+def load_titles(root, title, manifest=None):
+    """Semua title lengkap + episode dengan nama `title`, urut katalog.
+
+    Cukup baca manifest, page yang memuat title itu (biasanya satu) dan file title-nya.
+    """
+    manifest = manifest or load_manifest(root)
+    blocks = []
+    for number in manifest["titles"].get(title, []):
+        for entry in load_page(root, number, manifest)["titles"]:
+            if entry["title"] == title:
+                blocks.append(_load(root, f"titles/{entry['id']}.json", entry["sha256"]))
+    return blocks
+
+
+def verify(root, source=None):
+    """Cek semua hash + urutan; kalau `source` (list Title) ada, cek isinya sama persis."""
+    manifest = load_manifest(root)
+    blocks = []
+    for number in range(1, manifest["page_count"] + 1):
+        page = load_page(root, number, manifest)
+        if page["has_next"] != (number < manifest["page_count"]):
+            raise ValueError(f"has_next salah di page {number}")
+        for entry in page["titles"]:
+            if entry["id"] != len(blocks):
+                raise ValueError(f"id title tidak berurutan di page {number}")
+            blocks.append(_load(root, f"titles/{entry['id']}.json", entry["sha256"]))
+    if len(blocks) != manifest["total"]:
+        raise ValueError("total di manifest tidak sama dengan jumlah title")
+    counts = {}
+    for block in blocks:
+        counts[block["title"]] = counts.get(block["title"], 0) + 1
+    if counts.keys() != manifest["titles"].keys():
+        raise ValueError("map title -> page tidak memuat semua title")
+    for title, count in counts.items():
+        if len(load_titles(root, title, manifest)) != count:
+            raise ValueError(f"map title -> page salah untuk {title!r}")
+    if source is not None and blocks != [title.to_dict() for title in source]:
+        raise ValueError("Isi katalog paginated berbeda dengan sumber")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Katalog UniversalPlayer versi paginated")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    split = sub.add_parser("split", help="pecah katalog JSON (array title) jadi page")
+    split.add_argument("input")
+    split.add_argument("out_dir")
+    split.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+
+    check = sub.add_parser("verify", help="cek manifest, hash dan isi page")
+    check.add_argument("out_dir")
+    check.add_argument("--source", help="katalog JSON asli untuk dibandingkan")
+
+    args = parser.parse_args()
+    if args.command == "split":
+        if args.page_size <= 0:
+            parser.error("--page-size harus > 0")
+        manifest = write_pages(load_catalog(args.input), args.out_dir, args.page_size)
+        print(f"✅ {manifest['total']} title -> {manifest['page_count']} page di {args.out_dir}")
+    else:
+        source = load_catalog(args.source) if args.source else None
+        manifest = verify(args.out_dir, source)
+        print(f"✅ OK: {manifest['total']} title, {manifest['page_count']} page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+check_links.py
+Cek link episode di katalog (main.json, aku_lupa_.json, ...) masih hidup atau tidak.
+
+- asyncio + koneksi HTTP/1.1 keep-alive yang di-pool per host
+- batas concurrency global + rate limit per host + retry dengan backoff
+- hasil di-cache di disk dengan TTL, re-check hanya untuk entry yang basi
+- output: report JSON dan (opsional) katalog tanpa episode mati
+
+HEAD dulu; kalau server tidak mendukung HEAD dicoba GET dengan Range 1 byte
+(body hanya dibaca kalau server menjawab 206; selain itu koneksi ditutup).
+Status < 400 = hidup, 404/410 = mati. 5xx/429/timeout di-retry; kalau tetap
+gagal (atau 4xx lain seperti 403, atau redirect lebih dari MAX_REDIRECTS)
+dihitung error: tidak di-cache, tidak di-prune.
+
+Usage:
+    python check_links.py main.json --report report.json
+    python check_links.py main.json --prune main.alive.json --ttl-hours 24
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urljoin, urlsplit
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_PER_HOST = 4        # koneksi paralel per host
+DEFAULT_RATE = 5.0          # request per detik per host
+DEFAULT_RETRIES = 3
+DEFAULT_TIMEOUT = 15.0
+DEFAULT_TTL_HOURS = 24
+MAX_REDIRECTS = 5
+DEAD_STATUS = {404, 410}
+RETRY_STATUS = {429, 500, 502, 503, 504}
+USER_AGENT = "Mozilla/5.0 (Project69 link checker)"
+
+
+class HttpError(Exception):
+    pass
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class HttpClient:
+    """Client HTTP/1.1 minimal dengan pool koneksi keep-alive per host."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, rate=DEFAULT_RATE, timeout=DEFAULT_TIMEOUT,
+                 ssl_context=None):
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.idle = defaultdict(list)
+        self.host_slots = defaultdict(lambda: asyncio.Semaphore(per_host))
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next_slot = defaultdict(float)
+
+    async def _throttle(self, key):
+        """Rate limit per host: jadwalkan request berikutnya paling cepat `interval` detik lagi."""
+        now = time.monotonic()
+        slot = max(now, self.next_slot[key])
+        self.next_slot[key] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _connect(self, key):
+        """Return (koneksi, reused); koneksi idle dipakai dulu sebelum buka baru."""
+        scheme, host, port = key
+        if self.idle[key]:
+            return self.idle[key].pop(), True
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self.ssl_context if scheme == "https" else None
+        )
+        return Connection(reader, writer), False
+
+    async def request(self, method, url, headers=None):
+        """Return (status, headers). Body dibaca lalu dibuang supaya koneksi bisa dipakai ulang."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise HttpError(f"URL tidak didukung: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        async with self.host_slots[key]:
+            await self._throttle(key)
+            while True:
+                conn, reused = await asyncio.wait_for(self._connect(key), self.timeout)
+                try:
+                    status, response_headers, reusable = await asyncio.wait_for(
+                        self._exchange(conn, method, parts.netloc, path, headers or {}), self.timeout
+                    )
+                except (OSError, HttpError, asyncio.IncompleteReadError):
+                    conn.close()
+                    if reused:
+                        # Koneksi idle sudah ditutup server (keep-alive habis), coba koneksi baru
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                break
+            if reusable:
+                self.idle[key].append(conn)
+            else:
+                conn.close()
+            return status, response_headers
+
+    async def _exchange(self, conn, method, host, path, headers):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host}", f"User-Agent: {USER_AGENT}",
+                 "Accept: */*", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise HttpError("Koneksi ditutup server")
+        try:
+            version, status = status_line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HttpError(f"Status line tidak valid: {status_line!r}")
+
+        response_headers = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        reusable = (version == "HTTP/1.1"
+                    and response_headers.get("connection", "").lower() != "close")
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif method == "GET" and status != 206:
+            # Range diabaikan (atau bukan 2xx): jangan download body, buang koneksinya
+            reusable = False
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await conn.reader.readline()).split(b";")[0], 16)
+                await conn.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in response_headers:
+            await conn.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            # Body sampai EOF, koneksi tidak bisa dipakai ulang
+            reusable = False
+        return status, response_headers, reusable
+
+    def close(self):
+        for connections in self.idle.values():
+            for conn in connections:
+                conn.close()
+        self.idle.clear()
+
+
+async def check_url(client, url, retries=DEFAULT_RETRIES):
+    """Return dict {alive, status, error}; alive None = tidak bisa dipastikan."""
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(min(2 ** attempt * 0.5, 10))
+        try:
+            target = url
+            method = "HEAD"
+            for _ in range(MAX_REDIRECTS + 1):
+                headers = {"Range": "bytes=0-0"} if method == "GET" else {}
+                status, response_headers = await client.request(method, target, headers)
+                if status in (405, 501) and method == "HEAD":
+                    method = "GET"
+                    continue
+                if 300 <= status < 400 and "location" in response_headers:
+                    target = urljoin(target, response_headers["location"])
+                    continue
+                break
+            else:
+                return {"alive": None, "status": status, "error": f"Redirect lebih dari {MAX_REDIRECTS}x"}
+            if status in RETRY_STATUS:
+                error = f"HTTP {status}"
+                continue
+            if status in DEAD_STATUS:
+                return {"alive": False, "status": status, "error": None}
+            if status < 400:
+                return {"alive": True, "status": status, "error": None}
+            # 401/403 dll: bisa jadi blokir bot, bukan bukti link mati
+            return {"alive": None, "status": status, "error": f"HTTP {status}"}
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HttpError, ValueError) as e:
+            error = f"{type(e).__name__}: {e}"
+    return {"alive": None, "status": None, "error": error}
+
+
+# ================== CACHE ==================
+
+def load_cache(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(path, cache):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def is_fresh(entry, ttl, now):
+    return entry is not None and now - entry["checked"] < ttl
+
+
+# ================== CATALOG ==================
+
+def iter_episodes(catalog):
+    for block in catalog:
+        for ep in block.get("episodes", []):
+            yield block, ep
+
+
+async def check_all(urls, cache, concurrency=DEFAULT_CONCURRENCY, ttl=DEFAULT_TTL_HOURS * 3600,
+                    retries=DEFAULT_RETRIES, client=None, progress=None):
+    """Cek URL yang belum ada / basi di cache; update cache in place; return hasil per URL."""
+    now = time.time()
+    stale = []
+    results = {}
+    for url in urls:
+        entry = cache.get(url)
+        if is_fresh(entry, ttl, now):
+            results[url] = entry
+        else:
+            stale.append(url)
+    client = client or HttpClient()
+    limit = asyncio.Semaphore(concurrency)
+
+    async def worker(url):
+        async with limit:
+            result = await check_url(client, url, retries)
+        result["checked"] = time.time()
+        results[url] = result
+        if result["alive"] is not None:
+            cache[url] = result
+        if progress:
+            progress(len(results), len(urls))
+
+    try:
+        await asyncio.gather(*(worker(url) for url in stale))
+    finally:
+        client.close()
+    return results, len(stale)
+
+
+def build_report(catalog, results):
+    dead, errors = [], []
+    for block, ep in iter_episodes(catalog):
+        result = results[ep["url"]]
+        item = {"title": block["title"], "episode": ep["episode"], "url": ep["url"],
+                "status": result["status"]}
+        if result["alive"] is False:
+            dead.append(item)
+        elif result["alive"] is None:
+            errors.append({**item, "error": result["error"]})
+    alive = sum(1 for r in results.values() if r["alive"])
+    return {
+        "summary": {"urls": len(results), "alive": alive, "dead": len({d["url"] for d in dead}),
+                    "errors": len({e["url"] for e in errors})},
+        "dead": dead,
+        "errors": errors,
+    }
+
+
+def prune(catalog, results):
+    """Katalog tanpa episode yang pasti mati; title tanpa episode ikut dibuang."""
+    pruned = []
+    for block in catalog:
+        episodes = [ep for ep in block["episodes"] if results[ep["url"]]["alive"] is not False]
+        if episodes:
+            pruned.append({**block, "episodes": episodes})
+    return pruned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek link episode katalog masih hidup")
+    parser.add_argument("catalog", help="file katalog JSON (array title + episodes)")
+    parser.add_argument("--report", help="tulis report JSON ke file ini (default: stdout)")
+    parser.add_argument("--prune", metavar="FILE", help="tulis katalog tanpa episode mati ke FILE")
+    parser.add_argument("--cache", default=".link_cache.json", help="file cache hasil cek")
+    parser.add_argument("--ttl-hours", type=float, default=DEFAULT_TTL_HOURS,
+                        help=f"umur cache sebelum dicek ulang (default: {DEFAULT_TTL_HOURS})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help="koneksi paralel per host")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="request/detik per host")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    args = parser.parse_args()
+
+    with open(args.catalog, "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    urls = list(dict.fromkeys(ep["url"] for _, ep in iter_episodes(catalog)))
+    cache = load_cache(args.cache)
+
+    def progress(done, total):
+        if sys.stdout.isatty():
+            print(f"\r   {done}/{total} URL", end="", flush=True)
+
+    client = HttpClient(args.per_host, args.rate, args.timeout)
+    start = time.perf_counter()
+    results, checked = asyncio.run(check_all(
+        urls, cache, args.concurrency, args.ttl_hours * 3600, args.retries, client, progress
+    ))
+    if sys.stdout.isatty():
+        print()
+    save_cache(args.cache, cache)
+
+    report = build_report(catalog, results)
+    report["summary"]["checked"] = checked
+    report["summary"]["cached"] = len(urls) - checked
+    report["summary"]["seconds"] = round(time.perf_counter() - start, 2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.prune:
+        pruned = prune(catalog, results)
+        with open(args.prune, "w", encoding="utf-8") as f:
+            json.dump(pruned, f, indent=2, ensure_ascii=False)
+        print(f"Katalog tanpa episode mati: {args.prune} ({len(pruned)} title)")
+
+    s = report["summary"]
+    print(f"✅ {s['urls']} URL: {s['alive']} hidup, {s['dead']} mati, {s['errors']} error "
+          f"({s['checked']} dicek, {s['cached']} dari cache, {s['seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
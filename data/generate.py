@@ -1,6 +1,17 @@
+import argparse
+import csv
 import json
+import os
+import sys
 
-def generate():
+from catalog import PRETTY, Episode, Title, load_catalog, write_catalog
+from catalog_pages import DEFAULT_PAGE_SIZE, write_pages
+from search_index import build_index
+
+LIST_FILE = "list.json"
+FORMATS = {".csv": "csv", ".tsv": "tsv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+def generate(pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=None):
     print("=== Universal Player - JSON Generator ===\n")
     
     jumlah_anime = int(input("Mau bikin berapa anime? "))
@@ -17,25 +28,209 @@ def generate():
         print(f"Masukkan {jumlah_episode} link video (1 per baris):")
         for e in range(1, jumlah_episode + 1):
             url = input(f"  Episode {e:02d}: ")
-            episodes.append({
-                "episode": f"{e:02d}",
-                "name": f"Episode {e:02d}",
-                "url": url
-            })
-
-        anime_list.append({
-            "title": title,
-            "poster": poster,
-            "episodes": episodes
-        })
+            episodes.append(Episode(f"{e:02d}", f"Episode {e:02d}", url))
+
+        anime_list.append(Title(title, poster, episodes))
 
         print(f"✅ '{title}' ({jumlah_episode} episode) berhasil ditambahkan!")
 
     # Simpan ke list.json
-    with open("list.json", "w", encoding="utf-8") as f:
-        json.dump(anime_list, f, indent=2, ensure_ascii=False)
+    write_catalog(anime_list, LIST_FILE, PRETTY)
+
+    print(f"\n✅ Selesai! {jumlah_anime} anime disimpan ke {LIST_FILE}")
+
+    publish(anime_list, pages_dir, page_size, search_index)
+
+def publish(anime_list, pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=None):
+    if pages_dir:
+        manifest = write_pages(anime_list, pages_dir, page_size)
+        print(f"✅ Versi paginated: {manifest['page_count']} page di {pages_dir}")
+
+    if search_index:
+        build_index(anime_list, search_index)
+        print(f"✅ Index pencarian disimpan ke {search_index}")
+
+# ================== BULK IMPORT ==================
+# Satu baris = satu episode: title, poster, episode, name, url
+# (poster/episode/name boleh kosong). Header wajib untuk CSV/TSV.
+# NDJSON: satu object per baris dengan key yang sama.
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Format {path!r} tidak dikenali, pakai --format csv|tsv|ndjson")
+    return FORMATS[ext]
+
+def iter_rows(f, fmt):
+    """Yield (nomor baris, dict) dari file CSV/TSV/NDJSON yang sudah dibuka."""
+    if fmt == "ndjson":
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, ValueError(f"JSON tidak valid: {e.msg}")
+                continue
+            yield line_no, row if isinstance(row, dict) else ValueError("bukan JSON object")
+        return
+    reader = csv.DictReader(f, delimiter="\t" if fmt == "tsv" else ",")
+    for row in reader:
+        yield reader.line_num, row
+
+def validate_row(row):
+    """Return (title, poster, episode, name, url) atau raise ValueError."""
+    if isinstance(row, Exception):
+        raise row
+    title = str(row.get("title") or "").strip()
+    url = str(row.get("url") or "").strip()
+    if not title:
+        raise ValueError("title kosong")
+    if not url.startswith(("http://", "https://")):
+        raise ValueError(f"url tidak valid: {url!r}")
+    episode = str(row.get("episode") or "").strip()
+    if episode.isdigit():
+        episode = f"{int(episode):02d}"
+    poster = str(row.get("poster") or "").strip()
+    name = str(row.get("name") or "").strip()
+    return title, poster, episode, name, url
+
+def load_list(path):
+    if not os.path.exists(path):
+        return []
+    return load_catalog(path)
+
+def episode_sort_key(episode):
+    """Episode bernomor urut numerik, sisanya (OVA, Special, ...) di belakang."""
+    return (0, int(episode.episode)) if episode.episode.isdigit() else (1, 0)
+
+def merge_rows(anime_list, rows):
+    """Gabung baris ke anime_list (per title) dalam satu pass; return (stats, errors)."""
+    by_title = {anime.title: anime for anime in anime_list}
+    # Per title: episode -> index di list episodes, semua url yang sudah ada,
+    # dan nomor berikutnya untuk baris tanpa episode (max nomor + 1)
+    episode_index = {}
+    known_urls = {}
+    next_number = {}
+    stats = {"titles": 0, "added": 0, "updated": 0, "skipped": 0}
+    errors = []
+
+    for line_no, row in rows:
+        try:
+            title, poster, episode, name, url = validate_row(row)
+        except ValueError as e:
+            errors.append((line_no, str(e)))
+            continue
+
+        anime = by_title.get(title)
+        if anime is None:
+            anime = Title(title, poster)
+            anime_list.append(anime)
+            by_title[title] = anime
+            stats["titles"] += 1
+        elif poster:
+            anime.poster = poster
+
+        if title not in episode_index:
+            episode_index[title] = {ep.episode: i for i, ep in enumerate(anime.episodes)}
+            known_urls[title] = {ep.url for ep in anime.episodes}
+            next_number[title] = max((int(ep.episode) for ep in anime.episodes if ep.episode.isdigit()),
+                                     default=0) + 1
+        episodes = anime.episodes
+        if url in known_urls[title]:
+            stats["skipped"] += 1
+            continue
+        known_urls[title].add(url)
+
+        if not episode:
+            episode = f"{next_number[title]:02d}"
+        if episode.isdigit():
+            next_number[title] = max(next_number[title], int(episode) + 1)
+        if episode in episode_index[title]:
+            # Episode yang sama di-import ulang: link lama diganti, nama lama dipakai kalau kosong
+            current = episodes[episode_index[title][episode]]
+            # Link lama tidak lagi ada di list, jadi boleh di-import lagi
+            known_urls[title].discard(current.url)
+            current.url = url
+            current.name = name or current.name
+            stats["updated"] += 1
+        else:
+            episode_index[title][episode] = len(episodes)
+            episodes.append(Episode(episode, name or f"Episode {episode}", url))
+            stats["added"] += 1
+
+    for title in episode_index:
+        by_title[title].episodes.sort(key=episode_sort_key)
+    return stats, errors
+
+def save_list(anime_list, path):
+    tmp_path = path + ".tmp"
+    write_catalog(anime_list, tmp_path, PRETTY)
+    os.replace(tmp_path, path)
+
+def bulk_import(sources, output=LIST_FILE, fmt=None, strict=False,
+                pages_dir=None, page_size=DEFAULT_PAGE_SIZE, search_index=None):
+    # Format semua sumber dicek dulu, sebelum ada input yang dibaca
+    if "-" in sources and not fmt:
+        raise SystemExit("Input dari stdin butuh --format csv|tsv|ndjson")
+    try:
+        formats = [fmt if source == "-" else detect_format(source, fmt) for source in sources]
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    anime_list = load_list(output)
+    existing = len(anime_list)
+    total = {"titles": 0, "added": 0, "updated": 0, "skipped": 0}
+    errors = []
+
+    for source, source_fmt in zip(sources, formats):
+        if source == "-":
+            stats, source_errors = merge_rows(anime_list, iter_rows(sys.stdin, source_fmt))
+        else:
+            with open(source, "r", encoding="utf-8", newline="") as f:
+                stats, source_errors = merge_rows(anime_list, iter_rows(f, source_fmt))
+        for key, value in stats.items():
+            total[key] += value
+        errors.extend((source, line_no, message) for line_no, message in source_errors)
+
+    for source, line_no, message in errors[:20]:
+        print(f"❌ {source}:{line_no}: {message}")
+    if len(errors) > 20:
+        print(f"   ... dan {len(errors) - 20} error lain")
+    if errors and strict:
+        print(f"\n{len(errors)} baris tidak valid, {output} tidak diubah (--strict)")
+        return 1
 
-    print(f"\n✅ Selesai! {jumlah_anime} anime disimpan ke list.json")
+    save_list(anime_list, output)
+    print(f"\n✅ {output}: {existing} -> {len(anime_list)} anime "
+          f"(+{total['titles']} title, +{total['added']} episode, "
+          f"{total['updated']} diganti, {total['skipped']} duplikat, {len(errors)} error)")
+    publish(anime_list, pages_dir, page_size, search_index)
+    return 1 if errors else 0
 
 if __name__ == "__main__":
-    generate()
+    parser = argparse.ArgumentParser(description="Universal Player - JSON Generator")
+    parser.add_argument("--pages", metavar="DIR",
+                        help="tulis juga versi paginated (manifest + page + file per title) ke DIR")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"jumlah title per page (default: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument("--search-index", metavar="FILE",
+                        help="tulis juga index pencarian title (token + trigram -> id) ke FILE")
+    parser.add_argument("--import", dest="sources", nargs="+", metavar="FILE",
+                        help="bulk import CSV/TSV/NDJSON ('-' = stdin) lalu merge ke list.json per title; "
+                             "kolom: title, poster, episode, name, url")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())),
+                        help="format input (default: dari ekstensi file)")
+    parser.add_argument("--output", default=LIST_FILE, help=f"list.json tujuan merge (default: {LIST_FILE})")
+    parser.add_argument("--strict", action="store_true",
+                        help="jangan tulis apa pun kalau ada baris tidak valid")
+    args = parser.parse_args()
+    if args.page_size <= 0:
+        parser.error("--page-size harus > 0")
+    if args.sources:
+        sys.exit(bulk_import(args.sources, args.output, args.format, args.strict,
+                             args.pages, args.page_size, args.search_index))
+    generate(args.pages, args.page_size, args.search_index)
@@ -0,0 +1,89 @@
+"""
+link_store.py
+Penyimpanan sqlite untuk ingest link incremental di 001.py.
+
+- files : checkpoint per dump .txt (offset byte terakhir yang sudah diproses
+          + hash 4KB sebelum offset, untuk deteksi file ditulis ulang)
+- links : semua URL yang sudah masuk katalog (setelah ganti domain), jadi
+          link yang di-paste ulang di file mana pun tidak jadi episode baru
+"""
+
+import hashlib
+import os
+import sqlite3
+
+TAIL_BYTES = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    tail_sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    catalog TEXT NOT NULL,
+    title TEXT NOT NULL,
+    episode TEXT NOT NULL
+);
+"""
+
+
+def tail_hash(f, offset):
+    """sha256 dari TAIL_BYTES byte terakhir sebelum offset."""
+    start = max(0, offset - TAIL_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+class LinkStore:
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.realpath(file_path)
+
+    def start_offset(self, file_path):
+        """Offset untuk lanjut baca; 0 kalau file baru, terpotong, atau isinya berubah."""
+        row = self.db.execute(
+            "SELECT offset, tail_sha256 FROM files WHERE path = ?", (self._key(file_path),)
+        ).fetchone()
+        if row is None:
+            return 0
+        offset, expected = row
+        if os.path.getsize(file_path) < offset:
+            return 0
+        with open(file_path, "rb") as f:
+            return offset if tail_hash(f, offset) == expected else 0
+
+    def is_known(self, url):
+        return self.db.execute("SELECT 1 FROM links WHERE url = ?", (url,)).fetchone() is not None
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM links").fetchone()[0]
+
+    def commit(self, file_path, offset, entries):
+        """Simpan checkpoint + link baru (catalog, title, episode, url) dalam satu transaksi."""
+        with open(file_path, "rb") as f:
+            digest = tail_hash(f, offset)
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO files (path, offset, tail_sha256) VALUES (?, ?, ?)",
+                (self._key(file_path), offset, digest),
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO links (catalog, title, episode, url) VALUES (?, ?, ?, ?)",
+                entries,
+            )
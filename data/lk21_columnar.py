@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+lk21_columnar.py
+Format katalog LK21 kolom-per-kolom (binary) + reader berbasis mmap.
+
+Dibanding JSON minified, nama key tidak diulang per record, semua string
+masuk satu string table (dedup), prefix URL poster disimpan sekali di
+dictionary, dan `type` jadi kode 1 byte. Reader bisa ambil satu record
+atau range title tanpa parse seluruh file.
+
+Layout (little-endian):
+    header   : MAGIC, count, n_strings, n_prefixes, n_types, offset tiap section
+    strings  : uint32[n_strings + 1] offset + blob UTF-8
+    prefixes : uint32[n_prefixes] id string
+    types    : uint32[n_types] id string
+    title    : uint32[count] id string   (urut title.lower(), sama dengan JSON)
+    slug     : uint32[count] id string
+    poster   : uint16[count] id prefix + uint32[count] id string sisa URL
+    type     : uint8[count] kode type
+
+Usage:
+    python lk21_columnar.py build minified.json catalog.lk21c [--compress gzip:9,zstd:19]
+    python lk21_columnar.py get catalog.lk21c 0
+    python lk21_columnar.py range catalog.lk21c ava
+    python lk21_columnar.py bench minified.json catalog.lk21c
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"LK21COL\x01"
+HEADER = struct.Struct("<8sIIHBx9Q")
+MAX_PREFIXES = 0xFFFF      # n_prefixes uint16, termasuk prefix "" (id 0)
+MAX_TYPES = 0xFF
+
+
+def _le(values):
+    """array -> bytes little-endian, apapun byte order mesin."""
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def split_poster(poster):
+    """"https://host/path/file.jpg" -> ("https://host/path/", "file.jpg"); None dianggap ""."""
+    head, sep, tail = (poster or "").rpartition("/")
+    return (head + sep, tail)
+
+
+class ColumnarWriter:
+    """Kumpulkan record (urut title) lalu tulis file kolom.
+
+    Bisa dipakai sebagai sink di lk21_minify.write_output() karena punya add(record, encoded).
+    """
+
+    def __init__(self):
+        self.strings = {}
+        self.prefixes = {}
+        self.types = {}
+        # id string untuk tiap entry prefixes/types, urut sesuai kode
+        self.prefix_strings = array("I")
+        self.type_strings = array("I")
+        self.title = array("I")
+        self.slug = array("I")
+        self.poster_prefix = array("H")
+        self.poster_rest = array("I")
+        self.type = array("B")
+        # Prefix "" selalu id 0: tempat URL utuh kalau dictionary penuh, ikut dihitung di MAX_PREFIXES
+        self._prefix("")
+
+    def _string(self, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def _prefix(self, prefix):
+        index = self.prefixes.get(prefix)
+        if index is None:
+            index = self.prefixes[prefix] = len(self.prefixes)
+            self.prefix_strings.append(self._string(prefix))
+        return index
+
+    def add(self, record, encoded=None):
+        prefix, rest = split_poster(record["poster"])
+        if prefix not in self.prefixes and len(self.prefixes) >= MAX_PREFIXES:
+            # Dictionary penuh: simpan URL utuh di string table
+            prefix, rest = "", record["poster"] or ""
+        prefix_id = self._prefix(prefix)
+
+        type_id = self.types.get(record["type"])
+        if type_id is None:
+            if len(self.types) >= MAX_TYPES:
+                raise ValueError(f"Terlalu banyak nilai type (> {MAX_TYPES})")
+            type_id = self.types[record["type"]] = len(self.types)
+            self.type_strings.append(self._string(record["type"]))
+
+        self.title.append(self._string(record["title"]))
+        self.slug.append(self._string(record["slug"]))
+        self.poster_prefix.append(prefix_id)
+        self.poster_rest.append(self._string(rest))
+        self.type.append(type_id)
+
+    def to_bytes(self):
+        blob = bytearray()
+        offsets = array("I", [0])
+        for value in self.strings:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+
+        sections = [
+            _le(offsets),
+            _pad(bytes(blob)),
+            _le(self.prefix_strings),
+            _le(self.type_strings),
+            _le(self.title),
+            _le(self.slug),
+            _pad(_le(self.poster_prefix)),
+            _le(self.poster_rest),
+            _pad(_le(self.type)),
+        ]
+        position = HEADER.size
+        starts = []
+        for section in sections:
+            starts.append(position)
+            position += len(section)
+        header = HEADER.pack(
+            MAGIC, len(self.title), len(self.strings), len(self.prefixes), len(self.types), *starts
+        )
+        return header + b"".join(sections)
+
+    def close(self, path, compress=()):
+        """Tulis file + varian terkompresi; return {path: ukuran byte}."""
+        data = self.to_bytes()
+        outputs = {path: data}
+        for method, level in compress:
+            outputs[f"{path}{COMPRESSORS[method][0]}"] = COMPRESSORS[method][1](data, level)
+        for out_path, body in outputs.items():
+            with open(out_path, "wb") as f:
+                f.write(body)
+        return {out_path: len(body) for out_path, body in outputs.items()}
+
+
+def _gzip(data, level):
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _zstd(data, level):
+    if zstandard is None:
+        raise RuntimeError("Kompresi zstd butuh paket 'zstandard' (pip install zstandard)")
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+COMPRESSORS = {
+    "gzip": (".gz", _gzip),
+    "zstd": (".zst", _zstd),
+}
+
+
+def parse_compress(spec):
+    """"gzip:9,zstd:19" -> [("gzip", 9), ("zstd", 19)]."""
+    result = []
+    for part in filter(None, spec.split(",")):
+        method, _, level = part.partition(":")
+        if method not in COMPRESSORS:
+            raise ValueError(f"Kompresi tidak dikenal: {method}")
+        result.append((method, int(level or 9)))
+    return result
+
+
+class _TitleKeys:
+    """Sequence title.lower() yang di-decode saat diakses, untuk bisect."""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __len__(self):
+        return len(self.reader)
+
+    def __getitem__(self, index):
+        return self.reader.title(index).lower()
+
+
+class ColumnarReader:
+    """Baca file kolom via mmap (atau decompress ke memori untuk .gz/.zst)."""
+
+    def __init__(self, path):
+        self._file = None
+        self._mmap = None
+        if path.endswith(".gz"):
+            with open(path, "rb") as f:
+                data = gzip.decompress(f.read())
+        elif path.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError("Membaca .zst butuh paket 'zstandard'")
+            with open(path, "rb") as f:
+                data = zstandard.ZstdDecompressor().decompress(f.read())
+        else:
+            self._file = open(path, "rb")
+            data = self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count, n_strings, n_prefixes, n_types, *starts = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"{path} bukan file katalog kolom LK21")
+        self.count = count
+        self._data = memoryview(data)
+        (offsets, blob, prefixes, types, title, slug, poster_prefix, poster_rest, type_) = starts
+
+        self._offsets = self._column(offsets, "I", n_strings + 1)
+        self._blob = self._data[blob:blob + self._offsets[n_strings]]
+        self._titles = self._column(title, "I", count)
+        self._slugs = self._column(slug, "I", count)
+        self._poster_prefix = self._column(poster_prefix, "H", count)
+        self._poster_rest = self._column(poster_rest, "I", count)
+        self._type = self._column(type_, "B", count)
+        # Tabel kecil: decode sekali di awal
+        self._prefixes = [self.string(i) for i in self._column(prefixes, "I", n_prefixes)]
+        self._types = [self.string(i) for i in self._column(types, "I", n_types)]
+
+    def _column(self, start, typecode, length):
+        size = array(typecode).itemsize
+        view = self._data[start:start + size * length]
+        if sys.byteorder != "little" and size > 1:
+            values = array(typecode, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(typecode)
+
+    def close(self):
+        self._offsets = self._blob = self._titles = self._slugs = None
+        self._poster_prefix = self._poster_rest = self._type = None
+        self._data.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def string(self, index):
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def title(self, index):
+        return self.string(self._titles[index])
+
+    def record(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return {
+            "title": self.string(self._titles[index]),
+            "slug": self.string(self._slugs[index]),
+            "poster": self._prefixes[self._poster_prefix[index]] + self.string(self._poster_rest[index]),
+            "type": self._types[self._type[index]],
+        }
+
+    def __iter__(self):
+        return map(self.record, range(self.count))
+
+    def title_range(self, prefix):
+        """Index [start, end) record yang title.lower()-nya diawali `prefix`."""
+        low = prefix.lower()
+        keys = _TitleKeys(self)
+        start = bisect.bisect_left(keys, low)
+        end = bisect.bisect_left(keys, low + "\U0010ffff", lo=start)
+        return start, end
+
+    def search_prefix(self, prefix):
+        return [self.record(i) for i in range(*self.title_range(prefix))]
+
+
+def write_columnar(records, path, compress=()):
+    writer = ColumnarWriter()
+    for record in records:
+        writer.add(record)
+    return writer.close(path, compress)
+
+
+def _load_minified(path):
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return raw if isinstance(raw, list) else raw.get("data", [])
+
+
+def _timed(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(json_path, columnar_path):
+    """Bandingkan ukuran + waktu decode JSON minified vs file kolom."""
+    data = _load_minified(json_path)
+    probe = data[len(data) // 2]["title"][:3] if data else ""
+
+    def json_full():
+        _load_minified(json_path)
+
+    def json_prefix():
+        low = probe.lower()
+        [r for r in _load_minified(json_path) if r["title"].lower().startswith(low)]
+
+    def col_full():
+        with ColumnarReader(columnar_path) as reader:
+            list(reader)
+
+    def col_one():
+        with ColumnarReader(columnar_path) as reader:
+            reader.record(len(reader) // 2)
+
+    def col_prefix():
+        with ColumnarReader(columnar_path) as reader:
+            reader.search_prefix(probe)
+
+    sizes = {json_path: os.path.getsize(json_path)}
+    for path in [columnar_path] + [columnar_path + s for s, _ in COMPRESSORS.values()]:
+        if os.path.exists(path):
+            sizes[path] = os.path.getsize(path)
+
+    print(f"Records: {len(data)}  (probe prefix: {probe!r})")
+    print("\nUkuran:")
+    base = sizes[json_path]
+    for path, size in sizes.items():
+        print(f"   {path:<40} {size / 1024:>10.1f} KB  {size / base * 100:>6.1f}%")
+
+    print("\nDecode (best of 3):")
+    for label, func in [
+        ("JSON: parse semua", json_full),
+        ("JSON: cari prefix", json_prefix),
+        ("Kolom: decode semua", col_full),
+        ("Kolom: 1 record", col_one),
+        ("Kolom: cari prefix", col_prefix),
+    ]:
+        print(f"   {label:<24} {_timed(func) * 1000:>10.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Katalog LK21 format kolom (binary)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="konversi output minified JSON ke format kolom")
+    build.add_argument("input")
+    build.add_argument("output")
+    build.add_argument("--compress", default="", help="varian terkompresi, mis. gzip:9,zstd:19")
+
+    get = sub.add_parser("get", help="decode satu record by index")
+    get.add_argument("file")
+    get.add_argument("index", type=int)
+
+    search = sub.add_parser("range", help="record dengan title berawalan PREFIX")
+    search.add_argument("file")
+    search.add_argument("prefix")
+
+    compare = sub.add_parser("bench", help="bandingkan ukuran + waktu decode dengan JSON")
+    compare.add_argument("json")
+    compare.add_argument("file")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        sizes = write_columnar(_load_minified(args.input), args.output, parse_compress(args.compress))
+        for path, size in sizes.items():
+            print(f"{path}: {size / 1024:.1f} KB")
+    elif args.command == "get":
+        with ColumnarReader(args.file) as reader:
+            print(json.dumps(reader.record(args.index), ensure_ascii=False))
+    elif args.command == "range":
+        with ColumnarReader(args.file) as reader:
+            for record in reader.search_prefix(args.prefix):
+                print(json.dumps(record, ensure_ascii=False))
+    else:
+        bench(args.json, args.file)
+
+
+if __name__ == "__main__":
+    main()
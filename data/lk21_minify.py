@@ -6,28 +6,488 @@ Hanya simpan: title, slug, poster, type
 
 Usage:
     python lk21_minify.py input.json output.json
+    python lk21_minify.py --stream --memory-mb 64 input.json output.json
+    python lk21_minify.py input.json output.json --index lk21_index.json --shards shards/
+    python lk21_minify.py input.json output.json --index lk21_index.json \
+        --previous published.json --delta deltas/
+    python lk21_minify.py --keep latest chunks/*.json chunks/*.ndjson output.json
+    python lk21_minify.py input.json output.json --search-index lk21_search.json
+
+Mode --stream membaca input sedikit-sedikit (tidak json.load semua),
+menyimpan record dalam bentuk ringkas, dan kalau melebihi budget memori
+sort dilakukan lewat run file sementara + k-way merge. Output identik
+dengan mode biasa.
+
+--previous/--delta membandingkan dengan output yang sudah dipublish dan
+menulis patch (added/changed/removed per slug); lk21_index.json menyimpan
+rantai delta + hash supaya client versi lama cukup download patch.
+
+Banyak input (potongan scrape resume, JSON/NDJSON) di-parse paralel lalu
+di-merge k-way; --keep first|latest menentukan slug duplikat mana yang menang.
+
+--search-index menulis index pencarian title (lihat search_index.py);
+id di index = posisi record di output.
 """
 
+import argparse
+import hashlib
+import heapq
 import json
-import sys
 import os
+import pickle
+import re
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from catalog import NDJSON_SUFFIXES, dumps_compact, iter_input, iter_items, load_json
+from lk21_columnar import ColumnarWriter, parse_compress
+from search_index import SearchIndexBuilder
+
+DEFAULT_MEMORY_MB = 64      # budget memori default untuk mode --stream
+RECORD_OVERHEAD = 260       # perkiraan byte per Film (objek + 4 str kosong)
+MERGE_FAN_IN = 64           # maksimal run file yang dibuka sekaligus
+RUN_BATCH = 4096            # record per pickle.dump di run file
+DEFAULT_SHARD_KB = 256      # ukuran target per shard
+DEFAULT_PREFIX_LEN = 2      # panjang prefix title untuk key shard
+DEFAULT_KEEP_DELTAS = 30    # jumlah delta terakhir yang disimpan di index
+
+SHARD_NAME = re.compile(r"\d{4}\.json")
+
+
+class Film:
+    """Record ringkas satu film; pakai __slots__ supaya tidak ada __dict__ per record."""
+
+    __slots__ = ("title", "slug", "poster", "type", "seq")
+
+    def __init__(self, title, slug, poster, type, seq):
+        self.title = title
+        self.slug = slug
+        self.poster = poster
+        self.type = type
+        self.seq = seq
+
+    @classmethod
+    def from_item(cls, item, seq):
+        type_ = item.get("type", "")
+        if isinstance(type_, str):
+            # Nilai type cuma segelintir ("movie", "series", ...), share satu objek str
+            type_ = sys.intern(type_)
+        return cls(item.get("title", ""), item.get("slug", ""), item.get("poster", ""), type_, seq)
+
+    def astuple(self):
+        return (self.title, self.slug, self.poster, self.type, self.seq)
+
+    def cost(self):
+        return RECORD_OVERHEAD + len(self.title) + len(self.slug) + len(self.poster)
+
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "slug": self.slug,
+            "poster": self.poster,
+            "type": self.type,
+        }
+
+
+def by_slug(film):
+    return (film.slug, film.seq)
+
+
+def by_title(film):
+    return (film.title.lower(), film.seq)
+
+
+# ================== EXTERNAL SORT ==================
+
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            for row in batch:
+                yield Film(*row)
+
+
+class ExternalSorter:
+    """Kumpulkan Film lalu iterasi terurut; spill ke run file kalau melebihi budget byte."""
+
+    def __init__(self, key, budget_bytes, tmpdir):
+        self.key = key
+        self.budget = budget_bytes
+        self.tmpdir = tmpdir
+        self.buffer = []
+        self.used = 0
+        self.runs = []
+        self.count = 0
+
+    def add(self, film):
+        self.buffer.append(film)
+        self.used += film.cost()
+        self.count += 1
+        if self.used >= self.budget:
+            self._spill()
+
+    def _write_run(self, films):
+        fd, path = tempfile.mkstemp(prefix="run-", suffix=".pkl", dir=self.tmpdir)
+        with os.fdopen(fd, "wb") as f:
+            batch = []
+            for film in films:
+                batch.append(film.astuple())
+                if len(batch) == RUN_BATCH:
+                    pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+                    batch = []
+            if batch:
+                pickle.dump(batch, f, pickle.HIGHEST_PROTOCOL)
+        return path
+
+    def finish(self):
+        """Spill sisa buffer; return semua run file (untuk di-merge proses lain)."""
+        if self.buffer:
+            self._spill()
+        return self.runs
+
+    def _spill(self):
+        self.buffer.sort(key=self.key)
+        self.runs.append(self._write_run(self.buffer))
+        self.buffer = []
+        self.used = 0
+
+    def __iter__(self):
+        if not self.runs:
+            buffer, self.buffer = self.buffer, []
+            buffer.sort(key=self.key)
+            yield from buffer
+            return
+        if self.buffer:
+            self._spill()
+        # Batasi jumlah file yang terbuka: merge bertingkat kalau run terlalu banyak
+        while len(self.runs) > MERGE_FAN_IN:
+            batch, self.runs = self.runs[:MERGE_FAN_IN], self.runs[MERGE_FAN_IN:]
+            merged = heapq.merge(*map(_read_run, batch), key=self.key)
+            self.runs.append(self._write_run(merged))
+            for path in batch:
+                os.remove(path)
+        yield from heapq.merge(*map(_read_run, self.runs), key=self.key)
+
+
+def unique_by_slug(films, keep="first"):
+    """Satu Film per slug dari stream yang sudah urut (slug, seq).
+
+    keep="first" ambil seq terkecil (kemunculan pertama), keep="latest" ambil
+    seq terbesar (file/record paling akhir menang).
+    """
+    if keep == "first":
+        last = None
+        for film in films:
+            if film.slug == last:
+                continue
+            last = film.slug
+            yield film
+        return
+
+    pending = None
+    for film in films:
+        if pending is not None and film.slug != pending.slug:
+            yield pending
+        pending = film
+    if pending is not None:
+        yield pending
+
+
+# ================== SHARDING ==================
+
+def title_key(title, prefix_len):
+    """Prefix ternormalisasi; sama dengan sort key output (title.lower())."""
+    return title.lower()[:prefix_len]
+
+
+class ShardWriter:
+    """Pecah output (yang sudah urut title) jadi shard kecil per prefix title.
+
+    Shard dipotong di pergantian prefix setelah ukurannya mencapai `max_bytes`;
+    satu prefix yang terlalu besar baru dipaksa potong di 2x `max_bytes`.
+    Tiap shard formatnya sama dengan output utama: {"total": .., "data": [..]}.
+    """
+
+    def __init__(self, shard_dir, max_bytes, prefix_len):
+        self.shard_dir = shard_dir
+        self.max_bytes = max_bytes
+        self.prefix_len = prefix_len
+        self.manifest = []
+        self.rows = []
+        self.size = 0
+        self.first_key = None
+        self.last_key = None
+
+        os.makedirs(shard_dir, exist_ok=True)
+        for name in os.listdir(shard_dir):
+            if SHARD_NAME.fullmatch(name):
+                os.remove(os.path.join(shard_dir, name))
+
+    def add(self, record, encoded):
+        key = title_key(record["title"], self.prefix_len)
+        if self.rows and self.size >= self.max_bytes:
+            if key != self.last_key or self.size >= 2 * self.max_bytes:
+                self._flush()
+        if not self.rows:
+            self.first_key = key
+        self.rows.append(encoded)
+        self.size += len(encoded.encode("utf-8")) + 1
+        self.last_key = key
+
+    def _flush(self):
+        name = f"{len(self.manifest):04d}.json"
+        body = f'{{"total":{len(self.rows)},"data":[{",".join(self.rows)}]}}'.encode("utf-8")
+        with open(os.path.join(self.shard_dir, name), "wb") as f:
+            f.write(body)
+        self.manifest.append({
+            "file": name,
+            "from": self.first_key,
+            "to": self.last_key,
+            "count": len(self.rows),
+            "bytes": len(body),
+            "sha256": hashlib.sha256(body).hexdigest(),
+        })
+        self.rows = []
+        self.size = 0
+
+    def close(self):
+        if self.rows:
+            self._flush()
+        return self.manifest
+
+
+def shards_for(shards, query):
+    """Shard yang mungkin berisi title berawalan `query` (logika yang dipakai client)."""
+    prefix_len = shards["prefix_len"]
+    low = title_key(query, prefix_len)
+    # Query lebih pendek dari prefix: semua key yang diawali `low` ikut cocok
+    high = low if len(low) >= prefix_len else low + "\U0010ffff"
+    return [s for s in shards["files"] if s["from"] <= high and low <= s["to"]]
+
+
+# ================== INDEX & DELTA ==================
+
+def load_index(index_path):
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_index(index_path, index):
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def base_url(index, directory):
+    """Default URL folder output tambahan: satu folder dengan `url` katalog di index."""
+    url = index.get("url", "")
+    name = os.path.basename(os.path.normpath(directory))
+    return f"{url.rsplit('/', 1)[0]}/{name}" if "/" in url else name
+
+
+def next_version(previous):
+    """Version = tanggal; publish kedua di hari yang sama jadi "YYYY-MM-DD.2" dst."""
+    today = date.today().isoformat()
+    if not previous or not previous.startswith(today):
+        return today
+    _, _, n = previous.partition(".")
+    return f"{today}.{int(n or 1) + 1}"
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def record_hash(encoded):
+    return int.from_bytes(hashlib.sha256(encoded.encode("utf-8")).digest(), "big")
+
+
+def content_hash(total):
+    """Hash isi katalog yang tidak tergantung urutan (jumlah sha256 per record)."""
+    return f"{total % (1 << 256):064x}"
+
+
+class ContentHasher:
+    """Sink yang menghitung content_hash dari record output."""
 
-def minify(input_path, output_path):
+    def __init__(self):
+        self.total = 0
+
+    def add(self, record, encoded):
+        self.total += record_hash(encoded)
+
+    def hexdigest(self):
+        return content_hash(self.total)
+
+
+class DeltaBuilder:
+    """Sink yang membandingkan output baru dengan katalog versi sebelumnya per slug.
+
+    Record lama (seq (0, n)) dan baru (seq (1, n)) masuk satu ExternalSorter
+    urut slug, lalu di-join saat close(); memori tetap dalam `budget_bytes`
+    walau katalognya besar (selain isi delta itu sendiri).
+    """
+
+    def __init__(self, previous_path, budget_bytes=DEFAULT_MEMORY_MB * 1024 * 1024 // 2):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="lk21-delta-")
+        self.sorter = ExternalSorter(by_slug, budget_bytes, self.tmpdir.name)
+        total = 0
+        for n, item in enumerate(iter_items(previous_path)):
+            total += record_hash(encode(item))
+            self.sorter.add(Film.from_item(item, (0, n)))
+        self.base_hash = content_hash(total)
+        # Versi lama sudah di disk sebelum output baru mulai ditulis
+        self.sorter.finish()
+
+    def add(self, record, encoded):
+        self.sorter.add(Film(record["title"], record["slug"], record["poster"], record["type"],
+                             (1, self.sorter.count)))
+
+    def close(self):
+        """Return (added, changed, removed slug), lalu hapus run file."""
+        added, changed, removed = [], [], []
+        old = None
+        for film in self.sorter:
+            if film.seq[0] == 0:
+                if old is not None:
+                    removed.append(old.slug)
+                old = film
+                continue
+            if old is not None and old.slug == film.slug:
+                if old.astuple()[:4] != film.astuple()[:4]:
+                    changed.append(film.to_dict())
+                old = None
+                continue
+            if old is not None:
+                removed.append(old.slug)
+                old = None
+            added.append(film.to_dict())
+        if old is not None:
+            removed.append(old.slug)
+        self.tmpdir.cleanup()
+        return added, changed, removed
+
+
+def write_delta(builder, delta_dir, version_from, version_to, new_hash, total):
+    """Tulis patch from -> to; return entry untuk rantai `deltas` di index."""
+    added, changed, removed = builder.close()
+    delta = {
+        "from": version_from,
+        "to": version_to,
+        "base": builder.base_hash,
+        "content_hash": new_hash,
+        "total": total,
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+    }
+    body = dumps_compact(delta).encode("utf-8")
+
+    os.makedirs(delta_dir, exist_ok=True)
+    name = f"{version_from}_{version_to}.json"
+    with open(os.path.join(delta_dir, name), "wb") as f:
+        f.write(body)
+
+    return {
+        "from": version_from,
+        "to": version_to,
+        "file": name,
+        "bytes": len(body),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "added": len(delta["added"]),
+        "changed": len(delta["changed"]),
+        "removed": len(delta["removed"]),
+    }
+
+
+def apply_delta(records, delta):
+    """Terapkan patch ke list record versi `from` (logika yang dipakai client).
+
+    Hasil diurutkan by title seperti output minify; content_hash dicek supaya
+    patch yang salah basis tidak diam-diam menghasilkan katalog rusak.
+    """
+    removed = set(delta["removed"])
+    changed = {r["slug"]: r for r in delta["changed"]}
+    result = [changed.get(r["slug"], r) for r in records if r["slug"] not in removed]
+    result.extend(delta["added"])
+    result.sort(key=lambda x: x["title"].lower())
+
+    total = sum(record_hash(encode(r)) for r in result)
+    if content_hash(total) != delta["content_hash"]:
+        raise ValueError(f"content_hash tidak cocok setelah apply {delta['from']} -> {delta['to']}")
+    return result
+
+
+# ================== MINIFY ==================
+
+def encode(record):
+    return dumps_compact(record)
+
+
+def write_output(records, total, output_path, sinks=()):
+    """Tulis {"total": .., "data": [..]} persis seperti json.dump versi compact.
+
+    Tiap record yang sudah di-encode juga diteruskan ke `sinks` (mis. ShardWriter)
+    supaya output tambahan tidak perlu encode/iterasi ulang.
+    """
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(f'{{"total":{total},"data":[')
+        for i, record in enumerate(records):
+            encoded = encode(record)
+            if i:
+                f.write(",")
+            f.write(encoded)
+            for sink in sinks:
+                sink.add(record, encoded)
+        f.write("]}")
+
+
+def print_stats(input_paths, output_path, total_in, dupes, total_out):
+    if isinstance(input_paths, str):
+        input_paths = [input_paths]
+    size_in = sum(map(os.path.getsize, input_paths)) / (1024 * 1024)
+    size_out = os.path.getsize(output_path) / (1024 * 1024)
+
+    print(f"\n✅ Done!")
+    if len(input_paths) > 1:
+        print(f"   Files  : {len(input_paths)} input")
+    print(f"   Input  : {total_in} film, {size_in:.2f} MB")
+    print(f"   Dupes  : {dupes} dihapus")
+    print(f"   Output : {total_out} film, {size_out:.2f} MB")
+    print(f"   Reduced: {((size_in - size_out) / size_in * 100):.1f}%")
+
+
+def minify(input_path, output_path, sinks=(), keep="first"):
     print(f"Reading {input_path}...")
-    with open(input_path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
+    raw = load_json(input_path)
 
     data = raw if isinstance(raw, list) else raw.get("data", [])
     total_in = len(data)
 
-    # Deduplicate by slug (hapus duplikat akibat resume dari page lama)
+    # Deduplicate by slug (hapus duplikat akibat resume dari page lama);
+    # keep="latest" ambil kemunculan terakhir, posisinya ikut posisi terakhir
+    # seperti minify_stream
+    last = {}
+    if keep == "latest":
+        last = {item.get("slug", ""): i for i, item in enumerate(data)}
     seen = set()
     stripped = []
     dupes = 0
 
-    for item in data:
+    for i, item in enumerate(data):
         slug = item.get("slug", "")
-        if slug in seen:
+        if slug in seen or last.get(slug, i) != i:
             dupes += 1
             continue
         seen.add(slug)
@@ -41,27 +501,194 @@ def minify(input_path, output_path):
     # Sort by title biar search lebih predictable
     stripped.sort(key=lambda x: x["title"].lower())
 
-    output = {
-        "total": len(stripped),
-        "data": stripped
-    }
-
     print(f"Writing {output_path}...")
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, separators=(",", ":"))
+    write_output(stripped, len(stripped), output_path, sinks)
 
-    # Stats
-    size_in = os.path.getsize(input_path) / (1024 * 1024)
-    size_out = os.path.getsize(output_path) / (1024 * 1024)
+    print_stats(input_path, output_path, total_in, dupes, len(stripped))
+    return len(stripped)
+
+
+def sort_input(input_path, file_no, budget, tmpdir):
+    """Worker: parse satu file jadi run file terurut (slug, seq); return (jumlah, runs)."""
+    sorter = ExternalSorter(by_slug, budget, tmpdir)
+    for n, item in enumerate(iter_input(input_path)):
+        sorter.add(Film.from_item(item, (file_no, n)))
+    return sorter.count, sorter.finish()
+
+
+def minify_stream(input_paths, output_path, memory_mb=DEFAULT_MEMORY_MB, sinks=(), jobs=1, keep="first"):
+    """Versi bounded-memory dari minify(): dedup + sort lewat external merge.
+
+    Bisa banyak input (JSON atau NDJSON, mis. potongan scrape yang di-resume):
+    tiap file di-parse + sort di process pool, lalu semua run di-merge k-way.
+    seq = (urutan file, urutan record), jadi `keep` menentukan duplikat mana
+    yang menang.
+    """
+    if isinstance(input_paths, str):
+        input_paths = [input_paths]
+    # Dua sorter bisa aktif bersamaan (merge slug -> isi sorter title)
+    budget = memory_mb * 1024 * 1024 // 2
+    jobs = max(1, min(jobs, len(input_paths)))
+
+    print(f"Streaming {len(input_paths)} file (budget {memory_mb} MB, {jobs} proses)...")
+    with tempfile.TemporaryDirectory(prefix="lk21-") as tmpdir:
+        # Pass 1: run terurut per slug dari tiap input
+        tasks = [(path, no, budget // jobs, tmpdir) for no, path in enumerate(input_paths)]
+        if jobs == 1:
+            results = [sort_input(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(sort_input, *zip(*tasks)))
+
+        slug_sorter = ExternalSorter(by_slug, budget, tmpdir)
+        total_in = 0
+        for count, runs in results:
+            total_in += count
+            slug_sorter.runs.extend(runs)
+
+        # Pass 2: sort by title; seq menjaga urutan stabil seperti list.sort()
+        title_sorter = ExternalSorter(by_title, budget, tmpdir)
+        for film in unique_by_slug(slug_sorter, keep):
+            title_sorter.add(film)
+
+        print(f"Writing {output_path}...")
+        records = (film.to_dict() for film in title_sorter)
+        write_output(records, title_sorter.count, output_path, sinks)
+
+    print_stats(input_paths, output_path, total_in, total_in - title_sorter.count, title_sorter.count)
+    return title_sorter.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify lk21_data.json (title, slug, poster, type)")
+    parser.add_argument("inputs", nargs="+", metavar="input",
+                        help="lk21_data.json hasil scrape; boleh banyak file JSON/NDJSON (otomatis --stream)")
+    parser.add_argument("output", help="file output minified")
+    parser.add_argument("--stream", action="store_true",
+                        help="parse bertahap + external sort, memori tetap walau dump besar")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB,
+                        help=f"budget memori mode --stream (default: {DEFAULT_MEMORY_MB})")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(),
+                        help="jumlah proses parse untuk banyak input (default: jumlah CPU)")
+    parser.add_argument("--keep", choices=("first", "latest"), default="first",
+                        help="slug duplikat: ambil yang pertama atau yang terakhir (default: first)")
+    parser.add_argument("--by-mtime", action="store_true",
+                        help="urutkan input berdasarkan waktu modifikasi (lama -> baru)")
+    parser.add_argument("--index", help="lk21_index.json yang di-update (version, total, hash, ...)")
+    parser.add_argument("--shards", metavar="DIR",
+                        help="tulis juga shard per prefix title ke DIR + manifest di --index")
+    parser.add_argument("--shard-kb", type=int, default=DEFAULT_SHARD_KB,
+                        help=f"ukuran target per shard (default: {DEFAULT_SHARD_KB})")
+    parser.add_argument("--prefix-len", type=int, default=DEFAULT_PREFIX_LEN,
+                        help=f"panjang prefix title untuk key shard (default: {DEFAULT_PREFIX_LEN})")
+    parser.add_argument("--shard-base-url",
+                        help="URL folder shard (default: folder 'url' di index + nama DIR)")
+    parser.add_argument("--previous", metavar="FILE",
+                        help="output minified versi sebelumnya, untuk membuat delta")
+    parser.add_argument("--delta", metavar="DIR", help="folder tujuan file delta (butuh --previous)")
+    parser.add_argument("--delta-base-url",
+                        help="URL folder delta (default: folder 'url' di index + nama DIR)")
+    parser.add_argument("--keep-deltas", type=int, default=DEFAULT_KEEP_DELTAS,
+                        help=f"panjang rantai delta di index (default: {DEFAULT_KEEP_DELTAS})")
+    parser.add_argument("--columnar", metavar="FILE",
+                        help="tulis juga format kolom binary (lihat lk21_columnar.py)")
+    parser.add_argument("--columnar-compress", default="", metavar="SPEC",
+                        help="varian terkompresi format kolom, mis. gzip:9,zstd:19")
+    parser.add_argument("--search-index", metavar="FILE",
+                        help="tulis juga index pencarian title (token + trigram -> posisi record)")
+    args = parser.parse_args()
+
+    if (args.shards or args.delta) and not args.index:
+        parser.error("--shards/--delta butuh --index untuk menyimpan manifest")
+    if bool(args.previous) != bool(args.delta):
+        parser.error("--previous dan --delta harus dipakai bersama")
+
+    index = load_index(args.index) if args.index else {}
+    sinks = []
+    hasher = ContentHasher()
+    if args.index:
+        sinks.append(hasher)
+    shard_writer = None
+    if args.shards:
+        shard_writer = ShardWriter(args.shards, args.shard_kb * 1024, args.prefix_len)
+        sinks.append(shard_writer)
+    delta_builder = None
+    if args.previous:
+        print(f"Reading previous {args.previous}...")
+        # Aktif bersamaan dengan sorter title saat output ditulis: setengah budget
+        delta_builder = DeltaBuilder(args.previous, args.memory_mb * 1024 * 1024 // 2)
+        if index.get("content_hash") not in (None, delta_builder.base_hash):
+            # Delta dari basis yang salah merusak katalog client; gagal sebelum menulis apa pun
+            delta_builder.close()
+            parser.error(f"{args.previous} tidak sama dengan versi {index.get('version')} di index "
+                         f"(content_hash beda)")
+        sinks.append(delta_builder)
+
+    columnar = None
+    if args.columnar:
+        columnar = ColumnarWriter()
+        sinks.append(columnar)
+
+    search = None
+    if args.search_index:
+        search = SearchIndexBuilder()
+        sinks.append(search)
+
+    inputs = args.inputs
+    if args.by_mtime:
+        inputs = sorted(inputs, key=os.path.getmtime)
+    if args.stream or len(inputs) > 1 or inputs[0].endswith(NDJSON_SUFFIXES):
+        total = minify_stream(inputs, args.output, args.memory_mb, sinks, args.jobs, args.keep)
+    else:
+        total = minify(inputs[0], args.output, sinks, args.keep)
+
+    if columnar:
+        sizes = columnar.close(args.columnar, parse_compress(args.columnar_compress))
+        for path, size in sizes.items():
+            print(f"   Kolom  : {path}, {size / (1024 * 1024):.2f} MB")
+
+    if search:
+        search.save(args.search_index)
+        print(f"   Search : {args.search_index}, {os.path.getsize(args.search_index) / 1024:.1f} KB")
+
+    if not args.index:
+        return
+
+    previous_version = index.get("version")
+    version = next_version(previous_version)
+    new_hash = hasher.hexdigest()
+
+    if shard_writer:
+        files = shard_writer.close()
+        index["shards"] = {
+            "prefix_len": args.prefix_len,
+            "base_url": args.shard_base_url or base_url(index, args.shards),
+            "files": files,
+        }
+        print(f"   Shards : {len(files)} file di {args.shards}")
+    elif index.pop("shards", None):
+        print("   Shards : dihapus dari index (tanpa --shards)")
+
+    if delta_builder and previous_version is None:
+        # Belum ada versi yang dipublish: tidak ada basis untuk patch
+        delta_builder.close()
+        print("   Delta  : dilewati, index belum punya versi sebelumnya")
+    elif delta_builder:
+        entry = write_delta(delta_builder, args.delta, previous_version, version, new_hash, total)
+        deltas = index.get("deltas", {"base_url": base_url(index, args.delta), "chain": []})
+        if args.delta_base_url:
+            deltas["base_url"] = args.delta_base_url
+        deltas["chain"] = (deltas["chain"] + [entry])[-args.keep_deltas:]
+        index["deltas"] = deltas
+        print(f"   Delta  : +{entry['added']} ~{entry['changed']} -{entry['removed']}, {entry['bytes']} bytes")
+
+    index["version"] = version
+    index["total"] = total
+    index["sha256"] = file_sha256(args.output)
+    index["content_hash"] = new_hash
+    save_index(args.index, index)
+    print(f"   Index  : {args.index} ({previous_version} -> {version})")
 
-    print(f"\n✅ Done!")
-    print(f"   Input  : {total_in} film, {size_in:.2f} MB")
-    print(f"   Dupes  : {dupes} dihapus")
-    print(f"   Output : {len(stripped)} film, {size_out:.2f} MB")
-    print(f"   Reduced: {((size_in - size_out) / size_in * 100):.1f}%")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python lk21_minify.py <input.json> <output.json>")
-        sys.exit(1)
-    minify(sys.argv[1], sys.argv[2])
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+rewrite.py
+Rewrite URL katalog berbasis tabel rule (migrasi host).
+
+File rule (JSON), dicek berurutan, rule pertama yang cocok menang:
+
+    [
+      {"from": "https://vidxlr.de", "to": "https://vidvf.com"},
+      {"pattern": "^https://old\\\\.host/e/(\\\\w+)", "to": "https://new.host/d/\\\\1"}
+    ]
+
+- "from"    : prefix URL, diganti "to" (sama seperti replace_domain lama)
+- "pattern" : regex yang harus cocok dari awal URL, "to" boleh pakai \\1 / \\g<name>
+              (tanpa backreference di dalam pattern; nama group unik antar rule)
+
+Semua rule di-compile jadi satu regex alternation, jadi tiap URL cukup
+dicek sekali berapa pun jumlah rule-nya. File katalog diproses per baris
+(string JSON tidak pernah lintas baris), format asli tidak berubah, dan
+ditulis ulang secara atomic (file sementara + os.replace).
+
+Usage:
+    python rewrite.py rules.json main.json aku_lupa_.json
+    python rewrite.py rules.json katalog/ --dry-run
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import Counter
+
+# String literal JSON di satu baris
+STRING_LITERAL = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+
+class RuleSet:
+    """Kumpulan rule rewrite yang di-compile jadi satu matcher."""
+
+    def __init__(self, rules):
+        self.rules = []
+        alternatives = []
+        for i, rule in enumerate(rules):
+            if "from" in rule:
+                pattern = re.escape(rule["from"])
+                compiled = None
+            elif "pattern" in rule:
+                pattern = rule["pattern"].removeprefix("^")
+                compiled = re.compile(pattern)
+            else:
+                raise ValueError(f"Rule #{i + 1} butuh 'from' atau 'pattern': {rule}")
+            if "to" not in rule:
+                raise ValueError(f"Rule #{i + 1} butuh 'to': {rule}")
+            self.rules.append((rule, compiled))
+            alternatives.append(f"(?P<_rule{i}>{pattern})")
+        try:
+            self.matcher = re.compile("|".join(alternatives)) if alternatives else None
+        except re.error as e:
+            # Mis. nama group yang sama dipakai dua rule, atau backreference \N
+            raise ValueError(f"Rule pattern tidak bisa digabung: {e}") from e
+        self.hits = Counter()
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        return cls([{"from": old, "to": new} for old, new in pairs])
+
+    def rewrite(self, url):
+        if self.matcher is None:
+            return url
+        match = self.matcher.match(url)
+        if match is None:
+            return url
+        index = int(match.lastgroup.removeprefix("_rule"))
+        rule, compiled = self.rules[index]
+        if compiled is None:
+            new_url = rule["to"] + url[len(rule["from"]):]
+        else:
+            new_url = compiled.sub(rule["to"], url, count=1)
+        # Yang dihitung hanya URL yang benar-benar berubah (mis. rule idempotent tidak dihitung)
+        if new_url != url:
+            self.hits[index] += 1
+        return new_url
+
+    def describe(self, index):
+        rule = self.rules[index][0]
+        return f"{rule.get('from') or rule['pattern']} -> {rule['to']}"
+
+
+def rewrite_line(line, rules):
+    def replace(match):
+        literal = match.group(1)
+        if not literal.startswith("http"):
+            return match.group(0)
+        value = json.loads(match.group(0)) if "\\" in literal else literal
+        new_value = rules.rewrite(value)
+        if new_value == value:
+            return match.group(0)
+        return json.dumps(new_value, ensure_ascii=False)
+
+    return STRING_LITERAL.sub(replace, line)
+
+
+def rewrite_file(path, rules, dry_run=False):
+    """Rewrite satu file katalog in place; return jumlah baris yang berubah."""
+    directory = os.path.dirname(os.path.abspath(path))
+    changed = 0
+    fd, tmp_path = tempfile.mkstemp(prefix=".rewrite-", suffix=".json", dir=directory)
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as src, \
+                os.fdopen(fd, "w", encoding="utf-8", newline="") as dst:
+            for line in src:
+                new_line = rewrite_line(line, rules)
+                if new_line != line:
+                    changed += 1
+                dst.write(new_line)
+        if changed and not dry_run:
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return changed
+
+
+def collect_catalogs(patterns):
+    """Folder -> semua .json di dalamnya (rekursif), selain itu glob."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.extend(sorted(glob.glob(os.path.join(pattern, "**", "*.json"), recursive=True)))
+        else:
+            files.extend(sorted(glob.glob(pattern)))
+    return list(dict.fromkeys(files))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite URL di file katalog JSON pakai tabel rule")
+    parser.add_argument("rules", help="file rule JSON")
+    parser.add_argument("catalogs", nargs="+", help="file katalog, folder, atau glob")
+    parser.add_argument("--dry-run", action="store_true", help="hitung saja, jangan tulis file")
+    args = parser.parse_args()
+
+    rules = RuleSet.from_file(args.rules)
+    files = collect_catalogs(args.catalogs)
+    if not files:
+        print("Tidak ada file katalog yang cocok.")
+        raise SystemExit(1)
+
+    total_lines = 0
+    for path in files:
+        lines = rewrite_file(path, rules, args.dry_run)
+        total_lines += lines
+        status = "akan diubah" if args.dry_run else "diubah"
+        print(f"{'✏️ ' if lines else '  '} {path}: {lines} baris {status}")
+
+    print(f"\n{len(files)} file, {total_lines} baris {'akan diubah' if args.dry_run else 'diubah'}")
+    print("Hit per rule:")
+    for index in range(len(rules.rules)):
+        print(f"   {rules.hits[index]:>8}  {rules.describe(index)}")
+
+
+if __name__ == "__main__":
+    main()
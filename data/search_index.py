@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+search_index.py
+Index pencarian title (inverted index) yang ikut di-publish bersama katalog.
+
+Client cukup download file index kecil ini, dapat daftar id kandidat, lalu
+ambil entry yang cocok saja (titles/<id>.json di katalog paginated, atau
+record ke-<id> di output lk21_minify) tanpa download seluruh katalog.
+
+Isi index:
+    tokens   : kata ternormalisasi -> id title
+    trigrams : 3 huruf berurutan dalam satu kata -> id title (untuk substring)
+
+Normalisasi: NFKD, buang aksen, lowercase, selain huruf/angka jadi spasi.
+Posting list disimpan terurut dan delta-encoded ([3, 10, 12] -> [3, 7, 2]).
+
+Usage:
+    python search_index.py build main.json main.search.json
+    python search_index.py query main.search.json "aku lupa" [--catalog main.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+from catalog import Title, iter_items
+
+INDEX_VERSION = 1
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", stripped.lower()).strip()
+
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def word_matches(word, normalized):
+    """Aturan cocok satu kata query, sama untuk kandidat index dan verifikasi:
+    kata >= 3 huruf sebagai substring, kata pendek sebagai prefix token."""
+    if len(word) >= 3:
+        return word in normalized
+    return any(token.startswith(word) for token in normalized.split())
+
+
+def _delta(ids):
+    previous = 0
+    for value in ids:
+        yield value - previous
+        previous = value
+
+
+def _undelta(deltas):
+    total = 0
+    result = []
+    for value in deltas:
+        total += value
+        result.append(total)
+    return result
+
+
+class SearchIndexBuilder:
+    """Tambahkan title berurutan (id = urutan add); bisa jadi sink lk21_minify / tee 001.py."""
+
+    def __init__(self):
+        self.count = 0
+        self.tokens = defaultdict(list)
+        self.trigrams = defaultdict(list)
+
+    def add(self, record, encoded=None):
+        title_id = self.count
+        self.count += 1
+        # Title dari 001.py/generate.py, dict record dari lk21_minify
+        title = record.title if isinstance(record, Title) else record["title"]
+        words = set(normalize(title).split())
+        for word in words:
+            self.tokens[word].append(title_id)
+        for gram in set().union(*map(trigrams, words)) if words else ():
+            self.trigrams[gram].append(title_id)
+
+    def to_dict(self):
+        return {
+            "version": INDEX_VERSION,
+            "count": self.count,
+            "tokens": {k: list(_delta(v)) for k, v in sorted(self.tokens.items())},
+            "trigrams": {k: list(_delta(v)) for k, v in sorted(self.trigrams.items())},
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+
+
+def index_path_for(catalog_path):
+    """main.json -> main.search.json"""
+    return os.path.splitext(catalog_path)[0] + ".search.json"
+
+
+def build_index(titles, path):
+    builder = SearchIndexBuilder()
+    for record in titles:
+        builder.add(record)
+    builder.save(path)
+    return builder.count
+
+
+class SearchIndex:
+
+    def __init__(self, data):
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Versi index tidak didukung: {data.get('version')}")
+        self.count = data["count"]
+        self.tokens = data["tokens"]
+        self.trigrams = data["trigrams"]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _postings(self, table, key):
+        return set(_undelta(table.get(key, ())))
+
+    def _candidates(self, word):
+        if len(word) >= 3:
+            # Semua trigram kata query harus ada di title (bisa false positive, dicek di search())
+            result = None
+            for gram in trigrams(word):
+                ids = self._postings(self.trigrams, gram)
+                result = ids if result is None else result & ids
+                if not result:
+                    break
+            return result or set()
+        # Kata pendek: cocokkan sebagai prefix token
+        result = set()
+        for token, deltas in self.tokens.items():
+            if token.startswith(word):
+                result.update(_undelta(deltas))
+        return result
+
+    def query(self, text):
+        """Id kandidat untuk semua kata di query; token yang sama persis diurutkan duluan."""
+        words = normalize(text).split()
+        if not words:
+            return []
+        result = None
+        for word in words:
+            ids = self._candidates(word)
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        exact = set.intersection(*(self._postings(self.tokens, w) for w in words))
+        return sorted(result, key=lambda i: (i not in exact, i))
+
+
+def search(index, text, titles):
+    """Query + verifikasi ke title asli dengan word_matches (titles: list, index = id)."""
+    words = normalize(text).split()
+    matches = []
+    for title_id in index.query(text):
+        normalized = normalize(titles[title_id]["title"])
+        if all(word_matches(word, normalized) for word in words):
+            matches.append(title_id)
+    return matches
+
+
+def _load_titles(path):
+    return list(iter_items(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index pencarian title katalog")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="buat index dari katalog JSON (array title atau {data: [...]})")
+    build.add_argument("catalog")
+    build.add_argument("output")
+
+    find = sub.add_parser("query", help="cari title lewat index")
+    find.add_argument("index")
+    find.add_argument("text")
+    find.add_argument("--catalog", help="katalog asli, untuk verifikasi + tampilkan title")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        count = build_index(_load_titles(args.catalog), args.output)
+        print(f"✅ Index {count} title -> {args.output}")
+        return
+
+    index = SearchIndex.load(args.index)
+    if args.catalog:
+        titles = _load_titles(args.catalog)
+        for title_id in search(index, args.text, titles):
+            print(f"{title_id}\t{titles[title_id]['title']}")
+    else:
+        print(" ".join(map(str, index.query(args.text))))
+
+
+if __name__ == "__main__":
+    main()
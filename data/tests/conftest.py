@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modul data/ dijalankan sebagai script, bukan paket; import langsung dari folder-nya
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
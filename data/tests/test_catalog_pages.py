@@ -0,0 +1,42 @@
+import pytest
+
+from catalog import Episode, Title
+from catalog_pages import PagedCatalogWriter, load_page, load_titles, verify, write_pages
+
+CATALOG = [
+    Title("Alpha", "a.jpg", [Episode("01", "Episode 01", "https://x/a1")]),
+    Title("Beta", "b.jpg", [Episode("01", "Episode 01", "https://x/b1"), Episode("02", "Episode 02", "https://x/b2")]),
+    Title("Gamma", "g.jpg"),
+    Title("Alpha", "a2.jpg", [Episode("01", "Episode 01", "https://x/a2")]),
+    Title("Delta", "d.jpg"),
+]
+
+
+@pytest.fixture
+def pages(tmp_path):
+    write_pages(CATALOG, str(tmp_path), page_size=2)
+    return str(tmp_path)
+
+
+def test_paging(pages):
+    manifest = verify(pages, CATALOG)
+    assert (manifest["total"], manifest["page_count"]) == (5, 3)
+    assert [entry["count"] for entry in manifest["pages"]] == [2, 2, 1]
+    first, last = load_page(pages, 1, manifest), load_page(pages, 3, manifest)
+    assert [t["title"] for t in first["titles"]] == ["Alpha", "Beta"]
+    assert first["has_next"] and not last["has_next"]
+    assert last["titles"][0]["id"] == 4
+
+
+def test_duplicate_titles(pages):
+    manifest = verify(pages)
+    assert manifest["titles"]["Alpha"] == [1, 2]
+    assert [block["poster"] for block in load_titles(pages, "Alpha", manifest)] == ["a.jpg", "a2.jpg"]
+    assert load_titles(pages, "Beta", manifest) == [CATALOG[1].to_dict()]
+    assert load_titles(pages, "Unknown", manifest) == []
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_page_size_must_be_positive(tmp_path, page_size):
+    with pytest.raises(ValueError):
+        PagedCatalogWriter(str(tmp_path), page_size)
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from check_links import HttpClient, check_all
+
+BIG_BODY = b"x" * (8 * 1024 * 1024)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+    def do_HEAD(self):
+        self.server.requests.append(("HEAD", self.path))
+        if self.path in ("/no-head", "/no-range"):
+            self._send(405)
+        else:
+            self._route()
+
+    def do_GET(self):
+        self.server.requests.append(("GET", self.path, self.headers.get("Range")))
+        if self.path == "/no-head" and self.headers.get("Range") == "bytes=0-0":
+            self._send(206, b"x", [("Content-Range", f"bytes 0-0/{len(BIG_BODY)}")])
+        elif self.path == "/no-range":
+            self._send(200, BIG_BODY)
+        else:
+            self._route()
+
+    def _route(self):
+        if self.path == "/ok":
+            self._send(200, b"ok")
+        elif self.path == "/redirect":
+            self._send(302, headers=[("Location", "/ok")])
+        elif self.path == "/loop":
+            self._send(302, headers=[("Location", "/loop")])
+        elif self.path == "/gone":
+            self._send(404, b"not found")
+        elif self.path == "/busy":
+            self._send(503, b"busy")
+        else:
+            self._send(500)
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", server
+    server.shutdown()
+    server.server_close()
+
+
+def _check(urls, cache=None):
+    cache = {} if cache is None else cache
+    client = HttpClient(rate=0, timeout=5)
+    results, checked = asyncio.run(check_all(urls, cache, retries=0, client=client))
+    return results, checked, cache
+
+
+def test_statuses(stub):
+    base, server = stub
+    paths = ["/ok", "/no-head", "/redirect", "/gone", "/busy", "/loop"]
+    results, checked, cache = _check([base + path for path in paths])
+    alive = {path: results[base + path]["alive"] for path in paths}
+    assert alive == {"/ok": True, "/no-head": True, "/redirect": True,
+                     "/gone": False, "/busy": None, "/loop": None}
+    assert results[base + "/gone"]["status"] == 404
+    assert results[base + "/busy"]["error"] == "HTTP 503"
+    assert checked == len(paths)
+    # HEAD 405 -> GET dengan Range 1 byte
+    assert ("GET", "/no-head", "bytes=0-0") in server.requests
+    # Hasil tidak pasti (503, redirect loop) tidak di-cache
+    assert set(cache) == {base + path for path in ("/ok", "/no-head", "/redirect", "/gone")}
+
+
+def test_cache_skips_fresh_entries(stub):
+    base, server = stub
+    cache = {}
+    _check([base + "/ok", base + "/busy"], cache)
+    server.requests.clear()
+    results, checked, _ = _check([base + "/ok", base + "/busy"], cache)
+    assert checked == 1
+    assert all(request[1] == "/busy" for request in server.requests)
+    assert results[base + "/ok"]["alive"] is True
+
+
+def test_get_fallback_ignoring_range_does_not_read_body(stub):
+    base, _ = stub
+    start = time.perf_counter()
+    results, _, _ = _check([base + "/no-range"])
+    assert results[base + "/no-range"]["alive"] is True
+    assert results[base + "/no-range"]["status"] == 200
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,52 @@
+import pytest
+
+from catalog import Episode, Title
+from generate import bulk_import, merge_rows
+
+
+def _rows(*rows):
+    return [(n, dict(zip(("title", "episode", "url"), row))) for n, row in enumerate(rows, 2)]
+
+
+def test_episode_without_number_does_not_overwrite_existing():
+    anime = Title("Show", "p.jpg", [
+        Episode("01", "Episode 01", "https://x/1"),
+        Episode("03", "Episode 03", "https://x/3"),
+    ])
+    stats, errors = merge_rows([anime], _rows(("Show", "", "https://x/new")))
+    assert not errors
+    assert stats["added"] == 1 and stats["updated"] == 0
+    assert [(ep.episode, ep.url) for ep in anime.episodes] == [
+        ("01", "https://x/1"), ("03", "https://x/3"), ("04", "https://x/new"),
+    ]
+
+
+def test_episodes_sorted_after_import():
+    anime = Title("Show", "p.jpg", [Episode("OVA", "OVA", "https://x/ova"), Episode("02", "Episode 02", "https://x/2")])
+    stats, _ = merge_rows([anime], _rows(
+        ("Show", "10", "https://x/10"),
+        ("Show", "1", "https://x/1"),
+        ("Show", "", "https://x/11"),
+        ("Baru", "", "https://y/1"),
+    ))
+    assert stats == {"titles": 1, "added": 4, "updated": 0, "skipped": 0}
+    assert [ep.episode for ep in anime.episodes] == ["01", "02", "10", "11", "OVA"]
+
+
+def test_replaced_url_can_be_imported_again():
+    anime = Title("Show", "p.jpg", [Episode("01", "Episode 01", "https://x/old")])
+    stats, _ = merge_rows([anime], _rows(
+        ("Show", "01", "https://x/new"),
+        ("Show", "01", "https://x/old"),
+    ))
+    assert stats == {"titles": 0, "added": 0, "updated": 2, "skipped": 0}
+    assert [ep.url for ep in anime.episodes] == ["https://x/old"]
+
+
+def test_unknown_format_fails_before_reading(tmp_path):
+    output = tmp_path / "list.json"
+    good = tmp_path / "a.csv"
+    good.write_text("title,url\nShow,https://x/1\n", encoding="utf-8")
+    with pytest.raises(SystemExit, match="tidak dikenali"):
+        bulk_import([str(good), str(tmp_path / "b.xlsx")], str(output))
+    assert not output.exists()
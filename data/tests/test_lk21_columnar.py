@@ -0,0 +1,36 @@
+from lk21_columnar import MAX_PREFIXES, ColumnarReader, ColumnarWriter, split_poster, write_columnar
+
+RECORDS = [
+    {"title": "Alpha", "slug": "alpha", "poster": "https://img.example/p/a.jpg", "type": "movie"},
+    {"title": "Beta", "slug": "beta", "poster": None, "type": "series"},
+    {"title": "Gamma", "slug": "gamma", "poster": "g.jpg", "type": "movie"},
+]
+
+
+def test_split_poster():
+    assert split_poster("https://img.example/p/a.jpg") == ("https://img.example/p/", "a.jpg")
+    assert split_poster("g.jpg") == ("", "g.jpg")
+    assert split_poster(None) == ("", "")
+
+
+def test_round_trip_with_missing_poster(tmp_path):
+    path = str(tmp_path / "lk21.col")
+    write_columnar(RECORDS, path)
+    with ColumnarReader(path) as reader:
+        assert list(reader) == [dict(r, poster=r["poster"] or "") for r in RECORDS]
+        assert reader.search_prefix("be") == [dict(RECORDS[1], poster="")]
+
+
+def test_prefix_dictionary_full(tmp_path):
+    # Lebih banyak prefix dari yang muat di uint16: sisanya disimpan sebagai URL utuh
+    records = [{"title": f"t{i:06d}", "slug": f"s{i}", "poster": f"https://img.example/{i}/p.jpg", "type": "movie"}
+               for i in range(MAX_PREFIXES + 2)]
+    writer = ColumnarWriter()
+    for record in records:
+        writer.add(record)
+    assert len(writer.prefixes) == MAX_PREFIXES
+    path = str(tmp_path / "full.col")
+    writer.close(path)
+    with ColumnarReader(path) as reader:
+        assert reader.record(0) == records[0]
+        assert reader.record(len(records) - 1) == records[-1]
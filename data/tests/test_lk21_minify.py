@@ -0,0 +1,102 @@
+import json
+import sys
+
+import pytest
+
+from lk21_minify import DeltaBuilder, apply_delta, main, minify, minify_stream
+
+ITEMS = [
+    {"title": "Beta", "slug": "beta", "poster": "b1.jpg", "type": "movie", "extra": 1},
+    {"title": "Alpha", "slug": "alpha", "poster": "a.jpg", "type": "series"},
+    {"title": "Beta (update)", "slug": "beta", "poster": "b2.jpg", "type": "movie"},
+    {"title": "Gamma", "slug": "gamma", "poster": "g.jpg", "type": "movie"},
+]
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "lk21_data.json"
+    path.write_text(json.dumps({"data": ITEMS}), encoding="utf-8")
+    return path
+
+
+def _posters(path):
+    return {film["slug"]: film["poster"] for film in json.loads(path.read_text(encoding="utf-8"))["data"]}
+
+
+@pytest.mark.parametrize("keep, poster", [("first", "b1.jpg"), ("latest", "b2.jpg")])
+def test_keep_duplicate_slug(dump, tmp_path, keep, poster):
+    output = tmp_path / "out.json"
+    assert minify(str(dump), str(output), keep=keep) == 3
+    assert _posters(output)["beta"] == poster
+
+
+@pytest.mark.parametrize("keep", ["first", "latest"])
+def test_minify_matches_stream(dump, tmp_path, keep):
+    plain, stream = tmp_path / "plain.json", tmp_path / "stream.json"
+    minify(str(dump), str(plain), keep=keep)
+    minify_stream([str(dump)], str(stream), keep=keep)
+    assert plain.read_bytes() == stream.read_bytes()
+
+
+
+def _write(path, items):
+    path.write_text(json.dumps({"data": items}), encoding="utf-8")
+    return path
+
+
+def _main(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["lk21_minify.py", *map(str, argv)])
+    main()
+
+
+def test_delta_spills_to_disk(tmp_path):
+    old = [{"title": f"T{i:03d}", "slug": f"s{i:03d}", "poster": "p.jpg", "type": "movie"} for i in range(200)]
+    new = [dict(item) for item in old[50:]]
+    new[0]["poster"] = "new.jpg"
+    new.append({"title": "Baru", "slug": "baru", "poster": "b.jpg", "type": "series"})
+    previous = tmp_path / "prev.json"
+    minify(str(_write(tmp_path / "old.json", old)), str(previous))
+
+    builder = DeltaBuilder(str(previous), budget_bytes=4096)
+    assert builder.sorter.runs
+    minify(str(_write(tmp_path / "new.json", new)), str(tmp_path / "out.json"), sinks=[builder])
+    added, changed, removed = builder.close()
+    assert [r["slug"] for r in added] == ["baru"]
+    assert changed == [new[0]]
+    assert removed == [f"s{i:03d}" for i in range(50)]
+
+
+def test_index_deltas_and_shards(tmp_path, monkeypatch):
+    index, deltas, shards = tmp_path / "index.json", tmp_path / "deltas", tmp_path / "shards"
+    v1, v2, v3 = tmp_path / "v1.json", tmp_path / "v2.json", tmp_path / "v3.json"
+    items = [dict(item, slug=item["slug"] + str(i)) for i, item in enumerate(ITEMS)]
+
+    # Publish pertama: belum ada versi lama, jadi tidak ada delta
+    _main(monkeypatch, _write(tmp_path / "in1.json", items[:3]), v1, "--index", index, "--shards", shards,
+          "--previous", _write(tmp_path / "empty.json", []), "--delta", deltas)
+    assert "deltas" not in json.loads(index.read_text())
+    assert not deltas.exists()
+
+    _main(monkeypatch, _write(tmp_path / "in2.json", items[1:]), v2, "--index", index,
+          "--previous", v1, "--delta", deltas)
+    published = json.loads(index.read_text())
+    assert "shards" not in published
+    (entry,) = published["deltas"]["chain"]
+    delta = json.loads((deltas / entry["file"]).read_text())
+    assert apply_delta(json.loads(v1.read_text())["data"], delta) == json.loads(v2.read_text())["data"]
+
+    _main(monkeypatch, _write(tmp_path / "in3.json", items[2:]), v3, "--index", index,
+          "--previous", v2, "--delta", deltas, "--delta-base-url", "https://cdn.example/deltas")
+    published = json.loads(index.read_text())
+    assert published["deltas"]["base_url"] == "https://cdn.example/deltas"
+    assert len(published["deltas"]["chain"]) == 2
+
+    # --previous bukan versi yang tercatat di index: gagal, index dan rantai delta tidak berubah
+    before = index.read_text()
+    with pytest.raises(SystemExit):
+        _main(monkeypatch, _write(tmp_path / "in4.json", items), tmp_path / "v4.json", "--index", index,
+              "--previous", v1, "--delta", deltas)
+    assert index.read_text() == before
+    assert len(list(deltas.iterdir())) == 2
+    assert not (tmp_path / "v4.json").exists()
@@ -0,0 +1,41 @@
+import json
+
+from rewrite import RuleSet, rewrite_file
+
+RULES = [
+    {"from": "https://old.host", "to": "https://new.host"},
+    {"pattern": r"^https://(\w+)\.cdn/e/", "to": r"https://\1.cdn/e/"},
+    {"pattern": r"^https://vid\.(\w+)/e/(\w+)", "to": r"https://vid.\1/d/\2"},
+]
+
+
+def test_first_matching_rule_wins():
+    rules = RuleSet(RULES)
+    assert rules.rewrite("https://old.host/e/1") == "https://new.host/e/1"
+    assert rules.rewrite("https://vid.xyz/e/abc?t=1") == "https://vid.xyz/d/abc?t=1"
+    assert rules.rewrite("https://other.host/e/1") == "https://other.host/e/1"
+
+
+def test_hits_count_only_changed_urls():
+    rules = RuleSet(RULES)
+    # Rule 2 cocok tapi hasilnya sama dengan input: bukan migrasi
+    assert rules.rewrite("https://a.cdn/e/1") == "https://a.cdn/e/1"
+    rules.rewrite("https://old.host/x")
+    rules.rewrite("https://vid.xyz/e/1")
+    rules.rewrite("https://vid.xyz/e/2")
+    assert [rules.hits[index] for index in range(len(RULES))] == [1, 0, 2]
+
+
+def test_rewrite_file_keeps_format(tmp_path):
+    catalog = tmp_path / "main.json"
+    catalog.write_text('[\n  {"url": "https://old.host/1", "poster": "https://a.cdn/e/p.jpg"},\n'
+                       '  {"url": "https://keep.host/2"}\n]\n', encoding="utf-8")
+    rules = RuleSet(RULES)
+    assert rewrite_file(str(catalog), rules, dry_run=True) == 1
+    assert "old.host" in catalog.read_text(encoding="utf-8")
+
+    assert rewrite_file(str(catalog), rules) == 1
+    text = catalog.read_text(encoding="utf-8")
+    assert text.startswith('[\n  {"url": "https://new.host/1", "poster": "https://a.cdn/e/p.jpg"},')
+    assert json.loads(text)[1] == {"url": "https://keep.host/2"}
+    assert list(tmp_path.iterdir()) == [catalog]
@@ -0,0 +1,24 @@
+from search_index import SearchIndex, SearchIndexBuilder, search
+
+TITLES = [{"title": t} for t in ("One Piece", "Naruto Shippuden", "Kaguya-sama", "Boku no Hero", "Tonikaku Kawaii")]
+
+
+def _index():
+    builder = SearchIndexBuilder()
+    for record in TITLES:
+        builder.add(record)
+    return SearchIndex(builder.to_dict())
+
+
+def test_short_words_match_token_prefix_only():
+    index = _index()
+    # "ka" prefix dari "kaguya"/"kawaii"; "tonikaku" cuma memuatnya di tengah
+    assert search(index, "ka", TITLES) == [2, 4]
+    assert search(index, "no", TITLES) == [3]
+
+
+def test_long_words_match_substring():
+    index = _index()
+    assert search(index, "ppud", TITLES) == [1]
+    assert search(index, "kaku kaw", TITLES) == [4]
+    assert search(index, "piece zz", TITLES) == []